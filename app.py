@@ -1,6 +1,25 @@
-import pandas as pd
 import streamlit as st
-import plotly.express as px
+
+from whr.lazy import lazy_import
+
+px = lazy_import("plotly.express")
+go = lazy_import("plotly.graph_objects")
+data = lazy_import("whr.data")
+ranking = lazy_import("whr.ranking")
+figures = lazy_import("whr.figures")
+panel = lazy_import("whr.panel")
+microdata = lazy_import("whr.microdata")
+sketch = lazy_import("whr.sketch")
+correlation = lazy_import("whr.correlation")
+uncertainty = lazy_import("whr.uncertainty")
+whatif = lazy_import("whr.whatif")
+outliers = lazy_import("whr.outliers")
+similarity = lazy_import("whr.similarity")
+clustering = lazy_import("whr.clustering")
+render = lazy_import("whr.render")
+payload = lazy_import("whr.payload")
+filters = lazy_import("whr.filters")
+profiling = lazy_import("whr.profiling")
 
 st.markdown("# **World Happiness Report 2023 Analysis**")
 
@@ -30,52 +49,100 @@ The dataset includes:
 )
 
 
-st.markdown("## Loading the Dataset")
+def listing(values, decimals=3):
+    """Format a country-indexed Series as "Country (value), ..." for the text ("none" if empty)."""
+    return ", ".join(f"{country} ({value:.{decimals}f})" for country, value in values.items()) or "none"
 
-df_whr = pd.read_csv("WHR2023.csv")
-st.dataframe(df_whr.head())
 
-df_whr.columns = df_whr.columns.str.title()
+def outlier_line(label, values, note="", decimals=3):
+    """``**label**: countries — note`` for the text, or ``**label**: none flagged`` without the note."""
+    if values.empty:
+        return f"**{label}**: none flagged"
+    return f"**{label}**: {listing(values, decimals)}" + (f" — {note}" if note else "")
 
-cols = [
-    "Country Name",
-    "Ladder Score",
-    "Logged Gdp Per Capita",
-    "Social Support",
-    "Healthy Life Expectancy",
-    "Freedom To Make Life Choices",
-    "Generosity",
-    "Perceptions Of Corruption",
-    "Dystopia + Residual"
-]
 
-df_whr = df_whr[cols]
-df_whr = df_whr.set_index("Country Name")
-df_whr.isnull().sum().sort_values(ascending=False)
-df_whr = df_whr.dropna(subset=["Healthy Life Expectancy", "Dystopia + Residual"])
-df_whr.isnull().sum().sort_values(ascending=False)
+def correlation_with(table, indicator):
+    """An indicator's strength and r from a driver table, e.g. "strong positive (r = 0.75)"."""
+    return f"{table.at[indicator, 'strength']} (r = {table.at[indicator, 'r']:.2f})"
 
-st.markdown("## Final Cleaned Dataset")
 
-st.markdown(
-    """
+def stronger_than(table, indicator):
+    """The indicators a driver table ranks above ``indicator``, as text."""
+    names = table.index[: table.index.get_loc(indicator)].tolist()
+    return " and ".join([", ".join(names[:-1]), names[-1]] if len(names) > 1 else names) or "none"
+
+
+def sidebar_filters(dataset):
+    """Sidebar controls for narrowing the report to some countries."""
+    index = filters.filter_index(dataset)
+    ranges = []
+    with st.sidebar.expander("Filter countries"):
+        groups = st.multiselect("Country groups", list(index.groups), key="filter_groups")
+        columns = st.multiselect(
+            "Indicators",
+            index.columns,
+            [column for column in filters.DEFAULT_SLIDERS if column in index.columns],
+            key="filter_columns",
+        )
+        for column in columns:
+            low, high = filters.slider_bounds(index, column)
+            chosen = st.slider(column, low, high, (low, high), 0.01, key=f"filter {column}")
+            if chosen != (low, high):
+                ranges.append((column, *chosen))
+    return filters.Filter(tuple(ranges), tuple(groups))
+
+
+def clusters():
+    """The k picked in the sidebar for colouring charts by cluster, or None."""
+    choice = st.session_state.get("clusters", "Off")
+    return None if choice == "Off" else choice
+
+
+def overview(dataset):
+    st.markdown("## Loading the Dataset")
+
+    prof.dataframe(dataset.raw.head())
+
+    df_whr = dataset.df
+
+    st.markdown("## Final Cleaned Dataset")
+
+    st.markdown(
+        """
 We display the full cleaned dataset after:  
 - Standardizing column names  
 - Selecting relevant variables  
 - Setting country names as the index  
-- Removing missing values  
-- Ensuring no duplicates  
+- Validating every row (columns and types, value ranges, duplicate countries, whisker consistency)  
+- Quarantining rows that fail, as listed under **Data Quality** below  
 
 This dataset is now ready for **Exploratory Data Analysis (EDA)** and visualization.  
 """
-)
+    )
 
-st.dataframe(df_whr.head())
+    prof.dataframe(df_whr.head())
 
-st.markdown("## Descriptive Statistics")
+    st.markdown("## Data Quality")
 
-st.markdown(
-    """
+    with prof.section("validation"):
+        report = data.quality_report(dataset)
+        quarantined = report.quarantine()
+        warnings = (report.issues["Severity"] == "warning").sum()
+    st.markdown(
+        f"""
+All **{report.rows}** input rows were checked for the expected columns and types, plausible value ranges, duplicate countries and ladder scores consistent with their whiskers.  
+**{len(quarantined)}** rows were quarantined and left out of the analysis; **{warnings}** warnings were noted on rows that were kept.  
+"""
+    )
+    if len(report.issues):
+        prof.dataframe(report.summary())
+    if len(quarantined):
+        prof.dataframe(quarantined)
+
+    st.markdown("## Descriptive Statistics")
+
+    st.markdown(
+        """
 We generate summary statistics for all numerical columns in the dataset.  
 
 **Key Insights:**  
@@ -90,14 +157,22 @@ We generate summary statistics for all numerical columns in the dataset.
 
 These statistics provide a first overview of global well-being and the socio-economic factors behind it.  
 """
-)
+    )
 
-st.dataframe(df_whr.describe())
+    with prof.section("describe"):
+        stats = sketch.summary(dataset)
+    prof.dataframe(stats)
 
-st.markdown("## Top 10 Happiest Countries in 2023")
 
-st.markdown(
-    """
+def top_and_bottom_10(dataset):
+    charts = render.ChartScheduler(prof)
+    with prof.section("rankings"):
+        rankings = ranking.ranking_index(dataset)
+
+    st.markdown("## Top 10 Happiest Countries in 2023")
+
+    st.markdown(
+        """
 We extract the 10 countries with the highest **Ladder Score** (Happiness Index).  
 
 **Key Insights:**  
@@ -109,15 +184,15 @@ We extract the 10 countries with the highest **Ladder Score** (Happiness Index).
 
 This top 10 snapshot highlights that **strong social systems, economic stability, and freedom** are key drivers of happiness worldwide.  
 """
-)
+    )
 
-df_top10 = df_whr.sort_values(by="Ladder Score", ascending=False).head(10)
-st.dataframe(df_top10)
+    df_top10 = rankings.top("Ladder Score", 10)
+    prof.dataframe(df_top10)
 
-st.markdown("## Bottom 10 Happiest Countries in 2023")
+    st.markdown("## Bottom 10 Happiest Countries in 2023")
 
-st.markdown(
-    """
+    st.markdown(
+        """
 We extract the 10 countries with the lowest **Ladder Score** (Happiness Index).  
 
 **Key Insights:**  
@@ -130,15 +205,140 @@ We extract the 10 countries with the lowest **Ladder Score** (Happiness Index).
 
 The bottom 10 highlights how **conflict, governance issues, and underdeveloped infrastructure** severely impact happiness levels.  
 """
-)
+    )
 
-df_bottom10 = df_whr.sort_values(by="Ladder Score").head(10)
-st.dataframe(df_bottom10)
+    df_bottom10 = rankings.bottom("Ladder Score", 10)
+    prof.dataframe(df_bottom10)
 
-st.markdown("## Top 5 Countries by GDP per Capita")
+    st.markdown("## How Certain Are These Ranks?")
 
-st.markdown(
-    """
+    with prof.section("rank uncertainty"):
+        distribution = uncertainty.rank_distribution(dataset)
+        rank_table = distribution.table()
+
+    st.markdown(
+        f"""
+Each Ladder Score is a survey estimate with a **standard error**. We redraw every country's score {distribution.draws:,} times within its error and rank the countries again each time.  
+The tables show the median rank, the range that holds 95% of the draws, and how often a country comes out **#1** or in the **top 10**. Neighbouring countries with overlapping ranges are statistically hard to tell apart.  
+"""
+    )
+
+    prof.dataframe(rank_table.loc[df_top10.index])
+    prof.dataframe(rank_table.loc[df_bottom10.index])
+
+    st.markdown("---")
+
+    st.markdown("## Data Visualizations")
+
+    st.markdown(
+        """
+Now that we have explored the dataset and key factors, we move on to **interactive visualizations** using **Plotly Express**.  
+
+These visualizations will help us:  
+- Compare countries on happiness and key drivers.  
+- Identify trends, outliers, and correlations.  
+- Tell a visual story that complements our descriptive analysis.  
+"""
+    )
+
+    st.markdown("## Visualizing the Top 10 Happiest Countries")
+
+    st.markdown(
+        """
+We use **bar and pie charts** to illustrate the **Ladder Score** for the top 10 countries.  
+
+**Bar Chart Insights:**  
+- **Finland** leads clearly with **7.80**, slightly ahead of Denmark (7.59) and Iceland (7.53).  
+- The Nordic countries dominate the top ranks, confirming their consistent high performance in global happiness.  
+- The bar heights show small gaps among the top 5, indicating that several countries maintain very similar levels of well-being.  
+- **Switzerland, Luxembourg, and New Zealand** appear slightly lower but still above 7, highlighting strong global performance.  
+
+**Pie Chart Insights:**  
+- The pie chart emphasizes the **relative contribution of each country** to the top 10 happiness bracket.  
+- Nordic countries collectively occupy the largest portion, reinforcing that **high social support, freedom, and economic stability** drive happiness.  
+- Even smaller slices (New Zealand, Luxembourg) still represent meaningful scores, showing that high happiness is not exclusive to Europe.  
+
+**Conclusion:**  
+- Both visualizations clearly highlight the dominance of **Nordic countries** and the narrow range of Ladder Scores among the happiest nations.  
+- This visual storytelling makes it easy for viewers to quickly identify **leaders in global well-being**.  
+"""
+    )
+
+    charts.chart(
+        dataset,
+        "bar",
+        "top10",
+        df_top10,
+        y="Ladder Score",
+        color="Ladder Score",
+        title="Top 10 Happiest Countries (Ladder Score)",
+        labels={"Country Name": "Country Name", "Ladder Score": "Ladder Score"},
+        height=500,
+    )
+
+    charts.chart(
+        dataset,
+        "pie",
+        "top10",
+        df_top10,
+        values="Ladder Score",
+        title="Top 10 Happiest Countries (Ladder Score)",
+    )
+
+    st.markdown("## Visualizing the Bottom 10 Least Happy Countries")
+
+    st.markdown(
+        """
+We now examine the **countries with the lowest Ladder Scores** using **bar and pie charts**.  
+
+**Bar Chart Insights:**  
+- **Afghanistan (1.86)** ranks lowest, followed by **Lebanon (2.39)** and **Sierra Leone (3.14)**, showing extreme disparities in global happiness.  
+- The bar heights clearly demonstrate how large the gap is between the happiest and least happy countries (top scores ~7.8 vs bottom ~1.86).  
+- Many of the bottom 10 countries are affected by **conflict, weak governance, and low social support**, which are likely major contributors to their low scores.  
+
+**Pie Chart Insights:**  
+- The pie chart highlights how each country contributes proportionally to the bottom 10 bracket.  
+- **Afghanistan and Lebanon** occupy the largest slices, emphasizing their extreme low happiness levels.  
+- Smaller slices (e.g., Zambia, Tanzania) show that even within the bottom 10, there is variation, but all remain significantly lower than the global average (~5.54).  
+
+**Conclusion:**  
+- These visualizations reinforce that **economic, social, and political factors** heavily influence happiness outcomes.  
+- Contrasting top 10 vs bottom 10 charts visually demonstrates **the global inequality in well-being**.  
+"""
+    )
+
+    charts.chart(
+        dataset,
+        "bar",
+        "bottom10",
+        df_bottom10,
+        y="Ladder Score",
+        color="Ladder Score",
+        title="Bottom 10 Least Happy Countries (Ladder Score)",
+        labels={"Country Name": "Country Name", "Ladder Score": "Ladder Score"},
+        height=500,
+    )
+
+    charts.chart(
+        dataset,
+        "pie",
+        "bottom10",
+        df_bottom10,
+        values="Ladder Score",
+        title="Bottom 10 Least Happy Countries (Ladder Score)",
+    )
+
+    charts.finish()
+
+
+def indicator_leaders(dataset):
+    with prof.section("rankings"):
+        rankings = ranking.ranking_index(dataset)
+
+    st.markdown("## Top 5 Countries by GDP per Capita")
+
+    st.markdown(
+        """
 We now look at the countries with the **highest GDP per capita (log-transformed)**.  
 
 **Key Observations:**  
@@ -153,15 +353,15 @@ While GDP strongly correlates with happiness, **it’s not the sole determinant*
 
 This suggests that while **economic prosperity is a key driver**, factors like **social support, freedom, and governance** also significantly affect happiness outcomes.  
 """
-)
+    )
 
-df_topgdp = df_whr.sort_values(by="Logged Gdp Per Capita", ascending=False).head()
-st.dataframe(df_topgdp.head())
+    df_topgdp = rankings.top("Logged Gdp Per Capita", 5)
+    prof.dataframe(df_topgdp)
 
-st.markdown("## Top 5 Countries by Social Support")
+    st.markdown("## Top 5 Countries by Social Support")
 
-st.markdown(
-    """
+    st.markdown(
+        """
 Here we explore the countries with the **highest levels of social support**.  
 
 **Key Observations:**  
@@ -173,15 +373,15 @@ This shows that while **social support strongly boosts happiness**, other factor
 - Nordic countries (Iceland, Finland, Denmark) maintain **both high social support and high happiness**.  
 - Central European countries (Slovakia, Czechia) demonstrate that strong social bonds help, but cannot fully offset other limiting factors.  
 """
-)
+    )
 
-df_topss = df_whr.sort_values(by="Social Support", ascending=False).head()
-st.dataframe(df_topss.head())
+    df_topss = rankings.top("Social Support", 5)
+    prof.dataframe(df_topss)
 
-st.markdown("## Top 5 Countries by Healthy Life Expectancy")
+    st.markdown("## Top 5 Countries by Healthy Life Expectancy")
 
-st.markdown(
-    """
+    st.markdown(
+        """
 These countries enjoy the **longest healthy lifespans**, but their happiness scores vary.  
 
 **Key Observations:**  
@@ -195,15 +395,15 @@ Conclusion:
 - Other factors (social support, freedom, corruption perceptions) are equally important in shaping well-being.  
 - Switzerland shows the most balanced model: wealth, health, and happiness together.  
 """
-)
+    )
 
-df_tophle = df_whr.sort_values(by="Healthy Life Expectancy", ascending=False).head()
-st.dataframe(df_tophle.head())
+    df_tophle = rankings.top("Healthy Life Expectancy", 5)
+    prof.dataframe(df_tophle)
 
-st.markdown("## Top 5 Countries by Freedom To Make Life Choices")
+    st.markdown("## Top 5 Countries by Freedom To Make Life Choices")
 
-st.markdown(
-    """
+    st.markdown(
+        """
 These are the nations where people feel **most free to make life decisions** (e.g., career, lifestyle, family).  
 
 **Key Observations:**  
@@ -217,15 +417,15 @@ Conclusion:
 - **Cambodia’s case** highlights that freedom contributes to well-being but must be supported by **economic stability, social support, and governance**.  
 - **Bahrain** demonstrates how high freedom combined with wealth can still result in good (but not top-tier) happiness scores.  
 """
-)
+    )
 
-df_topftmlc = df_whr.sort_values(by="Freedom To Make Life Choices", ascending=False).head()
-st.dataframe(df_topftmlc.head())
+    df_topftmlc = rankings.top("Freedom To Make Life Choices", 5)
+    prof.dataframe(df_topftmlc)
 
-st.markdown("## Top 5 Countries by Generosity")
+    st.markdown("## Top 5 Countries by Generosity")
 
-st.markdown(
-    """
+    st.markdown(
+        """
 These are the nations with the **highest generosity scores** (measured by charitable giving and willingness to help others).  
 
 **Key Observations:**  
@@ -240,15 +440,15 @@ Conclusion:
 - **Indonesia and Thailand** show that when generosity is combined with **higher social support and better living standards**, happiness improves.  
 - Compared to **Nordic countries**, generosity is not the strongest driver of happiness but reflects cultural values of sharing and resilience in lower-income countries.  
 """
-)
+    )
 
-df_topg = df_whr.sort_values(by="Generosity", ascending=False).head()
-st.dataframe(df_topg.head())
+    df_topg = rankings.top("Generosity", 5)
+    prof.dataframe(df_topg)
 
-st.markdown("## Top 5 Countries by Perceptions of Corruption")
+    st.markdown("## Top 5 Countries by Perceptions of Corruption")
 
-st.markdown(
-    """
+    st.markdown(
+        """
 These are the nations with the **highest corruption perception scores** (meaning citizens feel corruption is widespread).  
 
 **Key Observations:**  
@@ -263,15 +463,15 @@ These are the nations with the **highest corruption perception scores** (meaning
 - But in lower-income countries (e.g., **Nigeria**), corruption perception adds another barrier to happiness, amplifying struggles from poor life expectancy and weak infrastructure.  
 - Compared to **Nordic countries (low corruption perception + high happiness)**, this group highlights how **trust in institutions** is a key factor in long-term well-being.  
 """
-)
+    )
 
-df_toppoc = df_whr.sort_values(by="Perceptions Of Corruption", ascending=False).head()
-st.dataframe(df_toppoc.head())
+    df_toppoc = rankings.top("Perceptions Of Corruption", 5)
+    prof.dataframe(df_toppoc)
 
-st.markdown("# Summary of Key Insights from Top 5 Comparisons")
+    st.markdown("# Summary of Key Insights from Top 5 Comparisons")
 
-st.markdown(
-    """
+    st.markdown(
+        """
 1. **GDP (Logged GDP per Capita)**  
 - **Luxembourg, Singapore, Ireland, Switzerland, UAE** lead in wealth.  
 - High GDP countries usually score **well in happiness**, but not always the highest — money alone doesn’t guarantee well-being.  
@@ -307,115 +507,58 @@ st.markdown(
 - **Developing nations** show how **generosity and community bonds** can still provide resilience despite economic struggles.  
 - Happiness is **multifactorial** — no single variable (GDP, freedom, health) explains it fully; it’s the combination that matters.  
 """
-)
+    )
 
-st.markdown("---")
 
-st.markdown("## Data Visualizations")
+def drivers(dataset):
+    charts = render.ChartScheduler(prof)
+    df_whr = dataset.df
 
-st.markdown(
-    """
-Now that we have explored the dataset and key factors, we move on to **interactive visualizations** using **Plotly Express**.  
+    st.markdown("## Correlation Between Indicators")
 
-These visualizations will help us:  
-- Compare countries on happiness and key drivers.  
-- Identify trends, outliers, and correlations.  
-- Tell a visual story that complements our descriptive analysis.  
-"""
-)
-
-st.markdown("## Visualizing the Top 10 Happiest Countries")
-
-st.markdown(
-    """
-We use **bar and pie charts** to illustrate the **Ladder Score** for the top 10 countries.  
-
-**Bar Chart Insights:**  
-- **Finland** leads clearly with **7.80**, slightly ahead of Denmark (7.59) and Iceland (7.53).  
-- The Nordic countries dominate the top ranks, confirming their consistent high performance in global happiness.  
-- The bar heights show small gaps among the top 5, indicating that several countries maintain very similar levels of well-being.  
-- **Switzerland, Luxembourg, and New Zealand** appear slightly lower but still above 7, highlighting strong global performance.  
-
-**Pie Chart Insights:**  
-- The pie chart emphasizes the **relative contribution of each country** to the top 10 happiness bracket.  
-- Nordic countries collectively occupy the largest portion, reinforcing that **high social support, freedom, and economic stability** drive happiness.  
-- Even smaller slices (New Zealand, Luxembourg) still represent meaningful scores, showing that high happiness is not exclusive to Europe.  
+    method = st.radio("Correlation", ["Pearson", "Spearman"], horizontal=True, key="correlation_method")
+    with prof.section("correlations"):
+        result = correlation.dataset_correlations(dataset, method.lower())
 
-**Conclusion:**  
-- Both visualizations clearly highlight the dominance of **Nordic countries** and the narrow range of Ladder Scores among the happiest nations.  
-- This visual storytelling makes it easy for viewers to quickly identify **leaders in global well-being**.  
+    st.markdown(
+        f"""
+Every pair of indicators is correlated across the {result.rows} countries with complete data.  
+The ranked table lists each indicator's correlation with the **Ladder Score**, with a 95% bootstrap interval from {result.replicates:,} resamples of countries.  
 """
-)
-
-
-fig = px.bar(
-    df_top10,
-    x=df_top10.index,
-    y="Ladder Score",
-    color="Ladder Score",
-    title="Top 10 Happiest Countries (Ladder Score)",
-    labels={"Country Name": "Country Name", "Ladder Score": "Ladder Score"},
-    height=500,
-)
-st.plotly_chart(fig)
-
-fig = px.pie(
-    df_top10,
-    names=df_top10.index,
-    values="Ladder Score",
-    title="Top 10 Happiest Countries (Ladder Score)",
-)
-st.plotly_chart(fig)
-
-st.markdown("## Visualizing the Bottom 10 Least Happy Countries")
-
-st.markdown(
-    """
-We now examine the **countries with the lowest Ladder Scores** using **bar and pie charts**.  
-
-**Bar Chart Insights:**  
-- **Afghanistan (1.86)** ranks lowest, followed by **Lebanon (2.39)** and **Sierra Leone (3.14)**, showing extreme disparities in global happiness.  
-- The bar heights clearly demonstrate how large the gap is between the happiest and least happy countries (top scores ~7.8 vs bottom ~1.86).  
-- Many of the bottom 10 countries are affected by **conflict, weak governance, and low social support**, which are likely major contributors to their low scores.  
-
-**Pie Chart Insights:**  
-- The pie chart highlights how each country contributes proportionally to the bottom 10 bracket.  
-- **Afghanistan and Lebanon** occupy the largest slices, emphasizing their extreme low happiness levels.  
-- Smaller slices (e.g., Zambia, Tanzania) show that even within the bottom 10, there is variation, but all remain significantly lower than the global average (~5.54).  
-
-**Conclusion:**  
-- These visualizations reinforce that **economic, social, and political factors** heavily influence happiness outcomes.  
-- Contrasting top 10 vs bottom 10 charts visually demonstrates **the global inequality in well-being**.  
+    )
+
+    charts.chart(
+        dataset,
+        "heatmap",
+        result.method,
+        result.matrix,
+        title=f"{method} Correlation Matrix",
+    )
+    table = correlation.driver_table(result, "Ladder Score")
+    prof.dataframe(table)
+
+    if clusters():
+        st.markdown("## Country Clusters")
+
+        st.markdown(
+            f"""
+Countries are grouped into {clusters()} clusters by k-means on their six standardized indicators, numbered from the happiest group on average.  
+The scatter and box plots are coloured by these clusters; the table gives each cluster's average profile.  
 """
-)
-
-fig = px.bar(
-    df_bottom10,
-    x=df_bottom10.index,
-    y="Ladder Score",
-    color="Ladder Score",
-    title="Bottom 10 Least Happy Countries (Ladder Score)",
-    labels={"Country Name": "Country Name", "Ladder Score": "Ladder Score"},
-    height=500,
-)
-st.plotly_chart(fig)
+        )
 
-fig = px.pie(
-    df_bottom10,
-    names=df_bottom10.index,
-    values="Ladder Score",
-    title="Bottom 10 Least Happy Countries (Ladder Score)",
-)
-st.plotly_chart(fig)
+        with prof.section("clusters"):
+            profiles = clustering.cluster_profiles(dataset, clusters())
+        prof.dataframe(profiles)
 
-st.markdown("## Scatter Plot: Ladder Score vs Social Support")
+    st.markdown("## Scatter Plot: Ladder Score vs Social Support")
 
-st.markdown(
-    """
+    st.markdown(
+        f"""
 This scatter plot examines the relationship between **Social Support** and **Ladder Score** across all countries.  
 
 **Key Observations:**  
-- There is a **strong positive correlation**: countries with higher social support generally have higher happiness scores.  
+- The correlation is **{correlation_with(table, 'Social Support')}**: countries with higher social support generally have higher happiness scores.  
 - **Nordic countries** (Finland, Denmark, Iceland) cluster at the top-right, showing **high social support and very high happiness**.  
 - **Bottom-ranking countries** (Afghanistan, Lebanon, Sierra Leone) are at the bottom-left, reflecting **low social support and low happiness**.  
 - The trendline (OLS regression) confirms that **social support is one of the most significant drivers of happiness globally**.  
@@ -424,92 +567,98 @@ This scatter plot examines the relationship between **Social Support** and **Lad
 **Conclusion:**  
 - Social support is a **key predictor of happiness**, highlighting the importance of strong social networks and safety nets in improving national well-being.  
 """
-)
-
-fig = px.scatter(
-    df_whr,
-    x="Social Support",
-    y="Ladder Score",
-    hover_name=df_whr.index,
-    title="Ladder Score vs Social Support",
-    labels={"Social Support": "Social Support", "Ladder Score": "Ladder Score"},
-    color_discrete_sequence=["#F28E2B"],
-    opacity=0.7,
-    trendline="ols"
-)
-st.plotly_chart(fig)
-
-st.markdown("## Scatter Plot: Ladder Score vs Healthy Life Expectancy")
-
-st.markdown(
-    """
+    )
+
+    charts.chart(
+        dataset,
+        "scatter",
+        "all",
+        df_whr,
+        x="Social Support",
+        y="Ladder Score",
+        title="Ladder Score vs Social Support",
+        labels={"Social Support": "Social Support", "Ladder Score": "Ladder Score"},
+        color_discrete_sequence=["#F28E2B"],
+        opacity=0.7,
+        trendline=True,
+        clusters=clusters(),
+    )
+
+    st.markdown("## Scatter Plot: Ladder Score vs Healthy Life Expectancy")
+
+    st.markdown(
+        f"""
 This scatter plot explores the relationship between **Healthy Life Expectancy** and **Ladder Score**.  
 
 **Key Observations:**  
-- There is a **moderate positive correlation**: countries with higher life expectancy generally tend to have higher happiness scores.  
+- The correlation is **{correlation_with(table, 'Healthy Life Expectancy')}**: countries with higher life expectancy generally tend to have higher happiness scores.  
 - **Nordic countries** (Finland, Denmark, Iceland) again appear in the top-right quadrant, combining high life expectancy (≈71–72 years) with high happiness.  
 - **Lowest-ranking countries** (Afghanistan, Zimbabwe, Congo) have life expectancy around 54–55 years and correspondingly low happiness.  
 - Some exceptions exist: **Lebanon** has a relatively high life expectancy (≈66) but very low happiness (2.39), suggesting **other factors, like social support and freedom, heavily influence happiness** beyond life expectancy alone.  
-- The trendline (OLS regression) confirms that while healthy life expectancy contributes to happiness, it is **less predictive than social support or GDP**.  
+- The trendline (OLS regression) confirms that healthy life expectancy contributes to happiness; it is **less predictive than {stronger_than(table, 'Healthy Life Expectancy')}**.  
 
 **Conclusion:**  
 - Health is important, but **well-being is multidimensional**, and life expectancy alone does not fully explain variations in global happiness.  
 """
-)
-
-fig = px.scatter(
-    df_whr,
-    x="Healthy Life Expectancy",
-    y="Ladder Score",
-    hover_name=df_whr.index,
-    title="Ladder Score vs Healthy Life Expectancy",
-    labels={"Healthy Life Expectancy": "Healthy Life Expectancy", "Ladder Score": "Ladder Score"},
-    color_discrete_sequence=["#A32976"],
-    opacity=0.7,
-    trendline="ols"
-)
-st.plotly_chart(fig)
-
-st.markdown("## Scatter Plot: Ladder Score vs Freedom To Make Life Choices")
-
-st.markdown(
-    """
+    )
+
+    charts.chart(
+        dataset,
+        "scatter",
+        "all",
+        df_whr,
+        x="Healthy Life Expectancy",
+        y="Ladder Score",
+        title="Ladder Score vs Healthy Life Expectancy",
+        labels={"Healthy Life Expectancy": "Healthy Life Expectancy", "Ladder Score": "Ladder Score"},
+        color_discrete_sequence=["#A32976"],
+        opacity=0.7,
+        trendline=True,
+        clusters=clusters(),
+    )
+
+    st.markdown("## Scatter Plot: Ladder Score vs Freedom To Make Life Choices")
+
+    st.markdown(
+        f"""
 This scatter plot examines how **freedom to make life choices** relates to **Ladder Score**.  
 
 **Key Observations:**  
-- There is a **strong positive correlation**: countries where people report more freedom tend to have higher happiness scores.  
+- The correlation is **{correlation_with(table, 'Freedom To Make Life Choices')}**: countries where people report more freedom tend to have higher happiness scores.  
 - **Top-ranking countries** (Finland, Denmark, Iceland) are in the top-right corner, combining high freedom (~0.93–0.96) with high happiness (~7.5–7.8).  
 - **Lowest-ranking countries** (Afghanistan, Lebanon) are at the bottom-left, indicating low freedom (0.38–0.47) and very low happiness (1.86–2.39).  
 - Some middle-income countries (like Israel, Netherlands) show **moderate freedom** but still maintain high happiness, suggesting **freedom is necessary but interacts with other factors** like social support and GDP.  
-- The OLS trendline confirms freedom as a **critical predictor of happiness**, second only to social support in explanatory power.  
+- The OLS trendline confirms freedom as a **predictor of happiness**, behind {stronger_than(table, 'Freedom To Make Life Choices')} in strength of correlation.  
 
 **Conclusion:**  
-- Enhancing **personal freedom and choice** is strongly linked to national well-being.  
+- Enhancing **personal freedom and choice** is linked to national well-being.  
 - Countries with limited freedom face substantial constraints on overall happiness, even if other factors (like GDP) are moderate.  
 """
-)
-
-fig = px.scatter(
-    df_whr,
-    x="Freedom To Make Life Choices",
-    y="Ladder Score",
-    hover_name=df_whr.index,
-    title="Ladder Score vs Freedom To Make Life Choices",
-    labels={"Freedom To Make Life Choices": "Freedom To Make Life Choices", "Ladder Score": "Ladder Score"},
-    color_discrete_sequence=["#4E268F"],
-    opacity=0.7,
-    trendline="ols"
-)
-st.plotly_chart(fig)
-
-st.markdown("## Scatter Plot: Ladder Score vs Generosity")
-
-st.markdown(
-    """
+    )
+
+    charts.chart(
+        dataset,
+        "scatter",
+        "all",
+        df_whr,
+        x="Freedom To Make Life Choices",
+        y="Ladder Score",
+        title="Ladder Score vs Freedom To Make Life Choices",
+        labels={"Freedom To Make Life Choices": "Freedom To Make Life Choices", "Ladder Score": "Ladder Score"},
+        color_discrete_sequence=["#4E268F"],
+        opacity=0.7,
+        trendline=True,
+        clusters=clusters(),
+    )
+
+    st.markdown("## Scatter Plot: Ladder Score vs Generosity")
+
+    st.markdown(
+        f"""
 This scatter plot explores the relationship between **Generosity** and **Ladder Score** across countries.  
 
 **Key Observations:**  
-- The correlation is **weak to moderate**: higher generosity does not always guarantee higher happiness.  
+- The correlation is **{correlation_with(table, 'Generosity')}**: higher generosity does not always guarantee higher happiness.  
 - **Top-ranking countries** (Finland, Denmark, Iceland) have moderate generosity (≈ -0.02 to 0.21) but still maintain high happiness scores, suggesting **other factors like social support and GDP are more decisive**.  
 - **Lower-ranking countries** (Afghanistan, Lebanon, Zimbabwe) show a range of generosity values, some positive and some negative, but consistently low happiness, confirming generosity alone is not sufficient.  
 - **Outliers** exist: Indonesia (Generosity ≈ 0.531) has relatively higher generosity but only moderate happiness (~5.28), showing that generosity can boost happiness but depends on context.  
@@ -519,29 +668,31 @@ This scatter plot explores the relationship between **Generosity** and **Ladder
 - Generosity contributes to happiness, but it is **not the primary driver**; economic factors, social support, and personal freedom play larger roles.  
 - Policies aiming to improve well-being should consider generosity **in combination with other social and economic factors**.  
 """
-)
-
-fig = px.scatter(
-    df_whr,
-    x="Generosity",
-    y="Ladder Score",
-    hover_name=df_whr.index,
-    title="Ladder Score vs Generosity",
-    labels={"Generosity": "Generosity", "Ladder Score": "Ladder Score"},
-    color_discrete_sequence=["#188FFF"],
-    opacity=0.7,
-    trendline="ols"
-)
-st.plotly_chart(fig)
-
-st.markdown("## Scatter Plot: Ladder Score vs Perceptions Of Corruption")
-
-st.markdown(
-    """
+    )
+
+    charts.chart(
+        dataset,
+        "scatter",
+        "all",
+        df_whr,
+        x="Generosity",
+        y="Ladder Score",
+        title="Ladder Score vs Generosity",
+        labels={"Generosity": "Generosity", "Ladder Score": "Ladder Score"},
+        color_discrete_sequence=["#188FFF"],
+        opacity=0.7,
+        trendline=True,
+        clusters=clusters(),
+    )
+
+    st.markdown("## Scatter Plot: Ladder Score vs Perceptions Of Corruption")
+
+    st.markdown(
+        f"""
 This scatter plot examines the effect of **perceived corruption** on **Ladder Score**.  
 
 **Key Observations:**  
-- There is a **moderate negative correlation**: countries with higher corruption perception tend to have lower happiness.  
+- The correlation is **{correlation_with(table, 'Perceptions Of Corruption')}**: countries with higher corruption perception tend to have lower happiness.  
 - **Top-ranking countries** (Finland, Denmark, Iceland) show low perceived corruption (≈0.18–0.67) and high happiness (~7.5–7.8).  
 - **Lowest-ranking countries** (Afghanistan, Lebanon, Sierra Leone) have high perceived corruption (~0.85–0.89) and correspondingly low happiness (~1.86–3.14).  
 - Some exceptions exist: Israel (high perceived corruption ≈0.71) still maintains a high happiness score (~7.47), indicating **other factors like GDP and social support can offset negative impact**.  
@@ -550,32 +701,39 @@ This scatter plot examines the effect of **perceived corruption** on **Ladder Sc
 **Conclusion:**  
 - Lowering corruption perception can positively impact national well-being, but it must be **paired with social support, freedom, and economic growth** to maximize happiness.  
 """
-)
-
-fig = px.scatter(
-    df_whr,
-    x="Perceptions Of Corruption",
-    y="Ladder Score",
-    hover_name=df_whr.index,
-    title="Ladder Score vs Perceptions Of Corruption",
-    labels={"Perceptions Of Corruption": "Perceptions Of Corruption", "Ladder Score": "Ladder Score"},
-    color_discrete_sequence=["#16A17F"],
-    opacity=0.7,
-    trendline="ols"
-)
-st.plotly_chart(fig)
-
-st.markdown("## Distribution of Logged GDP Per Capita")
-
-st.markdown(
-    """
+    )
+
+    charts.chart(
+        dataset,
+        "scatter",
+        "all",
+        df_whr,
+        x="Perceptions Of Corruption",
+        y="Ladder Score",
+        title="Ladder Score vs Perceptions Of Corruption",
+        labels={"Perceptions Of Corruption": "Perceptions Of Corruption", "Ladder Score": "Ladder Score"},
+        color_discrete_sequence=["#16A17F"],
+        opacity=0.7,
+        trendline=True,
+        clusters=clusters(),
+    )
+
+    charts.finish()
+
+
+def distributions(dataset):
+    charts = render.ChartScheduler(prof)
+    df_whr = dataset.df
+    with prof.section("outliers"):
+        found = outliers.outliers(dataset)
+
+    st.markdown("## Distribution of Logged GDP Per Capita")
+
+    st.markdown(
+        f"""
 - **Overview**: This boxplot shows the distribution of “Logged GDP Per Capita” across countries, including all individual points.
-- **High outliers**:
-  - Luxembourg (11.660), Singapore (11.571), Ireland (11.527), Switzerland (11.164), UAE (11.145)
-  - These countries have very high GDP per capita, reflecting strong economies and high standards of living.
-- **Low outliers**:
-  - Venezuela (5.527), Congo (Kinshasa) (7.007), Mozambique (7.116), Chad (7.261), Liberia (7.277)
-  - These countries have very low GDP per capita, indicative of economic struggles or instability.
+- {outlier_line('High outliers', found.outlying(df_whr, 'Logged Gdp Per Capita', 5), 'very high GDP per capita, reflecting strong economies and high standards of living.')}
+- {outlier_line('Low outliers', found.outlying(df_whr, 'Logged Gdp Per Capita', 5, largest=False), 'very low GDP per capita, indicative of economic struggles or instability.')}
 - **Median & Quartiles**:
   - Most countries cluster between ~8.5 and 10.5 in logged GDP per capita, representing moderate to high economic development.
 - **Insights**:
@@ -583,148 +741,245 @@ st.markdown(
   - Lower GDP per capita countries often face challenges in development, social services, and income equality.
 - **Conclusion**: The distribution highlights global economic disparities, with a small set of very wealthy nations and a long tail of lower-income countries.
 """
-)
-
-df_plot = df_whr.reset_index()
-
-fig = px.box(df_plot, 
-             x="Logged Gdp Per Capita", 
-             points="all",
-             hover_name="Country Name",
-             title="Distribution of Logged GDP Per Capita",
-             color_discrete_sequence=["#19D3F3"])
-st.plotly_chart(fig)
-
-st.markdown("## Distribution of Social Support")
-
-st.markdown(
-    """
+    )
+
+    charts.chart(
+        dataset,
+        "box",
+        "all",
+        df_whr,
+        x="Logged Gdp Per Capita",
+        title="Distribution of Logged GDP Per Capita",
+        color_discrete_sequence=["#19D3F3"],
+        clusters=clusters(),
+    )
+
+    st.markdown("## Distribution of Social Support")
+
+    st.markdown(
+        f"""
 - **Overview**: This boxplot visualizes the distribution of “Social Support” scores across countries, including all individual points.
-- **High outliers**:
-  - Iceland (0.983), Finland (0.969), Denmark (0.954), Slovakia (0.953), Czechia (0.953)
-  - These countries have very strong social support networks, reflecting robust family, community, and societal structures.
-- **Low outliers**:
-  - Afghanistan (0.341), Benin (0.437), Comoros (0.471)
-  - These countries face weaker social support systems, likely due to poverty, conflict, or social instability.
+- {outlier_line('High outliers', found.outlying(df_whr, 'Social Support', 5), 'very strong social support networks, reflecting robust family, community, and societal structures.')}
+- {outlier_line('Low outliers', found.outlying(df_whr, 'Social Support', 3, largest=False), 'weaker social support systems, likely due to poverty, conflict, or social instability.')}
 - **Median & Quartiles**: Most countries cluster between ~0.7 and 0.9, showing moderate to high social support globally.
 - **Insights**:
   - Higher social support is often linked with higher happiness, better health outcomes, and resilience during crises.
   - Lower social support may contribute to societal vulnerability and lower overall well-being.
 - **Conclusion**: The extremes highlight global inequalities in social cohesion and community support, while most countries show moderately high social support.
 """
-)
-
-fig = px.box(df_plot, 
-             x="Social Support", 
-             points="all",
-             hover_name="Country Name",
-             title="Distribution of Social Support",
-             color_discrete_sequence=["#FFA15A"])
-st.plotly_chart(fig)
-
-st.markdown("## Distribution of Healthy Life Expectancy")
-
-st.markdown(
-    """
+    )
+
+    charts.chart(
+        dataset,
+        "box",
+        "all",
+        df_whr,
+        x="Social Support",
+        title="Distribution of Social Support",
+        color_discrete_sequence=["#FFA15A"],
+        clusters=clusters(),
+    )
+
+    st.markdown("## Distribution of Healthy Life Expectancy")
+
+    st.markdown(
+        f"""
 - **Overview**: This boxplot shows the spread of “Healthy Life Expectancy” scores across countries, with all individual points included.
 - **Median & Quartiles**: Most countries fall between ~63 and 72 years, indicating a general clustering around high life expectancy.
-- **High outliers**:
-  - Hong Kong S.A.R. of China (77.280), Japan (74.349), Singapore (73.800), South Korea (73.650), Switzerland (72.900)
-  - These countries have significantly higher life expectancy than the global median.
-- **Low outliers**:
-  - Mozambique (51.530), Chad (53.125), Zimbabwe (54.050), Guinea (54.185), Afghanistan (54.712)
-  - These countries face much lower healthy life expectancy due to economic, health, or social challenges.
+- {outlier_line('High outliers', found.outlying(df_whr, 'Healthy Life Expectancy', 5), 'significantly higher life expectancy than the global median.')}
+- {outlier_line('Low outliers', found.outlying(df_whr, 'Healthy Life Expectancy', 5, largest=False), 'much lower healthy life expectancy due to economic, health, or social challenges.')}
 - **Insights**:
   - Higher values typically reflect strong healthcare systems, nutrition, and living conditions.
   - Lower values highlight countries struggling with health infrastructure, conflict, or poverty.
 - **Conclusion**: The extremes emphasize global disparities in health and longevity, while most countries cluster around moderately high life expectancy.
 """
-)
-
-fig = px.box(df_plot, 
-             x="Healthy Life Expectancy", 
-             points="all",
-             hover_name="Country Name",
-             title="Distribution of Healthy Life Expectancy",
-             color_discrete_sequence=["#AB63FA"])
-st.plotly_chart(fig)
-
-st.markdown("## Distribution of Freedom To Make Life Choices")
-
-st.markdown(
-    """
+    )
+
+    charts.chart(
+        dataset,
+        "box",
+        "all",
+        df_whr,
+        x="Healthy Life Expectancy",
+        title="Distribution of Healthy Life Expectancy",
+        color_discrete_sequence=["#AB63FA"],
+        clusters=clusters(),
+    )
+
+    st.markdown("## Distribution of Freedom To Make Life Choices")
+
+    st.markdown(
+        f"""
 - **Overview**: The boxplot displays the spread of “Freedom To Make Life Choices” scores across countries, including all individual points for full transparency.
 - **Median & Quartiles**: Most countries score between ~0.7 and 0.9, showing moderate to high freedom in life decisions.
 - **Outliers**:
-  - **High outliers (very free)**: Finland (0.961), Cambodia (0.958), Sweden (0.948), Norway (0.947), Bahrain (0.944) — significantly higher than the majority.
-  - **Low outliers (very restricted)**: Afghanistan (0.382), Comoros (0.470), Lebanon (0.474), Turkiye (0.475), Madagascar (0.522) — much lower freedom than the global median.
-- **Insights**:
-  - High outliers reflect countries with strong personal autonomy, supportive policies, or societal norms enabling individual choice.
-  - Low outliers may indicate political, economic, or social constraints limiting individual freedoms.
+  - {outlier_line('High outliers (very free)', found.outlying(df_whr, 'Freedom To Make Life Choices', 5), 'significantly higher than the majority, reflecting strong personal autonomy, supportive policies, or societal norms enabling individual choice.')}
+  - {outlier_line('Low outliers (very restricted)', found.outlying(df_whr, 'Freedom To Make Life Choices', 5, largest=False), 'much lower freedom than the global median, which may indicate political, economic, or social constraints.')}
 - **Conclusion**: Extreme values highlight countries at both ends of the freedom spectrum, useful for understanding disparities in life choice autonomy globally.
 """
-)
-
-fig = px.box(df_plot, 
-             x="Freedom To Make Life Choices", 
-             points="all",
-             hover_name="Country Name",
-             title="Distribution of Freedom To Make Life Choices",
-             color_discrete_sequence=["#00CC96"])
-st.plotly_chart(fig)
-
-st.markdown("## Distribution of Generosity")
-
-st.markdown(
-    """
+    )
+
+    charts.chart(
+        dataset,
+        "box",
+        "all",
+        df_whr,
+        x="Freedom To Make Life Choices",
+        title="Distribution of Freedom To Make Life Choices",
+        color_discrete_sequence=["#00CC96"],
+        clusters=clusters(),
+    )
+
+    st.markdown("## Distribution of Generosity")
+
+    st.markdown(
+        f"""
 - **Overview**: This boxplot shows how generosity scores are spread across countries, displaying all individual points for full visibility.
 - **Median & Quartiles**: Most countries cluster around 0.0–0.2, indicating low to moderate generosity in the dataset.
 - **Outliers**:
-  - **High outliers (very generous)**: Indonesia (0.531), Myanmar (0.491), Gambia (0.364), Thailand (0.289), Kenya (0.288) significantly higher generosity than the majority.
-  - **Low outliers (very low generosity)**: Georgia (-0.254), Greece (-0.240), Japan (-0.237), Morocco (-0.231), Botswana (-0.215) exceptionally low generosity scores.
-- **Insights**:
-  - High outliers may reflect strong cultural, social, or policy-driven generosity.
-  - Low outliers could suggest less social cohesion or lower trust and altruism at the national level.
+  - {outlier_line('High outliers (very generous)', found.outlying(df_whr, 'Generosity', 5), 'significantly higher generosity than the majority, which may reflect strong cultural, social, or policy-driven giving.')}
+  - {outlier_line('Low outliers (very low generosity)', found.outlying(df_whr, 'Generosity', 5, largest=False), 'exceptionally low generosity, which could suggest less social cohesion or lower trust and altruism.')}
 - **Conclusion**: Outliers highlight extremes in generosity and can help identify countries with unusual social behaviors compared to global norms.
 """
-)
-
-fig = px.box(df_plot, 
-             x="Generosity", 
-             points="all",
-             hover_name="Country Name",
-             title="Distribution of Generosity",
-             color_discrete_sequence=["#EF553B"])
-st.plotly_chart(fig)
-
-st.markdown("## Distribution of Perceptions Of Corruption")
-
-st.markdown(
-    """
+    )
+
+    charts.chart(
+        dataset,
+        "box",
+        "all",
+        df_whr,
+        x="Generosity",
+        title="Distribution of Generosity",
+        color_discrete_sequence=["#EF553B"],
+        clusters=clusters(),
+    )
+
+    st.markdown("## Distribution of Perceptions Of Corruption")
+
+    st.markdown(
+        f"""
 - **Overview**: This boxplot displays the range of perceived corruption across countries, highlighting all individual points for better clarity.
 - **Median & Quartiles**: Most countries cluster around 0.7–0.9, indicating moderate perceived corruption.
 - **Outliers**:
-  - **Low outliers (less perceived corruption)**: Singapore (0.146), Finland (0.182), Denmark (0.196), Sweden (0.202), Switzerland (0.266) exceptionally low perception of corruption.
-  - **High outliers (more perceived corruption)**: Romania (0.929), Croatia (0.925), Bosnia and Herzegovina (0.918), Nigeria (0.911), Bulgaria (0.911) very high perception of corruption.
-- **Insights**:
-  - Countries with the lowest perceived corruption tend to be among the happiest or most developed nations.
-  - High outliers often indicate systemic governance or transparency issues affecting public trust.
+  - {outlier_line('Low outliers (less perceived corruption)', found.outlying(df_whr, 'Perceptions Of Corruption', 5, largest=False), 'exceptionally low perception of corruption; such countries tend to be among the happiest or most developed nations.')}
+  - {outlier_line('High outliers (more perceived corruption)', found.outlying(df_whr, 'Perceptions Of Corruption', 5), 'very high perception of corruption, often a sign of systemic governance or transparency issues affecting public trust.')}
 - **Conclusion**: Outliers in corruption perception are strong indicators of institutional effectiveness and may significantly influence overall happiness scores.
 """
-)
+    )
 
-fig = px.box(df_plot, 
-             x="Perceptions Of Corruption", 
-             points="all",
-             hover_name="Country Name",
-             title="Distribution of Perceptions Of Corruption",
-             color_discrete_sequence=["#636EFA"])
-st.plotly_chart(fig)
+    charts.chart(
+        dataset,
+        "box",
+        "all",
+        df_whr,
+        x="Perceptions Of Corruption",
+        title="Distribution of Perceptions Of Corruption",
+        color_discrete_sequence=["#636EFA"],
+        clusters=clusters(),
+    )
 
-st.markdown("## World Happiness Report 2025 – Final Insights")
+    charts.finish()
 
-st.markdown(
-    """
+
+def happiness_over_time(dataset):
+    panel_store = panel.load_panel(panel.PANEL_DIR)
+
+    st.markdown("## Happiness Over Time")
+
+    st.markdown(
+        """
+This section uses the full multi-year WHR history loaded from the configured panel directory.  
+Pick one of the countries currently shown to follow its **Ladder Score** across report years.  
+"""
+    )
+
+    countries = [country for country in dataset.df.index if country in panel_store.countries]
+    if not countries:
+        st.info("None of the countries currently shown appear in the panel history.")
+        return
+    country = st.selectbox("Country", countries, index=countries.index("Finland") if "Finland" in countries else 0)
+    history = panel_store.country(country)
+
+    fig = px.line(
+        history,
+        y="Ladder Score",
+        markers=True,
+        title=f"Ladder Score over time: {country}",
+    )
+    prof.plotly_chart(payload.minimize(fig, f"line history: {country}"))
+
+
+def similar_countries(dataset):
+    st.markdown("## Countries With Similar Profiles")
+
+    st.markdown(
+        """
+Pick a country to find the countries whose six indicators (GDP, social support, life expectancy, freedom, generosity and corruption) are closest to it.  
+Indicators are standardized first so each counts equally; **Distance** is measured in standard deviations.  
+"""
+    )
+
+    with prof.section("similarity index"):
+        index = similarity.similarity_index(dataset)
+    countries = list(index.position.index)
+    country = st.selectbox("Country", countries, index=0, key="similar_country")
+    k = st.slider("Number of neighbours", 1, 20, 5, key="similar_k")
+    prof.dataframe(index.neighbours(country, k))
+
+
+def what_if(dataset):
+    st.markdown("## What If?")
+
+    st.markdown(
+        """
+The World Happiness Report splits every Ladder Score into a contribution from each factor plus a baseline and a residual.  
+Move the sliders to change a factor for **every country at once** and see how scores and ranks would shift if the contributions held.  
+GDP changes apply to GDP per capita itself; shares such as social support stay between 0 and 1.  
+Generosity is centred on zero, so its slider shifts every country by a percentage of its standard deviation instead of scaling it.  
+"""
+    )
+
+    scenario(whatif.decomposition(dataset))
+
+
+@st.fragment
+def scenario(decomposition):
+    # Slider moves rerun only this fragment, so it keeps its own profiler.
+    frag = profiling.start_run()
+    columns = st.columns(3)
+    changes = [
+        columns[i % 3].slider(
+            f"{factor} ({'% of std. dev.' if kind == 'shift' else '%'})", -50, 50, 0, 5, key=f"whatif {factor}"
+        ) / 100
+        for i, (factor, kind) in enumerate(zip(decomposition.factors, decomposition.kinds))
+    ]
+    with frag.section("scenario"):
+        table = decomposition.table(changes)
+        top = table.head(15)
+        fig = go.Figure([
+            go.Bar(name="2023", x=top.index, y=top["Ladder Score"], marker_color="#BAB0AC"),
+            go.Bar(name="Scenario", x=top.index, y=top["Scenario Score"], marker_color="#4E79A7"),
+        ])
+        fig.update_layout(title="Top 15 Countries Under the Scenario", barmode="group", yaxis_title="Ladder Score")
+        payload.minimize(fig, "bar what-if: Top 15 Countries Under the Scenario")
+    frag.plotly_chart(fig)
+    frag.dataframe(table)
+    frag.finish()
+
+
+def conclusions(dataset):
+    df_whr = dataset.df
+    with prof.section("outliers"):
+        found = outliers.outliers(dataset)
+    with prof.section("correlations"):
+        table = correlation.driver_table(correlation.dataset_correlations(dataset), "Ladder Score")
+    # The residual is not an indicator countries can act on.
+    strength = table["strength"].drop("Dystopia + Residual", errors="ignore").str.split().str[0]
+
+    st.markdown("## World Happiness Report 2025 – Final Insights")
+
+    st.markdown(
+        f"""
 ### 1. Happiest vs Least Happy Countries
 **Top 10 happiest countries:**  
 - Nordic dominance: Finland (7.80), Denmark (7.59), Iceland (7.53)  
@@ -741,9 +996,10 @@ st.markdown(
 ---
 
 ### 2. Social Support
-- **Correlation with happiness:** Strong positive  
-- **High outliers:** Iceland (0.983), Finland (0.969), Denmark (0.954)  
-- **Low outliers:** Afghanistan (0.341), Benin (0.437), Comoros (0.471)  
+- **Correlation with happiness:** {correlation_with(table, 'Social Support')}  
+- {outlier_line('High outliers', found.outlying(df_whr, 'Social Support'))}  
+- {outlier_line('Low outliers', found.outlying(df_whr, 'Social Support', largest=False))}  
+- {outlier_line('Far from the trendline (studentized residual)', found.off_trend('Social Support'), decimals=2)}  
 
 **Conclusion:**  
 - Social support is a key predictor of national happiness
@@ -751,9 +1007,10 @@ st.markdown(
 ---
 
 ### 3. Healthy Life Expectancy
-- **Correlation with happiness:** Moderate positive  
-- **High outliers:** Hong Kong (77.28), Japan (74.35), Singapore (73.80)  
-- **Low outliers:** Mozambique (51.53), Chad (53.13), Afghanistan (54.71)  
+- **Correlation with happiness:** {correlation_with(table, 'Healthy Life Expectancy')}  
+- {outlier_line('High outliers', found.outlying(df_whr, 'Healthy Life Expectancy'), decimals=2)}  
+- {outlier_line('Low outliers', found.outlying(df_whr, 'Healthy Life Expectancy', largest=False), decimals=2)}  
+- {outlier_line('Far from the trendline (studentized residual)', found.off_trend('Healthy Life Expectancy'), decimals=2)}  
 
 **Conclusion:**  
 - Longevity contributes to happiness but is secondary to social and economic factors
@@ -761,19 +1018,21 @@ st.markdown(
 ---
 
 ### 4. Freedom To Make Life Choices
-- **Correlation with happiness:** Strong positive  
-- **High outliers:** Finland (0.961), Cambodia (0.958), Sweden (0.948)  
-- **Low outliers:** Afghanistan (0.382), Comoros (0.470), Lebanon (0.474)  
+- **Correlation with happiness:** {correlation_with(table, 'Freedom To Make Life Choices')}  
+- {outlier_line('High outliers', found.outlying(df_whr, 'Freedom To Make Life Choices'))}  
+- {outlier_line('Low outliers', found.outlying(df_whr, 'Freedom To Make Life Choices', largest=False))}  
+- {outlier_line('Far from the trendline (studentized residual)', found.off_trend('Freedom To Make Life Choices'), decimals=2)}  
 
 **Conclusion:**  
-- Freedom significantly impacts well-being; limited freedom correlates with low happiness
+- Freedom matters for well-being; limited freedom correlates with low happiness
 
 ---
 
 ### 5. Generosity
-- **Correlation with happiness:** Weak to moderate  
-- **High outliers:** Indonesia (0.531), Myanmar (0.491), Gambia (0.364)  
-- **Low outliers:** Georgia (-0.254), Greece (-0.240), Japan (-0.237)  
+- **Correlation with happiness:** {correlation_with(table, 'Generosity')}  
+- {outlier_line('High outliers', found.outlying(df_whr, 'Generosity'))}  
+- {outlier_line('Low outliers', found.outlying(df_whr, 'Generosity', largest=False))}  
+- {outlier_line('Far from the trendline (studentized residual)', found.off_trend('Generosity'), decimals=2)}  
 
 **Conclusion:**  
 - Generosity alone is not a strong predictor; it interacts with social support and GDP
@@ -781,9 +1040,10 @@ st.markdown(
 ---
 
 ### 6. Perceptions of Corruption
-- **Correlation with happiness:** Moderate negative  
-- **Low outliers (less corruption):** Singapore (0.146), Finland (0.182), Denmark (0.196)  
-- **High outliers (more corruption):** Romania (0.929), Croatia (0.925), Nigeria (0.911)  
+- **Correlation with happiness:** {correlation_with(table, 'Perceptions Of Corruption')}  
+- {outlier_line('Low outliers (less corruption)', found.outlying(df_whr, 'Perceptions Of Corruption', largest=False))}  
+- {outlier_line('High outliers (more corruption)', found.outlying(df_whr, 'Perceptions Of Corruption'))}  
+- {outlier_line('Far from the trendline (studentized residual)', found.off_trend('Perceptions Of Corruption'), decimals=2)}  
 
 **Conclusion:**  
 - Reducing corruption perception improves well-being, but social support, freedom, and GDP are crucial
@@ -791,9 +1051,9 @@ st.markdown(
 ---
 
 ### 7. Logged GDP Per Capita
-- **Correlation with happiness:** Positive  
-- **High outliers:** Luxembourg (11.66), Singapore (11.57), Ireland (11.53)  
-- **Low outliers:** Venezuela (5.53), Mozambique (7.12), Chad (7.26)  
+- **Correlation with happiness:** {correlation_with(table, 'Logged Gdp Per Capita')}  
+- {outlier_line('High outliers', found.outlying(df_whr, 'Logged Gdp Per Capita'), decimals=2)}  
+- {outlier_line('Low outliers', found.outlying(df_whr, 'Logged Gdp Per Capita', largest=False), decimals=2)}  
 
 **Conclusion:**  
 - Wealth enhances well-being but is insufficient without social support and freedom
@@ -801,12 +1061,51 @@ st.markdown(
 ---
 
 ### 8. Overall Takeaways
-- **Primary happiness drivers:** Social support, freedom to make life choices  
-- **Secondary drivers:** Healthy life expectancy, GDP per capita  
-- **Moderate/limited drivers:** Generosity, perceptions of corruption  
+- **Primary happiness drivers (strong):** {", ".join(strength.index[strength == "strong"]) or "none"}  
+- **Secondary drivers (moderate):** {", ".join(strength.index[strength == "moderate"]) or "none"}  
+- **Limited drivers (weak or negligible):** {", ".join(strength.index[strength.isin(["weak", "negligible"])]) or "none"}  
 - **Patterns:**  
   - Nordic countries excel across all indicators  
   - Lowest-ranking countries face multiple compounding issues  
   - Outliers reveal exceptional national circumstances
 """
-)
\ No newline at end of file
+    )
+
+
+SECTIONS = {
+    "Overview": overview,
+    "Top & Bottom 10": top_and_bottom_10,
+    "Indicator Leaders": indicator_leaders,
+    "Drivers of Happiness": drivers,
+    "Distributions": distributions,
+    "Similar Countries": similar_countries,
+    "What If?": what_if,
+    "Conclusions": conclusions,
+}
+if panel.PANEL_DIR:
+    SECTIONS["Happiness Over Time"] = happiness_over_time
+
+if st.session_state.get("section") not in SECTIONS:
+    requested = st.query_params.get("section")
+    st.session_state["section"] = requested if requested in SECTIONS else next(iter(SECTIONS))
+section = st.sidebar.radio("Section", list(SECTIONS), key="section")
+st.sidebar.selectbox("Colour charts by cluster", ["Off", 2, 3, 4, 5, 6, 7, 8], key="clusters")
+st.query_params["section"] = section
+
+prof = profiling.start_run()
+with prof.section("load"):
+    if microdata.MICRODATA_PATH:
+        dataset = microdata.load_survey(microdata.MICRODATA_PATH, data.DATA_PATH)
+    else:
+        dataset = data.load_whr(data.DATA_PATH)
+spec = sidebar_filters(dataset)
+if spec:
+    with prof.section("filter"):
+        total, dataset = len(dataset.df), filters.apply(dataset, spec)
+    st.sidebar.caption(f"Showing {len(dataset.df)} of {total} countries")
+    if len(dataset.df) < filters.MIN_ROWS:
+        st.warning(f"Only {len(dataset.df)} countries match the filters; widen them to see the report.")
+        st.stop()
+with prof.section(section):
+    SECTIONS[section](dataset)
+prof.finish()
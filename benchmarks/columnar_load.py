@@ -0,0 +1,87 @@
+"""Compare cold-load time and RSS of the CSV path against the memory-mapped store.
+
+Each measurement runs in a fresh interpreter so nothing is shared with the
+parent. The dataset can be scaled up by tiling the rows of ``WHR2023.csv``::
+
+    python benchmarks/columnar_load.py --scale 1 100 1000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+import pandas as pd
+from whr import columnar, data
+
+def rss_kb():
+    with open("/proc/self/status") as fh:
+        for line in fh:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+
+before = rss_kb()
+start = time.perf_counter()
+if {mode!r} == "csv":
+    frame = data.parse_csv({path!r}).df
+else:
+    frame = columnar.open_frame({store!r})
+frame.describe()
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "rss_kb": rss_kb() - before, "rows": len(frame)}}))
+"""
+
+
+def scaled_csv(source, scale, directory):
+    import pandas as pd
+
+    raw = pd.read_csv(source)
+    if scale > 1:
+        copies = []
+        for i in range(scale):
+            copy = raw.copy()
+            copy["Country name"] = copy["Country name"] + f" #{i}"
+            copies.append(copy)
+        raw = pd.concat(copies, ignore_index=True)
+    path = os.path.join(directory, f"whr_x{scale}.csv")
+    raw.to_csv(path, index=False)
+    return path
+
+
+def run_child(mode, path, store):
+    code = CHILD.format(root=ROOT, mode=mode, path=path, store=store)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    sys.path.insert(0, ROOT)
+    from whr import columnar, data
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default=os.path.join(ROOT, data.DATA_PATH))
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'rows':>9} {'mode':>5} {'seconds':>9} {'rss MiB':>8}")
+        for scale in args.scale:
+            path = scaled_csv(args.source, scale, tmp)
+            store = os.path.join(tmp, f"store_x{scale}")
+            columnar.write_frame(data.parse_csv(path).df, store)
+            for mode in ("csv", "npy"):
+                runs = [run_child(mode, path, store) for _ in range(args.repeat)]
+                best = min(runs, key=lambda r: r["seconds"])
+                print(f"{best['rows']:>9} {mode:>5} {best['seconds']:>9.4f} {best['rss_kb'] / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Row-selection time of the filter index against boolean indexing.
+
+Runs a few combined predicates ("GDP above 10 and corruption below 0.5",
+a country group, ...) on ``WHR2023.csv`` and on row-tiled copies of it,
+checks both methods select the same rows and reports microseconds per
+selection::
+
+    python benchmarks/filters.py --rows 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from whr import data, filters  # noqa: E402
+
+INF = float("inf")
+QUERIES = {
+    "GDP > 10 & corruption < 0.5": filters.Filter(
+        (("Logged Gdp Per Capita", 10.0, INF), ("Perceptions Of Corruption", -INF, 0.5))),
+    "EU or G7": filters.Filter(groups=("European Union", "G7")),
+    "EU & ladder 6-7": filters.Filter((("Ladder Score", 6.0, 7.0),), ("European Union",)),
+    "three ranges": filters.Filter((("Social Support", 0.8, 1.0), ("Generosity", -0.1, 0.1),
+                                    ("Healthy Life Expectancy", 60.0, 70.0))),
+}
+
+
+def tiled(df, rows, seed=0):
+    """``df`` repeated to ``rows`` rows with jittered values and unique labels."""
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(df), rows)
+    out = df.iloc[picks].copy()
+    out += rng.normal(scale=0.01, size=out.shape) * out.std().to_numpy()
+    out.index = pd.Index(df.index[picks])
+    return out
+
+
+def boolean(df, groups, spec):
+    mask = np.ones(len(df), dtype=bool)
+    if spec.groups:
+        mask &= df.index.isin([country for name in spec.groups for country in groups[name]])
+    for column, low, high in spec.ranges:
+        mask &= (df[column] >= low).to_numpy() & (df[column] <= high).to_numpy()
+    return np.flatnonzero(mask)
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    base = data.load_whr(os.path.join(ROOT, "WHR2023.csv")).df
+    groups = filters.load_groups()
+    tables = [("WHR2023", base)] + [(f"tiled {rows}", tiled(base, rows)) for rows in args.rows]
+    print(f"{'table':<16} {'query':<28} {'rows':>8} {'index build ms':>15} {'index us':>9} {'boolean us':>11}  same")
+    for name, df in tables:
+        start = time.perf_counter()
+        index = filters.FilterIndex(df, groups)
+        build = time.perf_counter() - start
+        for label, spec in QUERIES.items():
+            fast, selected = timed(lambda: index.select(spec), args.repeat)
+            slow, expected = timed(lambda: boolean(df, groups, spec), args.repeat)
+            print(f"{name:<16} {label:<28} {len(selected):>8} {build * 1e3:>15.1f} {fast * 1e6:>9.1f} "
+                  f"{slow * 1e6:>11.1f}  {np.array_equal(selected, expected)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Run ``app.py`` headlessly with Streamlit's ``AppTest`` and measure one render.
+
+Importing this module patches ``ScriptRunContext.enqueue`` so every element
+sent to the page is timed and its serialized size counted. Run it directly to
+measure one render in a fresh interpreter::
+
+    python benchmarks/harness.py --section "Distributions" --runs 2
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+
+sys.path.insert(0, ROOT)
+
+from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+_messages = []
+_enqueue = ScriptRunContext.enqueue
+
+
+def _recording_enqueue(self, msg):
+    if msg.HasField("delta"):
+        _messages.append((time.perf_counter(), msg.ByteSize(), msg.delta.new_element.WhichOneof("type")))
+    return _enqueue(self, msg)
+
+
+ScriptRunContext.enqueue = _recording_enqueue
+
+
+def measure(app=APP, section=None, runs=1, timeout=300):
+    """Render ``app`` ``runs`` times in this process and report each run.
+
+    ``section`` selects a page through the ``?section=`` query parameter.
+    The first run is cold for this interpreter, later ones are warm reruns.
+    """
+    results = []
+    at = AppTest.from_file(app, default_timeout=timeout)
+    if section is not None:
+        at.query_params["section"] = section
+    for _ in range(runs):
+        _messages.clear()
+        start = time.perf_counter()
+        at.run()
+        done = time.perf_counter()
+        if at.exception:
+            raise RuntimeError(f"app raised: {at.exception[0].message}")
+        charts = [m for m in _messages if m[2] == "plotly_chart"]
+        results.append({
+            "section": section,
+            "seconds": done - start,
+            "first_element": (_messages[0][0] - start) if _messages else None,
+            "first_chart": (charts[0][0] - start) if charts else None,
+            "elements": len(_messages),
+            "charts": len(charts),
+            "bytes": sum(m[1] for m in _messages),
+            "chart_bytes": sum(m[1] for m in charts),
+        })
+    return results
+
+
+def sections(app=APP):
+    """Section names offered by the app's sidebar radio, or ``[None]``."""
+    at = AppTest.from_file(app, default_timeout=300).run()
+    radios = at.sidebar.radio
+    return list(radios[0].options) if radios else [None]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=APP)
+    parser.add_argument("--section", default=None)
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--list-sections", action="store_true")
+    args = parser.parse_args()
+    if args.list_sections:
+        print(json.dumps(sections(args.app)))
+    else:
+        print(json.dumps(measure(args.app, args.section, args.runs)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Build and query time of the similarity indexes, against brute force.
+
+Measures every backend of :mod:`whr.similarity` on the standardised
+``WHR2023.csv`` indicators and on synthetic rows drawn around them, and
+checks that each one returns the same neighbours as brute force::
+
+    python benchmarks/neighbours.py --rows 100000 --queries 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from whr import data, similarity  # noqa: E402
+
+
+def synthetic(points, rows, seed=0):
+    """``rows`` points jittered around randomly chosen real ones."""
+    rng = np.random.default_rng(seed)
+    base = points[rng.integers(0, len(points), rows)]
+    return base + rng.normal(scale=0.25, size=base.shape)
+
+
+def measure(points, method, queries, k):
+    start = time.perf_counter()
+    index = similarity.build_index(points, method)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    results = [index.query(x, k)[1] for x in queries]
+    per_query = (time.perf_counter() - start) / len(queries)
+    return build, per_query, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("-k", type=int, default=6)
+    args = parser.parse_args()
+
+    real = similarity.SimilarityIndex(data.load_whr(os.path.join(ROOT, "WHR2023.csv")).df, method="brute").points
+    tables = [("WHR2023", real)] + [(f"synthetic {rows}", synthetic(real, rows)) for rows in args.rows]
+    methods = ["brute", "kdtree"]
+    try:
+        import scipy.spatial  # noqa: F401
+        methods.append("scipy")
+    except ImportError:
+        pass
+
+    print(f"{'table':<20} {'method':<8} {'rows':>8} {'build ms':>10} {'query us':>10}  matches brute")
+    rng = np.random.default_rng(1)
+    for name, points in tables:
+        queries = points[rng.integers(0, len(points), args.queries)]
+        reference = None
+        for method in methods:
+            build, per_query, results = measure(points, method, queries, args.k)
+            if reference is None:
+                reference = results
+            # Compare as sets: equidistant neighbours may come back in either order.
+            same = all(set(a) == set(b) for a, b in zip(results, reference))
+            print(f"{name:<20} {method:<8} {len(points):>8} {build * 1e3:>10.2f} {per_query * 1e6:>10.1f}  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Spec bytes of every dashboard chart before and after payload minimizing.
+
+Renders each section once in this process through ``AppTest`` and prints the
+size of each chart's Plotly spec as built and as sent, plus the chart bytes
+per section that actually went over the wire::
+
+    python benchmarks/payload.py
+    WHR_MINIMIZE_PAYLOAD=0 python benchmarks/payload.py   # wire bytes without it
+"""
+
+import argparse
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+import harness  # noqa: E402
+
+from whr import payload  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=harness.APP)
+    args = parser.parse_args()
+    payload.RECORD_SIZES = True
+
+    print(f"{'section':<32} {'charts':>7} {'chart KiB sent':>15}")
+    for section in harness.sections(args.app):
+        result = harness.measure(args.app, section)[0]
+        print(f"{section or '(whole app)':<32} {result['charts']:>7} {result['chart_bytes'] / 1024:>15.1f}")
+
+    rows = payload.report()
+    if not rows:
+        print("\nno charts were minimized (WHR_MINIMIZE_PAYLOAD=0?)")
+        return
+    print(f"\n{'chart':<64} {'before':>9} {'after':>9} {'saved':>6}")
+    for row in rows:
+        print(f"{row['chart'][:64]:<64} {row['bytes_before']:>9} {row['bytes_after']:>9} {row['saved']:>6}")
+    before = sum(row["bytes_before"] for row in rows)
+    after = sum(row["bytes_after"] for row in rows)
+    print(f"{'total':<64} {before:>9} {after:>9} {1 - after / before:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Time and payload of rendering each dashboard section.
+
+Every section is rendered in a fresh interpreter: once cold and once as a warm
+rerun. ``first chart`` is the time from the start of the run until the first
+chart reached the page. Pointing ``--app`` at a copy of the single-page
+script from before the split gives the "before" numbers for comparison, and
+``--render-workers`` compares sequential and concurrent chart building::
+
+    python benchmarks/section_cost.py
+    python benchmarks/section_cost.py --render-workers 1 4
+    git show <old-commit>:app.py > old_app.py && python benchmarks/section_cost.py --app old_app.py
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HARNESS = os.path.join(HERE, "harness.py")
+APP = os.path.join(os.path.dirname(HERE), "app.py")
+
+
+def _harness(*args, env=None):
+    out = subprocess.run([sys.executable, HARNESS, *args], check=True, capture_output=True, text=True, env=env)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:.0f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=APP)
+    parser.add_argument("--render-workers", type=int, nargs="+", default=[None],
+                        help="WHR_RENDER_WORKERS values to compare (default: the environment's)")
+    parser.add_argument("--json", action="store_true", help="print the raw results as JSON")
+    args = parser.parse_args()
+
+    app = os.path.abspath(args.app)
+    rows = []
+    for section in _harness("--app", app, "--list-sections"):
+        for workers in args.render_workers:
+            env = dict(os.environ)
+            if workers is not None:
+                env["WHR_RENDER_WORKERS"] = str(workers)
+            extra = [] if section is None else ["--section", section]
+            cold, warm = _harness("--app", app, "--runs", "2", *extra, env=env)
+            rows.append({"section": section or "(whole app)", "workers": workers, "cold": cold, "warm": warm})
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'section':<24} {'workers':>7} {'cold ms':>8} {'1st chart':>9} {'warm ms':>8} {'1st chart':>9} "
+          f"{'elements':>9} {'charts':>7} {'KiB':>9}")
+    for row in rows:
+        cold, warm = row["cold"], row["warm"]
+        workers = "-" if row["workers"] is None else row["workers"]
+        print(f"{row['section']:<24} {workers:>7} {_ms(cold['seconds']):>8} {_ms(cold['first_chart']):>9} "
+              f"{_ms(warm['seconds']):>8} {_ms(warm['first_chart']):>9} "
+              f"{cold['elements']:>9} {cold['charts']:>7} {cold['bytes'] / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
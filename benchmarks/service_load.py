@@ -0,0 +1,100 @@
+"""Throughput and latency of the JSON service under concurrent clients.
+
+Starts ``whr.service`` in this process (or targets ``--url``), then has
+``--clients`` threads issue requests over keep-alive connections for
+``--seconds``, cycling through the endpoints. ``--conditional`` sends the
+ETag from the first response back as ``If-None-Match``, as a caching client
+would::
+
+    python benchmarks/service_load.py --clients 8 --seconds 10
+    python benchmarks/service_load.py --conditional
+"""
+
+import argparse
+import http.client
+import os
+import sys
+import threading
+import time
+from itertools import cycle
+from urllib.parse import quote, urlsplit
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from whr import service  # noqa: E402
+
+PATHS = [
+    "/top?metric=Ladder%20Score&k=10",
+    "/bottom?metric=Ladder%20Score&k=10",
+    "/top?metric=Social%20Support&k=25",
+    "/countries/" + quote("Finland"),
+    "/countries/" + quote("Costa Rica"),
+    "/describe",
+    "/metrics",
+]
+
+
+def client(host, port, deadline, conditional, latencies, statuses):
+    connection = http.client.HTTPConnection(host, port)
+    etags = {}
+    for path in cycle(PATHS):
+        if time.perf_counter() >= deadline:
+            break
+        headers = {"If-None-Match": etags[path]} if conditional and path in etags else {}
+        start = time.perf_counter()
+        connection.request("GET", path, headers=headers)
+        reply = connection.getresponse()
+        reply.read()
+        latencies.append(time.perf_counter() - start)
+        statuses[reply.status] = statuses.get(reply.status, 0) + 1
+        if reply.getheader("ETag"):
+            etags[path] = reply.getheader("ETag")
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="an already running service (default: start one in-process)")
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--conditional", action="store_true", help="revalidate with If-None-Match")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        server = service.make_server("127.0.0.1", 0, os.path.join(ROOT, "WHR2023.csv"))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address[:2]
+
+    deadline = time.perf_counter() + args.seconds
+    results = [([], {}) for _ in range(args.clients)]
+    threads = [threading.Thread(target=client, args=(host, port, deadline, args.conditional, *result))
+               for result in results]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if server is not None:
+        server.shutdown()
+
+    latencies = np.array([seconds for result in results for seconds in result[0]]) * 1000
+    statuses = {}
+    for _, counts in results:
+        for status, count in counts.items():
+            statuses[status] = statuses.get(status, 0) + count
+    print(f"clients {args.clients}, {len(latencies)} requests in {elapsed:.1f} s, statuses {dict(sorted(statuses.items()))}")
+    print(f"throughput {len(latencies) / elapsed:,.0f} req/s")
+    print(f"latency ms  p50 {np.percentile(latencies, 50):.2f}  p90 {np.percentile(latencies, 90):.2f}  "
+          f"p99 {np.percentile(latencies, 99):.2f}  max {latencies.max():.2f}")
+
+
+if __name__ == "__main__":
+    main()
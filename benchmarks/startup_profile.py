@@ -0,0 +1,106 @@
+"""Profile a cold start of ``app.py`` and check it against a time budget.
+
+A fresh interpreter runs the app headlessly with Streamlit's ``AppTest`` under
+``python -X importtime``. The report lists the slowest top-level imports, the
+time until the first element reaches the page and the time until the whole
+script has rendered. The exit status is 1 if a budget is exceeded::
+
+    python benchmarks/startup_profile.py --budget 5.0 --first-render-budget 1.5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+from streamlit.testing.v1 import AppTest
+
+first_delta = []
+enqueue = ScriptRunContext.enqueue
+
+def timed_enqueue(self, msg):
+    if not first_delta and msg.HasField("delta"):
+        first_delta.append(time.perf_counter())
+    return enqueue(self, msg)
+
+ScriptRunContext.enqueue = timed_enqueue
+harness_ready = time.perf_counter()
+at = AppTest.from_file({app!r}, default_timeout={timeout}).run()
+done = time.perf_counter()
+if at.exception:
+    raise SystemExit("app raised: " + at.exception[0].message)
+print(json.dumps({{
+    "harness_import": harness_ready - start,
+    "first_render": (first_delta[0] if first_delta else done) - start,
+    "full_render": done - start,
+}}))
+"""
+
+
+def parse_importtime(stderr):
+    """Cumulative import time (seconds) per top-level package."""
+    totals = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, _, rest = line.partition("import time:")
+        _self_us, cumulative_us, name = (part for part in rest.split("|"))
+        if name.startswith("  "):
+            continue
+        totals[name.strip().split(".")[0]] += int(cumulative_us) / 1e6
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def profile(app=APP, timeout=120):
+    code = CHILD.format(root=ROOT, app=app, timeout=timeout)
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result["imports"] = parse_importtime(out.stderr)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=APP)
+    parser.add_argument("--budget", type=float, default=5.0, help="max seconds until the script has fully rendered")
+    parser.add_argument("--first-render-budget", type=float, default=None, help="max seconds until the first element")
+    parser.add_argument("--top", type=int, default=10, help="number of imports to list")
+    parser.add_argument("--json", action="store_true", help="print the raw result as JSON")
+    args = parser.parse_args()
+
+    result = profile(args.app)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print("Slowest top-level imports (cumulative seconds):")
+        for name, seconds in list(result["imports"].items())[: args.top]:
+            print(f"  {name:<30} {seconds:8.3f}")
+        print(f"Harness import   {result['harness_import']:8.3f} s")
+        print(f"First render     {result['first_render']:8.3f} s")
+        print(f"Full render      {result['full_render']:8.3f} s")
+
+    failures = []
+    if args.budget is not None and result["full_render"] > args.budget:
+        failures.append(f"full render {result['full_render']:.3f}s > budget {args.budget:.3f}s")
+    if args.first_render_budget is not None and result["first_render"] > args.first_render_budget:
+        failures.append(f"first render {result['first_render']:.3f}s > budget {args.first_render_budget:.3f}s")
+    for failure in failures:
+        print("OVER BUDGET:", failure, file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
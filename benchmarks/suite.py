@@ -0,0 +1,165 @@
+"""Benchmark suite for the dashboard: cold start, warm rerun, stages and payload.
+
+For ``WHR2023.csv`` and row-tiled copies of it, the suite measures
+
+* app-level numbers through ``AppTest`` (fresh interpreter per scale): cold
+  start and warm rerun of the default section, and the serialized payload of
+  every section;
+* per-stage timings in-process: loading, cleaning, descriptive statistics,
+  rankings, the five scatter plots and the six box plots (caches bypassed).
+
+Results are written as JSON and compared against a stored baseline; the exit
+status is 1 if any metric got slower than ``--tolerance`` allows::
+
+    python benchmarks/suite.py --scale 1 10 100 --output bench.json
+    python benchmarks/suite.py --scale 1 10 --save-baseline
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+HARNESS = os.path.join(HERE, "harness.py")
+BASELINE = os.path.join(HERE, "baseline.json")
+
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+from columnar_load import scaled_csv  # noqa: E402
+
+BOX_COLUMNS = [
+    "Logged Gdp Per Capita",
+    "Social Support",
+    "Healthy Life Expectancy",
+    "Freedom To Make Life Choices",
+    "Generosity",
+    "Perceptions Of Corruption",
+]
+
+
+def best_of(fn, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def stage_timings(path, repeat):
+    import pandas as pd
+
+    from whr import data, figures, ranking
+    from whr import trendlines as trend
+
+    stages = {}
+    stages["loading"], raw = best_of(lambda: pd.read_csv(path), repeat)
+    stages["cleaning"], df = best_of(lambda: data.clean(raw), repeat)
+    stages["descriptive_stats"], _ = best_of(df.describe, repeat)
+    stages["rankings"], _ = best_of(lambda: ranking.RankingIndex(df), repeat)
+
+    dataset = data.Dataset(raw=raw, df=df, version=f"bench-{time.time_ns()}")
+    stages["trendlines"], _ = best_of(lambda: trend.fit_ols(df, trend.FEATURES), repeat)
+    stages["scatters"], _ = best_of(
+        lambda: [figures.scatter(dataset, df, x=x, trendline=True) for x in trend.FEATURES], repeat)
+    stages["box_plots"], _ = best_of(lambda: [figures.box(dataset, df, x=x) for x in BOX_COLUMNS], repeat)
+    return stages, len(raw)
+
+
+def _harness(env, *args):
+    out = subprocess.run([sys.executable, HARNESS, *args], env=env, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def app_metrics(path, store_dir):
+    env = dict(os.environ, WHR_DATA_PATH=path, WHR_STORE_DIR=store_dir)
+    sections = _harness(env, "--list-sections")
+    # list-sections already wrote the columnar store; start cold from the CSV.
+    env["WHR_STORE_DIR"] = store_dir + "-cold"
+    cold, warm = _harness(env, "--runs", "2")
+    env["WHR_STORE_DIR"] = store_dir
+    payload = {}
+    for section in sections:
+        extra = [] if section is None else ["--section", section]
+        (result,) = _harness(env, *extra)
+        payload[section or "(whole app)"] = result["bytes"]
+    return {
+        "cold_start": cold["seconds"],
+        "warm_rerun": warm["seconds"],
+        "payload_bytes": sum(payload.values()),
+        "payload_by_section": payload,
+    }
+
+
+def compare(results, baseline, tolerance, slack=0.0):
+    """Return (metric, baseline, current) triples that regressed.
+
+    Timings must also be ``slack`` seconds slower, so millisecond stages do
+    not fail on scheduler noise; byte counts use the tolerance alone.
+    """
+    regressions = []
+    for scale, current in results["scales"].items():
+        previous = baseline.get("scales", {}).get(scale)
+        if previous is None:
+            continue
+        pairs = [("cold_start", previous["app"]["cold_start"], current["app"]["cold_start"]),
+                 ("warm_rerun", previous["app"]["warm_rerun"], current["app"]["warm_rerun"]),
+                 ("payload_bytes", previous["app"]["payload_bytes"], current["app"]["payload_bytes"])]
+        pairs += [(f"stage.{name}", previous["stages"].get(name), seconds)
+                  for name, seconds in current["stages"].items()]
+        for metric, before, after in pairs:
+            margin = 0 if metric == "payload_bytes" else slack
+            if before and after > before * (1 + tolerance) + margin:
+                regressions.append((f"x{scale} {metric}", before, after))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default=os.path.join(ROOT, "WHR2023.csv"))
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None, help="write results JSON here")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with these results")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--slack", type=float, default=0.005, help="absolute seconds a timing may also exceed it by")
+    args = parser.parse_args()
+
+    results = {"python": sys.version.split()[0], "scales": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scale:
+            path = scaled_csv(args.source, scale, tmp)
+            stages, rows = stage_timings(path, args.repeat)
+            app = app_metrics(path, os.path.join(tmp, f"store_x{scale}"))
+            results["scales"][str(scale)] = {"rows": rows, "stages": stages, "app": app}
+            print(f"x{scale}: cold {app['cold_start']:.3f}s warm {app['warm_rerun']:.3f}s "
+                  f"payload {app['payload_bytes'] / 1024:.1f} KiB  "
+                  + " ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in stages.items()))
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(results, fh, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as fh:
+            json.dump(results, fh, indent=2)
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    with open(args.baseline) as fh:
+        regressions = compare(results, json.load(fh), args.tolerance, args.slack)
+    for metric, before, after in regressions:
+        print(f"REGRESSION {metric}: {before:.4g} -> {after:.4g}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
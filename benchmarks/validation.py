@@ -0,0 +1,59 @@
+"""Time of the validation stage on row-tiled copies of ``WHR2023.csv``.
+
+Country names are made unique per copy, and ``--corrupt`` of the rows get a
+random defect (a non-numeric value, an out-of-range indicator, a missing
+required value, an inconsistent whisker or a repeated country) so the
+issue and quarantine paths are exercised too::
+
+    python benchmarks/validation.py --rows 100000 1000000 --corrupt 0.01
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from whr import data  # noqa: E402
+
+
+def tiled(raw, rows, corrupt, seed=0):
+    rng = np.random.default_rng(seed)
+    out = raw.iloc[np.resize(np.arange(len(raw)), rows)].reset_index(drop=True)
+    out["Country name"] = out["Country name"] + " #" + (np.arange(rows) // len(raw)).astype(str)
+    bad = rng.choice(rows, int(rows * corrupt), replace=False)
+    kind = rng.integers(0, 5, len(bad))
+    out["Social support"] = out["Social support"].astype(object)
+    out.loc[bad[kind == 0], "Social support"] = "n/a"
+    out.loc[bad[kind == 1], "Generosity"] = 5.0
+    out.loc[bad[kind == 2], "Healthy life expectancy"] = np.nan
+    out.loc[bad[kind == 3], "lowerwhisker"] = 10.0
+    out.loc[bad[kind == 4], "Country name"] = out["Country name"].iloc[0]
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000])
+    parser.add_argument("--corrupt", type=float, default=0.01, help="share of rows given a defect")
+    args = parser.parse_args()
+
+    raw = pd.read_csv(os.path.join(ROOT, "WHR2023.csv"))
+    print(f"{'rows':>9} {'validate ms':>12} {'rows/s':>12} {'issues':>8} {'quarantined':>12} {'kept':>9}")
+    for rows in args.rows:
+        table = tiled(raw, rows, args.corrupt)
+        start = time.perf_counter()
+        report = data.validate(table)
+        seconds = time.perf_counter() - start
+        quarantined = report.issues.loc[report.issues["Severity"] == "error", "Row"].nunique()
+        print(f"{rows:>9} {seconds * 1e3:>12.0f} {rows / seconds:>12,.0f} {len(report.issues):>8} "
+              f"{quarantined:>12} {len(report.clean):>9}")
+
+
+if __name__ == "__main__":
+    main()
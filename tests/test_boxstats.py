@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from conftest import CSV
+from whr import boxstats, data
+
+
+def plotly_linear(values, p):
+    """Plotly's "linear" quartilemethod: interpolate at 0-based position p*n - 0.5."""
+    values = np.sort(values[~np.isnan(values)])
+    position = np.clip(p * len(values) - 0.5, 0, len(values) - 1)
+    below = int(np.floor(position))
+    above = min(below + 1, len(values) - 1)
+    return values[below] + (position - below) * (values[above] - values[below])
+
+
+def test_quartiles_match_plotly_linear_method():
+    df = data.parse_csv(CSV).df
+    stats = boxstats.summarize(df).stats
+    for column in df.columns:
+        values = df[column].to_numpy(dtype=float)
+        for row, p in (("q1", 0.25), ("median", 0.5), ("q3", 0.75)):
+            assert np.isclose(stats.at[row, column], plotly_linear(values, p)), (column, row)
+
+
+def test_whiskers_and_outliers_follow_tukey():
+    df = pd.DataFrame({"x": [1.0, 2, 3, 4, 5, 6, 7, 8, 100]})
+    summary = boxstats.summarize(df)
+    assert summary.stats.at["upperfence", "x"] == 8
+    assert summary.outliers["x"].tolist() == [False] * 8 + [True]
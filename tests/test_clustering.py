@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import CSV
+from whr import clustering, data, filters
+
+
+def test_filtered_subset_does_not_seed_the_full_model():
+    dataset = data.parse_csv(CSV)
+    subset = filters.apply(dataset, filters.Filter(ranges=(("Ladder Score", 0.0, 6.5),)))
+    clustering._latest.clear()
+    clustering.cluster_model(subset, 4)
+    full = clustering.cluster_model(dataset, 4)
+    fresh = clustering.ClusterModel.fit(dataset.df[clustering.INDICATORS].dropna(), 4)
+    np.testing.assert_allclose(full.centroids, fresh.centroids)
+    assert full.fitted_rows == len(full.values)
+
+
+def test_lineage_reads_the_parent_not_the_version():
+    dataset = data.parse_csv(CSV, version="2023.1")
+    subset = filters.apply(dataset, filters.Filter(ranges=(("Ladder Score", 0.0, 6.5),)))
+    assert subset.parent == "2023.1"
+    assert clustering._lineage(dataset) == "whr"
+    assert clustering._lineage(subset) is None
+
+
+def blobs(rng, k=4, per=60, dims=3):
+    centres = rng.uniform(-10, 10, size=(k, dims))
+    return np.concatenate([centre + rng.normal(size=(per, dims)) for centre in centres])
+
+
+def same_partition(a, b):
+    groups = lambda labels: {frozenset(np.flatnonzero(labels == label)) for label in np.unique(labels)}
+    return groups(a) == groups(b)
+
+
+def test_ward_matches_scipy():
+    hierarchy = pytest.importorskip("scipy.cluster.hierarchy")
+    X = np.random.default_rng(6).normal(size=(120, 4))
+    for k in (2, 5, 9):
+        reference = hierarchy.fcluster(hierarchy.linkage(X, "ward"), k, criterion="maxclust")
+        assert same_partition(clustering.ward_labels(X, k), reference)
+
+
+def test_lloyd_matches_scipy_kmeans():
+    vq = pytest.importorskip("scipy.cluster.vq")
+    rng = np.random.default_rng(7)
+    X = blobs(rng)
+    start = clustering.kmeans_plus_plus(X, 4, rng)
+    centroids, labels, inertia = clustering.lloyd(X, start)
+    ref_centroids, ref_labels = vq.kmeans2(X, start, iter=100, minit="matrix")
+    np.testing.assert_allclose(centroids, ref_centroids)
+    np.testing.assert_array_equal(labels, ref_labels)
+    assert np.isclose(inertia, ((X - centroids[labels]) ** 2).sum())
+
+
+def test_partial_fit_is_a_running_mean():
+    rng = np.random.default_rng(8)
+    columns = [f"x{j}" for j in range(3)]
+    frame = pd.DataFrame(blobs(rng), columns=columns)
+    model = clustering.ClusterModel.fit(frame.iloc[:200], 4)
+    added = frame.iloc[200:]
+    updated = model.partial_fit(added, batch=len(added))
+
+    X = model.standardize(added)
+    nearest = clustering.squared_distances(X, model.centroids).argmin(axis=1)
+    sums = np.array([X[nearest == c].sum(axis=0) for c in range(4)])
+    counts = model.counts + np.bincount(nearest, minlength=4)
+    np.testing.assert_allclose(updated.centroids, (model.counts[:, None] * model.centroids + sums) / counts[:, None])
+    np.testing.assert_array_equal(updated.counts, counts)
+    assert model.extends(frame) and len(updated.values) == len(frame)
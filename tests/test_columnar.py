@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from conftest import CSV
+from whr import columnar
+
+
+def test_raw_table_round_trips_with_missing_values(tmp_path):
+    raw = pd.read_csv(CSV)
+    raw.loc[[2, 7], "Country name"] = np.nan
+    columnar.write_frame(raw, tmp_path / "raw")
+    back = columnar.open_frame(tmp_path / "raw")
+    pd.testing.assert_frame_equal(back, raw)
+    assert back["Country name"].isna().sum() == 2
+
+
+def test_indexed_frame_round_trips(tmp_path):
+    df = pd.DataFrame({"x": [1.0, np.nan, 3.0]}, index=pd.Index(["a", "b", "c"], name="Country Name"))
+    columnar.write_frame(df, tmp_path / "clean")
+    back = columnar.open_frame(tmp_path / "clean")
+    pd.testing.assert_frame_equal(back, df)
+    assert isinstance(back["x"].to_numpy(), np.ndarray)
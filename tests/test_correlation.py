@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from conftest import CSV
+from whr import correlation, data
+
+stats = pytest.importorskip("scipy.stats")
+
+
+@pytest.fixture
+def X():
+    # Rounded so that ties occur, as they do in the published indicators.
+    return np.round(data.parse_csv(CSV).df.dropna().to_numpy(dtype=float), 2)
+
+
+def test_spearman_matches_scipy(X):
+    np.testing.assert_allclose(correlation.correlate(X, "spearman"), stats.spearmanr(X).statistic, atol=1e-12)
+    np.testing.assert_allclose(correlation.correlate(X, "pearson"), np.corrcoef(X, rowvar=False), atol=1e-12)
+
+
+def test_resampled_ranks_match_scipy(X):
+    rng = np.random.default_rng(10)
+    counts = np.stack([np.bincount(rng.integers(0, len(X), len(X)), minlength=len(X)) for _ in range(3)]).astype(float)
+    ranks = correlation.resample_ranks(X, counts)
+    for b, weights in enumerate(counts):
+        expanded = np.repeat(X, weights.astype(int), axis=0)
+        reference = stats.rankdata(expanded, axis=0)
+        np.testing.assert_allclose(np.repeat(ranks[b], weights.astype(int), axis=0), reference)
+        np.testing.assert_allclose(
+            correlation.weighted_correlate(ranks[b:b + 1], counts[b:b + 1])[0],
+            stats.spearmanr(expanded).statistic, atol=1e-12)
+
+
+def test_bootstrap_is_reproducible_and_brackets_the_estimate(X):
+    result = correlation.correlations(data.parse_csv(CSV).df, "spearman", replicates=1_000)
+    again = correlation.correlations(data.parse_csv(CSV).df, "spearman", replicates=1_000)
+    assert result.low.equals(again.low) and result.high.equals(again.high)
+    r = result.matrix.to_numpy()
+    assert ((result.low.to_numpy() <= r + 1e-6) & (r - 1e-6 <= result.high.to_numpy())).all()
+    assert correlation.strength(0.75) == "strong positive"
+    assert correlation.strength(-0.45) == "moderate negative"
+    assert correlation.strength(0.04) == "negligible"
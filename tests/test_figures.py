@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import CSV
+from whr import data, figures, outliers, trendlines
+
+
+@pytest.fixture(scope="module")
+def large():
+    """A dataset above the density-scatter limit, tiled from the real table."""
+    raw = pd.read_csv(CSV)
+    copies = [raw.assign(**{"Country name": raw["Country name"] + f" #{i}"}) for i in range(800)]
+    raw = pd.concat(copies, ignore_index=True)
+    return data.Dataset(raw=raw, df=data.clean(raw), version="large-test")
+
+
+def test_density_scatter_with_and_without_color(large):
+    assert len(large.df) > figures.SCATTER_DENSITY_LIMIT
+    fig = figures.scatter(large, large.df, x="Social Support", trendline=True)
+    assert fig.data[0].type == "heatmap"
+    assert fig.data[-1].line.color == trendlines.LINE_COLOR
+    fig = figures.scatter(large, large.df, x="Social Support", trendline=True, color_discrete_sequence=["#123456"])
+    assert fig.data[-1].line.color == "#123456"
+
+
+def test_density_scatter_marks_cluster_means(large):
+    fig = figures.scatter(large, large.df, x="Social Support", trendline=True, clusters=3)
+    means = [trace for trace in fig.data if trace.type == "scatter" and trace.mode == "markers+text"]
+    assert [trace.name for trace in means] == ["Cluster 1", "Cluster 2", "Cluster 3"]
+
+
+def test_box_markers_are_beyond_the_whiskers():
+    dataset = data.parse_csv(CSV)
+    fig = figures.box(dataset, dataset.df, x="Generosity", mode="summary")
+    box, markers = fig.data
+    assert all(value > box.upperfence[0] or value < box.lowerfence[0] for value in markers.x)
+    found = outliers.outliers(dataset)
+    assert set(markers.hovertext) == set(dataset.df.index[found.iqr["Generosity"].to_numpy()])
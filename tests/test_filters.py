@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from conftest import CSV
+from whr import data, filters
+
+
+def reference(df, spec, groups):
+    mask = np.ones(len(df), dtype=bool)
+    for column, low, high in spec.ranges:
+        mask &= df[column].between(low, high).to_numpy()
+    if spec.groups:
+        members = [country for name in spec.groups for country in groups.get(name, [])]
+        mask &= df.index.isin(members)
+    return np.flatnonzero(mask)
+
+
+def test_select_matches_boolean_indexing():
+    rng = np.random.default_rng(9)
+    n = 5_000
+    df = pd.DataFrame({"a": rng.normal(size=n), "b": rng.uniform(size=n), "c": rng.integers(0, 50, n).astype(float)},
+                      index=pd.Index([f"country {i}" for i in range(n)], name="Country Name"))
+    df.loc[df.index[::11], "b"] = np.nan
+    groups = {"even": list(df.index[::2]), "first": list(df.index[:300]), "empty": ["nowhere"]}
+    index = filters.FilterIndex(df, groups)
+    specs = [
+        filters.Filter(ranges=(("a", -0.05, 0.05),)),  # narrow: expands rows
+        filters.Filter(ranges=(("a", -2.0, 2.0), ("b", 0.1, 0.9))),  # wide: comparison pass
+        filters.Filter(ranges=(("c", 10, 10), ("b", 0.0, 0.5)), groups=("even",)),
+        filters.Filter(groups=("first", "even")),
+        filters.Filter(groups=("empty",)),
+        filters.Filter(ranges=(("a", 5.0, 9.0),)),
+    ]
+    for spec in specs:
+        np.testing.assert_array_equal(index.select(spec), reference(df, spec, groups))
+
+
+def test_apply_derives_a_version_per_row_set():
+    dataset = data.parse_csv(CSV)
+    spec = filters.Filter(ranges=(("Ladder Score", 6.0, 10.0),), groups=("European Union",))
+    subset = filters.apply(dataset, spec)
+    assert subset.version.startswith(f"{dataset.version}.") and subset.parent == dataset.version
+    same_rows = filters.Filter(ranges=(("Ladder Score", 5.99, 9.0),), groups=("European Union",))
+    assert filters.apply(dataset, same_rows).version == subset.version
+    fewer = filters.Filter(ranges=(("Ladder Score", 7.0, 10.0),), groups=("European Union",))
+    assert filters.apply(dataset, fewer).version != subset.version
+    expected = dataset.df[(dataset.df["Ladder Score"] >= 6) & dataset.df.index.isin(filters.GROUPS["European Union"])]
+    pd.testing.assert_frame_equal(subset.df, expected)
+    assert len(subset.raw) == len(subset.df)
+    assert filters.apply(dataset, filters.Filter()) is dataset
+    assert filters.slider_bounds(filters.filter_index(dataset), "Ladder Score") == (1.85, 7.81)
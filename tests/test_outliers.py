@@ -0,0 +1,23 @@
+import numpy as np
+
+from conftest import CSV
+from whr import data, outliers
+
+
+def test_lists_come_from_the_flagging_rules():
+    df = data.parse_csv(CSV).df
+    found = outliers.detect(df)
+    for column in df.columns:
+        x = df[column].to_numpy(dtype=float)
+        q1, q3 = np.nanquantile(x, [0.25, 0.75], method="hazen")
+        median = np.nanmedian(x)
+        mad = np.nanmedian(np.abs(x - median))
+        z = outliers.MAD_SCALE * (x - median) / mad
+        flagged = (x < q1 - 1.5 * (q3 - q1)) | (x > q3 + 1.5 * (q3 - q1)) | (np.abs(z) > outliers.ROBUST_Z_LIMIT)
+        assert set(found.outlying(df, column).index) == set(df.index[flagged & (z > 0)])
+        assert set(found.outlying(df, column, largest=False).index) == set(df.index[flagged & (z < 0)])
+
+    assert found.outlying(df, "Generosity").index[0] == "Indonesia"
+    assert found.outlying(df, "Logged Gdp Per Capita", largest=False).index.tolist() == ["Venezuela"]
+    assert found.off_trend("Healthy Life Expectancy").index.tolist() == ["Lebanon"]
+    assert found.off_trend("Ladder Score").empty
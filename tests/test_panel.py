@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+import pytest
+
+from whr import panel
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "panel")
+
+
+@pytest.fixture(scope="module")
+def store():
+    return panel.ingest_directory(FIXTURES)
+
+
+@pytest.mark.parametrize("year, score, freedom", [(2015, 7.406, 0.64169), (2017, 7.469, 0.617951), (2019, 7.769, 0.596)])
+def test_contribution_eras_fill_the_explained_columns(store, year, score, freedom):
+    finland = store.country("Finland").loc[year]
+    assert finland["Ladder Score"] == pytest.approx(score)
+    assert finland["Explained By: Freedom To Make Life Choices"] == pytest.approx(freedom)
+    assert np.isnan(finland[panel.INDICATORS[1:7]]).all()
+    assert not np.isnan(finland[panel.EXPLAINED]).any()
+
+
+def test_2015_headers_map_each_factor():
+    columns = panel.normalize_columns([
+        "Country", "Happiness Score", "Economy (GDP per Capita)", "Family", "Health (Life Expectancy)",
+        "Freedom", "Trust (Government Corruption)", "Generosity", "Dystopia Residual",
+    ])
+    assert columns == ["Country Name", "Ladder Score", *panel.EXPLAINED[:4], panel.EXPLAINED[5],
+                       panel.EXPLAINED[4], "Dystopia + Residual"]
+
+
+def test_2017_dotted_headers_match_the_2015_names():
+    columns = panel.normalize_columns(["Country", "Happiness.Score", "Economy..GDP.per.Capita.", "Freedom"])
+    assert columns == ["Country Name", "Ladder Score", panel.EXPLAINED[0], panel.EXPLAINED[3]]
+
+
+def test_current_headers_keep_values_and_contributions_apart(store):
+    finland = store.country("Finland").loc[2023]
+    assert finland["Freedom To Make Life Choices"] == pytest.approx(0.961)
+    assert finland["Explained By: Freedom To Make Life Choices"] == pytest.approx(0.772)
+    assert finland["Dystopia + Residual"] == pytest.approx(2.363)
+
+
+def test_panel_file_takes_years_from_its_column(store):
+    finland = store.country("Finland")
+    assert list(finland.index) == [2015, 2017, 2019, 2021, 2022, 2023]
+    assert finland.loc[2022, "Ladder Score"] == pytest.approx(7.729)
+    assert finland.loc[2022, "Healthy Life Expectancy"] == pytest.approx(71.15)
+    assert np.isnan(finland.loc[2022, panel.EXPLAINED]).all()
+
+
+def test_year_is_a_cross_section(store):
+    assert list(store.year(2022).index) == ["Finland", "Switzerland"]
+    assert list(store.year(2021).index) == ["Finland"]
+    assert store.year(2016).empty
+    np.testing.assert_array_equal(store.available_years(), [2015, 2017, 2019, 2021, 2022, 2023])
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from whr import payload
+
+
+def test_rounded_floats_stay_double():
+    packed = payload.compact(np.array([7.8039999, 6.5412, np.nan]))
+    assert packed.dtype == np.float64
+    np.testing.assert_array_equal(packed, [7.804, 6.541, np.nan])
+
+
+def test_whole_numbers_become_small_integers():
+    assert payload.compact(np.array([1.0, 2.0, 137.0])).dtype == np.uint8
+    assert payload.compact(np.array([-1, 40000])).dtype == np.int32
+    assert payload.compact(np.array(["a", "b"])) is None
+
+
+def test_sizes_are_recorded_only_when_profiling(monkeypatch):
+    go = pytest.importorskip("plotly.graph_objects")
+    monkeypatch.setattr(payload, "RECORD_SIZES", False)
+    payload.minimize(go.Figure(go.Bar(x=[1.0, 2.0], y=[0.12345, 0.5])), "unmeasured")
+    monkeypatch.setattr(payload, "RECORD_SIZES", True)
+    fig = payload.minimize(go.Figure(go.Bar(x=[1.0, 2.0], y=[0.12345, 0.5])), "measured")
+    charts = [row["chart"] for row in payload.report()]
+    assert "measured" in charts and "unmeasured" not in charts
+    assert fig.data[0].y.tolist() == [0.123, 0.5]
@@ -0,0 +1,26 @@
+import streamlit as st
+
+from whr import profiling
+
+
+def test_byte_counter_skips_untested_streamlit(monkeypatch):
+    monkeypatch.setattr(st, "__version__", "2.1.0")
+    from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+
+    enqueue = ScriptRunContext.enqueue
+    assert profiling._install_byte_counter() is False
+    assert ScriptRunContext.enqueue is enqueue
+
+
+def test_one_session_at_a_time_measures_memory():
+    first, second = profiling.Profiler("a"), profiling.Profiler("b")
+    with first.section("outer"):
+        with first.section("inner"):
+            with second.section("other"):
+                pass
+    with second.section("after"):
+        pass
+    memory = {record["name"]: record["process_peak_memory"] for record in first.records + second.records}
+    assert memory["other"] is None
+    assert memory["outer/inner"] is not None and memory["outer"] is not None and memory["after"] is not None
+    assert not profiling._memory_lock.locked()
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import CSV
+from whr import data, ranking
+
+
+def ordered(df, metric, ascending, kind="quicksort"):
+    table = df.sort_values(by=metric, ascending=ascending, kind=kind)
+    return table[table[metric].notna()]
+
+
+@pytest.fixture(scope="module")
+def df():
+    return data.parse_csv(CSV).df
+
+
+def test_heads_match_the_original_sort_values(df):
+    index = ranking.RankingIndex(df)
+    pd.testing.assert_frame_equal(index.top("Ladder Score", 10), ordered(df, "Ladder Score", False).head(10))
+    pd.testing.assert_frame_equal(index.bottom("Ladder Score", 10), ordered(df, "Ladder Score", True).head(10))
+    for metric in df.columns[1:7]:
+        pd.testing.assert_frame_equal(index.top(metric, 5), ordered(df, metric, False).head(5))
+
+
+def test_full_orderings_match_a_stable_sort(df):
+    index = ranking.RankingIndex(df)
+    for metric in df.columns:
+        for largest in (True, False):
+            got = (index.top if largest else index.bottom)(metric, len(df))
+            # Same values as the original sort; ties keep table order.
+            np.testing.assert_array_equal(got[metric], ordered(df, metric, not largest)[metric])
+            pd.testing.assert_frame_equal(got, ordered(df, metric, not largest, kind="stable"))
+
+
+def test_ties_and_missing_values():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(rng.integers(0, 4, size=(500, 2)).astype(float), columns=["a", "b"],
+                      index=[f"c{i}" for i in range(500)])
+    df.iloc[::9, 1] = np.nan
+    index = ranking.RankingIndex(df)
+    for metric in df.columns:
+        for largest in (True, False):
+            expected = ordered(df, metric, not largest, kind="stable")
+            for k in (0, 1, 7, 600):
+                pd.testing.assert_frame_equal((index.top if largest else index.bottom)(metric, k), expected.head(k))
+    by_b = ordered(df, "b", False, kind="stable").index
+    expected_ranks = pd.Series(np.arange(1.0, len(by_b) + 1), index=by_b).reindex(df.index)
+    pd.testing.assert_series_equal(index.ranks["b"], expected_ranks, check_names=False)
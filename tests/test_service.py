@@ -0,0 +1,73 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from conftest import CSV
+from whr import data, service
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(data, "STORE_DIR", str(tmp_path))
+    server = service.make_server(port=0, data_path=CSV)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server, path, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address)
+    connection.request("GET", path, headers=headers or {})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, json.loads(body) if body else None
+
+
+def test_top_and_bottom_match_the_table(server):
+    df = data.parse_csv(CSV).df
+    response, body = get(server, "/top?metric=social%20support&k=3")
+    assert response.status == 200
+    assert [row["country"] for row in body["countries"]] == df["Social Support"].nlargest(3).index.tolist()
+    _, body = get(server, "/bottom?k=2")
+    assert [row["country"] for row in body["countries"]] == df["Ladder Score"].nsmallest(2).index.tolist()
+    _, body = get(server, "/countries/finland")
+    assert body["country"] == "Finland" and body["ranks"]["Ladder Score"] == 1
+
+
+def test_etag_revalidation(server):
+    response, body = get(server, "/describe")
+    etag = response.getheader("ETag")
+    assert etag == f'"{body["version"]}"'
+    response, body = get(server, "/describe", {"If-None-Match": etag})
+    assert response.status == 304 and body is None
+    response, _ = get(server, "/describe", {"If-None-Match": '"stale"'})
+    assert response.status == 200
+
+
+def test_errors(server):
+    etag = get(server, "/metrics")[0].getheader("ETag")
+    for path, status in [("/top?metric=height", 400), ("/top?k=-1", 400), ("/top?k=x", 400),
+                         ("/countries/atlantis", 404), ("/nowhere", 404)]:
+        for headers in ({}, {"If-None-Match": etag}, {"If-None-Match": "*"}):
+            response, body = get(server, path, headers)
+            assert response.status == status and "error" in body
+            assert response.getheader("ETag") is None
+
+
+def test_unhandled_errors_answer_500_and_keep_serving(server, monkeypatch, capsys):
+    def broken(dataset, query):
+        raise ZeroDivisionError("boom")
+
+    monkeypatch.setitem(service.ROUTES, "/metrics", broken)
+    response, body = get(server, "/metrics?uncached")
+    assert response.status == 500
+    assert response.getheader("Content-Type") == "application/json"
+    assert body == {"error": "internal server error"}
+    assert "ZeroDivisionError: boom" in capsys.readouterr().err
+    response, _ = get(server, "/top?k=1")
+    assert response.status == 200
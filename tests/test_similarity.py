@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import CSV
+from whr import data, similarity
+
+
+def test_kdtree_matches_brute_force():
+    rng = np.random.default_rng(4)
+    points = np.r_[rng.normal(size=(3_000, 6)), np.zeros((40, 6))]  # with duplicates
+    tree = similarity.KDTree(points, leafsize=16)
+    brute = similarity.BruteForce(points)
+    for x in np.r_[rng.normal(size=(50, 6)), points[:5], np.zeros((1, 6))]:
+        for k in (1, 6, 60):
+            d_tree, i_tree = tree.query(x, k)
+            d_brute, i_brute = brute.query(x, k)
+            np.testing.assert_allclose(d_tree, d_brute)
+            np.testing.assert_allclose(((points[i_tree] - x) ** 2).sum(axis=1) ** 0.5, d_brute)
+
+
+def test_kdtree_matches_scipy():
+    spatial = pytest.importorskip("scipy.spatial")
+    rng = np.random.default_rng(5)
+    points = rng.uniform(size=(2_000, 3))
+    tree = similarity.KDTree(points)
+    reference = spatial.cKDTree(points)
+    for x in rng.uniform(size=(30, 3)):
+        d, i = tree.query(x, 8)
+        d_ref, i_ref = reference.query(x, 8)
+        np.testing.assert_allclose(d, d_ref)
+        np.testing.assert_array_equal(i, i_ref)
+
+
+def test_neighbours_are_the_same_for_every_index():
+    df = data.parse_csv(CSV).df
+    tables = [similarity.SimilarityIndex(df, method=method).neighbours("Finland", 5)
+              for method in ("brute", "kdtree")]
+    pd.testing.assert_frame_equal(*tables)
+    assert "Finland" not in tables[0].index
+    assert tables[0]["Distance"].is_monotonic_increasing
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from whr import sketch
+
+
+def rank_error(data, value, q):
+    ordered = np.sort(data)
+    low, high = np.searchsorted(ordered, value, "left"), np.searchsorted(ordered, value, "right")
+    target = q * len(ordered)
+    return 0.0 if low <= target <= high else min(abs(low - target), abs(high - target)) / len(ordered)
+
+
+def test_quantiles_within_rank_error():
+    rng = np.random.default_rng(1)
+    data = np.concatenate([rng.lognormal(size=150_000), rng.normal(50, 5, size=50_000)])
+    qs = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+    for seed in range(3):
+        kll = sketch.QuantileSketch(error=0.01, seed=seed)
+        for chunk in np.array_split(rng.permutation(data), 17):
+            kll.update(chunk)
+        assert kll.n == len(data)
+        for q, value in zip(qs, kll.quantile(qs)):
+            assert rank_error(data, value, q) < 0.02
+        assert sum(len(items) for items in kll.levels) < 2_000
+
+
+def test_merged_sketches_cover_both_streams():
+    rng = np.random.default_rng(2)
+    left, right = rng.uniform(0, 1, 80_000), rng.uniform(1, 2, 120_000)
+    a, b = sketch.QuantileSketch(seed=1), sketch.QuantileSketch(seed=2)
+    a.update(left)
+    b.update(np.r_[right, np.nan])
+    a.merge(b)
+    assert a.n == len(left) + len(right)
+    data = np.r_[left, right]
+    for q, value in zip([0.2, 0.4, 0.5, 0.8], a.quantile([0.2, 0.4, 0.5, 0.8])):
+        assert rank_error(data, value, q) < 0.02
+
+
+def test_streaming_describe_matches_pandas():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({"x": rng.normal(size=30_000), "y": rng.exponential(size=30_000)})
+    df.loc[::7, "y"] = np.nan
+    approx = sketch.describe(df, exact=False, chunksize=4_096)
+    exact = df.describe()
+    exact_rows = ["count", "mean", "std", "min", "max"]
+    pd.testing.assert_frame_equal(approx.loc[exact_rows], exact.loc[exact_rows], rtol=1e-9)
+    for column in df.columns:
+        for q in ("25%", "50%", "75%"):
+            values = df[column].dropna().to_numpy()
+            assert rank_error(values, approx.at[q, column], float(q[:-1]) / 100) < 0.02
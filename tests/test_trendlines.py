@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from whr import trendlines
+
+def test_incomplete_beta_matches_scipy():
+    special = pytest.importorskip("scipy.special")
+    a, b = np.meshgrid([0.5, 1.0, 2.5, 40.0, 150.0], [0.5, 3.0, 25.0])
+    for x in (0.0, 1e-6, 0.2, 0.5, 0.93, 1.0):
+        np.testing.assert_allclose(trendlines._betainc(a, b, x), special.betainc(a, b, x), rtol=1e-9, atol=1e-14)
+
+
+def test_t_pvalue_matches_scipy():
+    stats = pytest.importorskip("scipy.stats")
+    t = np.array([-8.0, -2.1, -0.3, 0.0, 0.7, 1.96, 4.5, 12.0])
+    for dof in (1, 3, 10, 135, 1000):
+        np.testing.assert_allclose(trendlines.t_pvalue(t, dof), 2 * stats.t.sf(np.abs(t), dof), rtol=1e-8, atol=1e-300)
+
+
+def test_fit_ols_matches_linregress():
+    stats = pytest.importorskip("scipy.stats")
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(200, 2))
+    y = 1.5 + 0.8 * x[:, 0] - 0.1 * x[:, 1] + rng.normal(size=200)
+    x[rng.choice(200, 15, replace=False), 1] = np.nan
+    df = pd.DataFrame({"a": x[:, 0], "b": x[:, 1], "y": y})
+    fit = trendlines.fit_ols(df, ["a", "b"], "y")
+    for feature in ("a", "b"):
+        rows = df[[feature, "y"]].dropna()
+        ref = stats.linregress(rows[feature], rows["y"])
+        row = fit.loc[feature]
+        np.testing.assert_allclose(
+            [row["slope"], row["intercept"], row["r_squared"], row["slope_stderr"], row["slope_pvalue"]],
+            [ref.slope, ref.intercept, ref.rvalue ** 2, ref.stderr, ref.pvalue], rtol=1e-8)
+        assert row["n"] == len(rows)
+
+
+def test_singular_features_give_nan_not_an_error():
+    df = pd.DataFrame({
+        "good": [1.0, 2.0, 3.0, 4.0, 5.0],
+        "constant": [2.0] * 5,
+        "sparse": [np.nan, np.nan, np.nan, 7.0, np.nan],
+        "pair": [np.nan, np.nan, np.nan, 1.0, 2.0],
+        "y": [2.1, 3.9, 6.2, 8.1, 9.8],
+    })
+    with np.errstate(all="raise"):
+        fit = trendlines.fit_ols(df, ["good", "constant", "sparse", "pair"], "y")
+    assert np.isfinite(fit.loc["good", ["slope", "intercept", "slope_pvalue"]].astype(float)).all()
+    for feature in ("constant", "sparse"):
+        assert fit.loc[feature, ["slope", "intercept", "slope_pvalue", "r_squared"]].isna().all()
+    assert np.isclose(fit.loc["pair", "slope"], 1.7) and np.isnan(fit.loc["pair", "slope_pvalue"])
+
+    fig = go.Figure(go.Scatter(x=df["constant"], y=df["y"], mode="markers"))
+    assert len(trendlines.add_trendline(fig, fit.loc["constant"]).data) == 1
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import CSV
+from whr import columnar, data, uncertainty, validation, whatif
+
+
+@pytest.fixture
+def raw():
+    return pd.read_csv(CSV)
+
+
+def dropna_clean(raw):
+    """The cleaning the validation stage replaced."""
+    df = raw.copy()
+    df.columns = df.columns.str.title()
+    return df[data.COLUMNS].set_index("Country Name").dropna(subset=data.REQUIRED)
+
+
+def test_clean_matches_dropna(raw):
+    report = data.validate(raw)
+    pd.testing.assert_frame_equal(report.clean, dropna_clean(raw))
+    assert report.quarantine()["Country Name"].tolist() == ["State of Palestine"]
+
+
+def test_defects_are_quarantined(raw):
+    bad = pd.concat([raw, raw.iloc[[0]]], ignore_index=True)
+    bad["Social support"] = bad["Social support"].astype(object)
+    bad.loc[3, "Social support"] = "n/a"
+    bad.loc[5, "Generosity"] = 4.0
+    bad.loc[7, "lowerwhisker"] = 9.0
+    bad.loc[11, "Perceptions of corruption"] = np.nan
+
+    report = data.validate(bad)
+    reasons = dict(zip(report.quarantine()["Row"], report.quarantine()["Reasons"]))
+    assert reasons[3] == "not numeric: Social Support"
+    assert reasons[5] == "out of range: Generosity"
+    assert reasons[7] == "score outside whiskers: Ladder Score"
+    assert reasons[len(raw)] == "duplicate: Country Name"
+    assert 11 not in reasons and bad.loc[11, "Country name"] in report.clean.index
+    assert len(report.clean) == len(raw) - 1 - 3
+    assert report.clean.index.is_unique
+    np.testing.assert_array_equal(bad["Country name"].iloc[report.kept], report.clean.index)
+
+
+def test_missing_column_is_a_schema_error(raw):
+    with pytest.raises(validation.SchemaError):
+        data.validate(raw.drop(columns="Generosity"))
+
+
+def test_duplicate_country_keeps_raw_columns_aligned(raw, tmp_path):
+    # Regression: a repeated country used to break the label reindex in raw_columns.
+    path = tmp_path / "duplicated.csv"
+    pd.concat([raw, raw.iloc[[0]]], ignore_index=True).to_csv(path, index=False)
+    dataset = data.parse_csv(str(path))
+
+    errors = uncertainty.standard_errors(dataset)
+    assert errors.index.equals(dataset.df.index)
+    assert errors["Finland"] == raw.loc[0, "Standard error of ladder score"]
+    assert len(whatif.decomposition(dataset).table([0.0] * len(whatif.FACTORS))) == len(dataset.df)
+
+
+def test_store_written_by_older_code_is_not_served(tmp_path, monkeypatch):
+    monkeypatch.setattr(data, "STORE_DIR", str(tmp_path))
+    version = data.fingerprint(CSV)
+    stale = data.parse_csv(CSV)
+    columnar.write_frame(stale.raw, tmp_path / version / "raw")
+    columnar.write_frame(stale.df.iloc[:10], tmp_path / version / "clean")
+
+    dataset = data.parse(CSV)
+    assert len(dataset.df) == len(stale.df)
+    assert columnar.exists(tmp_path / f"v{data.STORE_SCHEMA}" / version / "clean")
+    assert len(data.parse(CSV).df) == len(stale.df)
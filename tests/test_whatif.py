@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from conftest import CSV
+from whr import data, whatif
+
+
+@pytest.fixture(scope="module")
+def decomposition():
+    return whatif.decompose(data.parse_csv(CSV))
+
+
+def test_no_change_keeps_the_scores(decomposition):
+    np.testing.assert_allclose(decomposition.scenario(np.zeros(len(decomposition.factors))), decomposition.scores)
+
+
+@pytest.mark.parametrize("factor", [factor for factor, _, _ in whatif.FACTORS])
+def test_positive_change_moves_every_score_with_the_coefficient(decomposition, factor):
+    i = decomposition.factors.index(factor)
+    changes = np.zeros(len(decomposition.factors))
+    changes[i] = 0.3
+    delta = (decomposition.scenario(changes) - decomposition.scores) * np.sign(decomposition.coefficients[i])
+    assert (delta >= -1e-12).all()
+
+
+def test_positive_generosity_change_never_lowers_a_score(decomposition):
+    i = decomposition.factors.index("Generosity")
+    assert (decomposition.values[:, i] < 0).any() and decomposition.coefficients[i] > 0
+    changes = np.zeros(len(decomposition.factors))
+    changes[i] = 0.5
+    delta = decomposition.scenario(changes) - decomposition.scores
+    assert (delta >= 0).all()
+    np.testing.assert_allclose(delta, 0.5 * decomposition.spreads[i] * decomposition.coefficients[i])
@@ -0,0 +1 @@
+"""Data and computation helpers behind the World Happiness Report dashboard."""
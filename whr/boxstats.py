@@ -0,0 +1,53 @@
+"""Server-side box-plot statistics for every indicator at once.
+
+Quartiles come from one ``nanquantile`` over the whole indicator matrix.
+Plotly's default ``quartilemethod`` ("linear") interpolates at the 0-based
+position ``p * n - 0.5``, which is numpy's ``hazen`` method, not its default.
+Whiskers follow Tukey's rule: the most extreme observations within 1.5 IQR
+of the box. Anything beyond is an outlier.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from whr.cache import VersionedCache
+
+WHISKER_IQR = 1.5
+
+
+@dataclass(frozen=True)
+class BoxSummary:
+    """``stats`` has one column per indicator; ``outliers`` flags cells."""
+
+    stats: pd.DataFrame
+    outliers: pd.DataFrame
+
+
+def summarize(df):
+    X = df.to_numpy(dtype=float)
+    q1, median, q3 = np.nanquantile(X, [0.25, 0.5, 0.75], axis=0, method="hazen")
+    iqr = q3 - q1
+    low_fence = q1 - WHISKER_IQR * iqr
+    high_fence = q3 + WHISKER_IQR * iqr
+
+    with np.errstate(invalid="ignore"):
+        inside = (X >= low_fence) & (X <= high_fence)
+        outside = (X < low_fence) | (X > high_fence)
+    lower_whisker = np.where(inside, X, np.inf).min(axis=0)
+    upper_whisker = np.where(inside, X, -np.inf).max(axis=0)
+
+    stats = pd.DataFrame(
+        [q1, median, q3, lower_whisker, upper_whisker, (~np.isnan(X)).sum(axis=0)],
+        index=["q1", "median", "q3", "lowerfence", "upperfence", "count"],
+        columns=df.columns,
+    )
+    return BoxSummary(stats=stats, outliers=pd.DataFrame(outside, index=df.index, columns=df.columns))
+
+
+_cache = VersionedCache(maxsize=8)
+
+
+def box_summary(dataset):
+    return _cache.get_or_compute(dataset.version, lambda: summarize(dataset.df))
@@ -0,0 +1,89 @@
+"""Process-wide caches shared by every Streamlit session."""
+
+import threading
+from collections import OrderedDict
+
+
+class VersionedCache:
+    """Thread-safe memo table keyed on a dataset version plus call parameters.
+
+    Streamlit keeps imported modules alive between reruns and sessions, so an
+    instance stored at module level is shared by every viewer of the app.
+    ``maxsize`` bounds the number of entries and ``max_bytes`` their total
+    size as measured by ``sizeof``; least recently used entries go first.
+    """
+
+    def __init__(self, maxsize=None, max_bytes=None, sizeof=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get(self, key, default=None):
+        """The cached value for ``key`` if present; never computes."""
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Only one thread computes a given key; concurrent callers wait for it
+        # instead of repeating the work.
+        with key_lock:
+            with self._lock:
+                if key in self._entries:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return self._entries[key]
+                self.misses += 1
+            try:
+                value = compute()
+                size = self.sizeof(value) if self.sizeof else 0
+                with self._lock:
+                    self._entries[key] = value
+                    self._sizes[key] = size
+                    self.nbytes += size
+                    self._evict()
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+        return value
+
+    def _over_budget(self):
+        if self.maxsize is not None and len(self._entries) > self.maxsize:
+            return True
+        return self.max_bytes is not None and self.nbytes > self.max_bytes and len(self._entries) > 1
+
+    def _evict(self):
+        while self._over_budget():
+            key, _ = self._entries.popitem(last=False)
+            self.nbytes -= self._sizes.pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self.nbytes}
@@ -0,0 +1,224 @@
+"""Groups of countries with similar indicator profiles.
+
+Countries are clustered on the standardised indicators of
+:mod:`whr.similarity`, by k-means (k-means++ seeding, Lloyd iterations as
+array operations) or by Ward's agglomerative method. Models are cached per
+dataset version and ``k``.
+
+When a new dataset version only adds rows to the previous one, the previous
+model is updated with mini-batch k-means steps (each centroid moves towards
+its new members with learning rate ``1 / points absorbed``) instead of being
+refitted; the standardisation is kept from the original fit. Once the added
+rows outnumber ``REFIT_FRACTION`` of the fitted ones, the model is refitted.
+Only versions of the same source are updated from one another; filtered
+subsets (whose version carries the filter digest) are always fitted afresh
+and never become the starting point for the full table.
+"""
+
+import threading
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+from whr.cache import VersionedCache
+from whr.similarity import INDICATORS
+
+SCORE = "Ladder Score"
+N_INIT = 8
+MAX_ITER = 100
+BATCH = 1024
+REFIT_FRACTION = 0.5
+SEED = 2023
+UNASSIGNED = "Unassigned"
+
+
+def squared_distances(X, centroids):
+    return (
+        (X ** 2).sum(axis=1)[:, None]
+        - 2 * X @ centroids.T
+        + (centroids ** 2).sum(axis=1)[None, :]
+    )
+
+
+def kmeans_plus_plus(X, k, rng):
+    centroids = [X[rng.integers(len(X))]]
+    closest = ((X - centroids[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        total = closest.sum()
+        pick = rng.choice(len(X), p=closest / total) if total > 0 else rng.integers(len(X))
+        centroids.append(X[pick])
+        closest = np.minimum(closest, ((X - X[pick]) ** 2).sum(axis=1))
+    return np.array(centroids)
+
+
+def lloyd(X, centroids, max_iter=MAX_ITER):
+    k = len(centroids)
+    labels = None
+    for _ in range(max_iter):
+        d2 = squared_distances(X, centroids)
+        new_labels = d2.argmin(axis=1)
+        if labels is not None and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, X)
+        counts = np.bincount(labels, minlength=k)
+        empty = counts == 0
+        if empty.any():
+            # Reseed empty clusters on the points furthest from their centroid.
+            far = np.argsort(d2[np.arange(len(X)), labels])[::-1][: empty.sum()]
+            sums[empty], counts[empty] = X[far], 1
+        centroids = sums / counts[:, None]
+    d2 = squared_distances(X, centroids)
+    labels = d2.argmin(axis=1)
+    return centroids, labels, float(np.maximum(d2[np.arange(len(X)), labels], 0).sum())
+
+
+def ward_labels(X, k):
+    """Ward agglomerative clustering cut at ``k`` clusters (Lance-Williams updates).
+
+    Quadratic memory in the number of rows; meant for country-level tables.
+    """
+    n = len(X)
+    size = np.ones(n)
+    members = np.arange(n)
+    D = squared_distances(X, X) / 2  # Ward cost of merging two singletons
+    np.fill_diagonal(D, np.inf)
+    for _ in range(n - k):
+        i, j = np.unravel_index(np.argmin(D), D.shape)
+        si, sj, sk = size[i], size[j], size
+        d_ij = D[i, j]
+        updated = ((si + sk) * D[i] + (sj + sk) * D[j] - sk * d_ij) / (si + sj + sk)
+        D[i], D[:, i] = updated, updated
+        D[i, i] = np.inf
+        D[j], D[:, j] = np.inf, np.inf
+        size[i] += size[j]
+        members[members == j] = i
+    return np.unique(members, return_inverse=True)[1]
+
+
+@dataclass(frozen=True)
+class ClusterModel:
+    """Centroids in standardised units plus the data they were fitted on."""
+
+    values: pd.DataFrame
+    mean: np.ndarray
+    scale: np.ndarray
+    centroids: np.ndarray
+    counts: np.ndarray
+    labels: np.ndarray
+    inertia: float
+    fitted_rows: int
+
+    @classmethod
+    def fit(cls, values, k, method="kmeans", seed=SEED):
+        mean = values.mean().to_numpy()
+        scale = values.std().to_numpy()
+        X = (values.to_numpy(dtype=float) - mean) / scale
+        k = min(k, len(X))
+        if method == "ward":
+            labels = ward_labels(X, k)
+            centroids = _means(X, labels, k)
+            inertia = float(((X - centroids[labels]) ** 2).sum())
+        else:
+            rng = np.random.default_rng(seed)
+            runs = [lloyd(X, kmeans_plus_plus(X, k, rng)) for _ in range(N_INIT)]
+            centroids, labels, inertia = min(runs, key=lambda run: run[2])
+        counts = np.bincount(labels, minlength=k).astype(float)
+        return cls(values, mean, scale, centroids, counts, labels, inertia, len(X))
+
+    def standardize(self, values):
+        return (values.to_numpy(dtype=float) - self.mean) / self.scale
+
+    def predict(self, values):
+        return squared_distances(self.standardize(values), self.centroids).argmin(axis=1)
+
+    def partial_fit(self, added, batch=BATCH):
+        """A model updated with the rows of ``added`` by mini-batch steps."""
+        centroids, counts = self.centroids.copy(), self.counts.copy()
+        X = self.standardize(added)
+        for start in range(0, len(X), batch):
+            chunk = X[start:start + batch]
+            labels = squared_distances(chunk, centroids).argmin(axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, chunk)
+            absorbed = np.bincount(labels, minlength=len(centroids))
+            counts += absorbed
+            moved = absorbed > 0
+            centroids[moved] += (sums[moved] - absorbed[moved, None] * centroids[moved]) / counts[moved, None]
+        values = pd.concat([self.values, added])
+        model = replace(self, values=values, centroids=centroids, counts=counts)
+        d2 = squared_distances(model.standardize(values), centroids)
+        labels = d2.argmin(axis=1)
+        return replace(model, labels=labels, inertia=float(np.maximum(d2[np.arange(len(d2)), labels], 0).sum()))
+
+    def extends(self, values):
+        """Whether ``values`` is this model's data plus new rows, few enough to absorb."""
+        fitted = self.values.index
+        if not fitted.isin(values.index).all() or len(values) == len(fitted):
+            return False
+        if len(values) - self.fitted_rows > REFIT_FRACTION * self.fitted_rows:
+            return False
+        return np.array_equal(values.loc[fitted].to_numpy(), self.values.to_numpy(), equal_nan=True)
+
+
+def _means(X, labels, k):
+    sums = np.zeros((k, X.shape[1]))
+    np.add.at(sums, labels, X)
+    return sums / np.bincount(labels, minlength=k)[:, None]
+
+
+_cache = VersionedCache(maxsize=16)
+# The latest model per (source, k, method), the starting point for incremental updates.
+_latest = {}
+_latest_lock = threading.Lock()
+
+
+def _lineage(dataset):
+    """The source ``dataset`` was loaded from, or None for a filtered subset."""
+    if dataset.parent is not None:
+        return None
+    return "survey" if dataset.version.startswith("survey-") else "whr"
+
+
+def _model(dataset, k, method):
+    values = dataset.df[INDICATORS].dropna()
+    lineage = _lineage(dataset)
+    if lineage is None:
+        return ClusterModel.fit(values, k, method)
+    with _latest_lock:
+        previous = _latest.get((lineage, k, method))
+    if previous is not None and previous.extends(values):
+        model = previous.partial_fit(values.drop(previous.values.index))
+    else:
+        model = ClusterModel.fit(values, k, method)
+    with _latest_lock:
+        _latest[(lineage, k, method)] = model
+    return model
+
+
+def cluster_model(dataset, k, method="kmeans"):
+    return _cache.get_or_compute((dataset.version, k, method), lambda: _model(dataset, k, method))
+
+
+def cluster_labels(dataset, k, method="kmeans"):
+    """``"Cluster 1"`` ... per country, numbered by mean ladder score (1 = happiest)."""
+    model = cluster_model(dataset, k, method)
+    scores = dataset.df[SCORE].reindex(model.values.index).to_numpy()
+    k = len(model.centroids)
+    members = np.maximum(np.bincount(model.labels, minlength=k), 1)
+    mean_score = np.bincount(model.labels, scores, k) / members
+    number = np.empty(len(mean_score), dtype=int)
+    number[np.argsort(-mean_score, kind="stable")] = np.arange(1, len(mean_score) + 1)
+    names = np.array([f"Cluster {n}" for n in range(1, len(number) + 1)], dtype=object)
+    labels = pd.Series(names[number[model.labels] - 1], index=model.values.index, name="Cluster")
+    return labels.reindex(dataset.df.index, fill_value=UNASSIGNED)
+
+
+def cluster_profiles(dataset, k, method="kmeans"):
+    """Mean of every column of the cleaned table per cluster, with its size."""
+    labels = cluster_labels(dataset, k, method)
+    profiles = dataset.df.groupby(labels).mean()
+    profiles.insert(0, "Countries", labels.value_counts())
+    return profiles.drop(UNASSIGNED, errors="ignore")
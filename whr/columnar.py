@@ -0,0 +1,102 @@
+"""Per-column ``.npy`` store for cleaned frames, opened with memory-mapping.
+
+Each column is written once as its own ``.npy`` file. Readers open them with
+``mmap_mode="r"`` and wrap them in a DataFrame without copying, so every
+process on the host shares the same page-cache pages instead of holding a
+private parsed copy. Text columns are stored as fixed-width strings with
+their missing values recorded in a boolean ``.null.npy`` mask beside them,
+so missing values come back as missing rather than as the text ``"nan"``.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+META = "meta.json"
+INDEX = "index.npy"
+
+
+def _to_array(values):
+    """``values`` as a native array, and the null mask of a text column (or None)."""
+    values = np.asarray(values)
+    if values.dtype == object or values.dtype.kind in "OSU" or not values.dtype.isnative:
+        null = pd.isna(values)
+        return np.where(null, "", values).astype(str), null if null.any() else None
+    return values, None
+
+
+def _save(staging, name, values):
+    array, null = _to_array(values)
+    np.save(os.path.join(staging, name), array)
+    if null is not None:
+        np.save(os.path.join(staging, _null_file(name)), null)
+
+
+def _load(directory, name, mmap_mode=None):
+    values = np.load(os.path.join(directory, name), mmap_mode=mmap_mode)
+    null_path = os.path.join(directory, _null_file(name))
+    if not os.path.exists(null_path):
+        return values
+    values = values.astype(object)
+    values[np.load(null_path)] = np.nan
+    return pd.array(values, dtype="str")
+
+
+def _column_file(position):
+    return f"col{position:04d}.npy"
+
+
+def _null_file(name):
+    return name.replace(".npy", ".null.npy")
+
+
+def write_frame(df, directory):
+    """Write ``df`` to ``directory`` atomically (all files or nothing)."""
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".staging-", dir=parent)
+    try:
+        default_index = isinstance(df.index, pd.RangeIndex)
+        if not default_index:
+            _save(staging, INDEX, df.index.to_numpy(dtype=object))
+        for position, column in enumerate(df.columns):
+            _save(staging, _column_file(position), df[column].to_numpy())
+        meta = {
+            "columns": list(df.columns),
+            "index_name": df.index.name,
+            "default_index": default_index,
+            "rows": len(df),
+        }
+        with open(os.path.join(staging, META), "w") as fh:
+            json.dump(meta, fh)
+        try:
+            os.replace(staging, directory)
+        except OSError:
+            # Another process published the same frame first.
+            if not os.path.exists(os.path.join(directory, META)):
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def open_frame(directory):
+    """Open a frame written by :func:`write_frame` with memory-mapped columns."""
+    with open(os.path.join(directory, META)) as fh:
+        meta = json.load(fh)
+    if meta["default_index"]:
+        index = pd.RangeIndex(meta["rows"], name=meta["index_name"])
+    else:
+        index = pd.Index(_load(directory, INDEX), name=meta["index_name"])
+    data = {
+        column: _load(directory, _column_file(position), mmap_mode="r")
+        for position, column in enumerate(meta["columns"])
+    }
+    return pd.DataFrame(data, index=index, copy=False)
+
+
+def exists(directory):
+    return os.path.exists(os.path.join(directory, META))
@@ -0,0 +1,169 @@
+"""Pearson and Spearman correlation matrices with bootstrap intervals.
+
+Spearman correlations are Pearson correlations of average ranks, with ties
+handled the way ``scipy.stats`` does. A bootstrap batch is drawn as a
+``(B, n)`` matrix of row counts rather than ``B`` copied tables: each
+replicate is then a count-weighted correlation of the original rows, all
+``B`` of them from one batched matrix product, and the Spearman ranks of a
+resample follow from cumulative counts along each presorted column, so no
+replicate is ever gathered or sorted.
+
+Replicate batches are independent streams spawned from one
+:class:`numpy.random.SeedSequence`, so results are reproducible for a given
+seed whether the batches run in this process or in a process pool.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from whr.cache import VersionedCache
+
+REPLICATES = int(os.environ.get("WHR_BOOTSTRAP_REPLICATES", "10000"))
+WORKERS = int(os.environ.get("WHR_BOOTSTRAP_WORKERS", "1"))
+BATCH = 500
+SEED = 2023
+CONFIDENCE = 0.95
+
+# |r| thresholds for the wording used in the report text.
+STRENGTHS = [(0.7, "strong"), (0.4, "moderate"), (0.2, "weak"), (0.0, "negligible")]
+
+
+@dataclass(frozen=True)
+class Correlations:
+    """Point estimates and percentile bootstrap bounds, one matrix each."""
+
+    method: str
+    matrix: pd.DataFrame
+    low: pd.DataFrame
+    high: pd.DataFrame
+    replicates: int
+    rows: int
+
+
+def rank_average(X, axis=-1):
+    """Average ranks (1-based) along ``axis``, ties sharing their mean rank."""
+    X = np.moveaxis(X, axis, -1)
+    order = np.argsort(X, axis=-1, kind="stable")
+    ordered = np.take_along_axis(X, order, axis=-1)
+    n = X.shape[-1]
+    position = np.broadcast_to(np.arange(n), X.shape)
+
+    new_group = np.ones(X.shape, dtype=bool)
+    new_group[..., 1:] = ordered[..., 1:] != ordered[..., :-1]
+    first = np.maximum.accumulate(np.where(new_group, position, 0), axis=-1)
+    last_group = np.ones(X.shape, dtype=bool)
+    last_group[..., :-1] = new_group[..., 1:]
+    last = np.flip(np.minimum.accumulate(np.flip(np.where(last_group, position, n), -1), axis=-1), -1)
+
+    ranks = np.empty(X.shape)
+    np.put_along_axis(ranks, order, (first + last) / 2 + 1, axis=-1)
+    return np.moveaxis(ranks, -1, axis)
+
+
+def correlate(X, method="pearson"):
+    """Correlation matrices of ``X`` with shape ``(..., n, p)``."""
+    if method == "spearman":
+        X = rank_average(X, axis=-2)
+    Z = X - X.mean(axis=-2, keepdims=True)
+    Z /= np.sqrt((Z ** 2).sum(axis=-2, keepdims=True))
+    return np.swapaxes(Z, -1, -2) @ Z
+
+
+def weighted_correlate(V, weights):
+    """Correlation matrices of ``V`` ``(B, n, p)`` with row weights ``(B, n)``."""
+    w = weights[..., None]
+    Z = V - (w * V).sum(axis=1, keepdims=True) / w.sum(axis=1, keepdims=True)
+    cov = np.swapaxes(w * Z, 1, 2) @ Z
+    scale = np.sqrt(np.diagonal(cov, axis1=1, axis2=2))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return cov / scale[:, :, None] / scale[:, None, :]
+
+
+def resample_ranks(X, counts):
+    """Average ranks of every column of ``X`` within each resample.
+
+    ``counts[b, i]`` is how often row ``i`` was drawn into resample ``b``.
+    Tied values in ``X`` form one group; a group's rank in a resample is the
+    number of drawn rows below it plus the mean position within it.
+    """
+    ranks = np.empty((len(counts), *X.shape))
+    for j in range(X.shape[1]):
+        order = np.argsort(X[:, j], kind="stable")
+        ordered = X[order, j]
+        new_group = np.r_[True, ordered[1:] != ordered[:-1]]
+        totals = np.add.reduceat(counts[:, order], np.flatnonzero(new_group), axis=1)
+        average = np.cumsum(totals, axis=1) - (totals - 1) / 2
+        ranks[:, order, j] = average[:, np.cumsum(new_group) - 1]
+    return ranks
+
+
+def _bootstrap_batch(X, method, size, seed):
+    rng = np.random.default_rng(seed)
+    n = len(X)
+    rows = rng.integers(0, n, size=(size, n)) + n * np.arange(size)[:, None]
+    counts = np.bincount(rows.ravel(), minlength=size * n).reshape(size, n).astype(float)
+    values = resample_ranks(X, counts) if method == "spearman" else np.broadcast_to(X, (size, *X.shape))
+    return weighted_correlate(values, counts).astype(np.float32)
+
+
+def bootstrap(X, method="pearson", replicates=REPLICATES, batch=BATCH, seed=SEED, workers=WORKERS):
+    """``(replicates, p, p)`` correlation matrices of row resamples of ``X``."""
+    sizes = [batch] * (replicates // batch) + ([replicates % batch] if replicates % batch else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if workers <= 1:
+        parts = [_bootstrap_batch(X, method, size, s) for size, s in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_bootstrap_batch, [X] * len(sizes), [method] * len(sizes), sizes, seeds))
+    return np.concatenate(parts)
+
+
+def correlations(df, method="pearson", replicates=REPLICATES, seed=SEED, workers=WORKERS):
+    """Correlation matrix of ``df`` over complete rows, with bootstrap bounds."""
+    complete = df.dropna()
+    X = complete.to_numpy(dtype=float)
+    matrix = correlate(X, method)
+    tail = (1 - CONFIDENCE) / 2
+    if replicates:
+        samples = bootstrap(X, method, replicates, seed=seed, workers=workers)
+        low, high = np.quantile(samples, [tail, 1 - tail], axis=0)
+    else:
+        low = high = np.full_like(matrix, np.nan)
+
+    def frame(values):
+        return pd.DataFrame(values, index=df.columns, columns=df.columns)
+
+    return Correlations(method, frame(matrix), frame(low), frame(high), replicates, len(complete))
+
+
+def strength(r):
+    label = next(name for threshold, name in STRENGTHS if abs(r) >= threshold)
+    if label == "negligible":
+        return label
+    return f"{label} {'positive' if r > 0 else 'negative'}"
+
+
+def driver_table(result, target):
+    """Indicators ranked by the size of their correlation with ``target``."""
+    r = result.matrix[target].drop(target)
+    table = pd.DataFrame({
+        "r": r,
+        "ci_low": result.low[target].drop(target),
+        "ci_high": result.high[target].drop(target),
+    })
+    table["strength"] = [strength(value) for value in r]
+    table = table.loc[r.abs().sort_values(ascending=False).index]
+    table.index.name = "Indicator"
+    return table
+
+
+_cache = VersionedCache(maxsize=8)
+
+
+def dataset_correlations(dataset, method="pearson", replicates=REPLICATES):
+    key = (dataset.version, method, replicates)
+    return _cache.get_or_compute(key, lambda: correlations(dataset.df, method, replicates))
@@ -0,0 +1,126 @@
+"""Loading and cleaning of the World Happiness Report CSV."""
+
+import hashlib
+import os
+from dataclasses import dataclass
+
+import pandas as pd
+
+from whr import columnar, validation
+from whr.cache import VersionedCache
+
+DATA_PATH = os.environ.get("WHR_DATA_PATH", "WHR2023.csv")
+STORE_DIR = os.environ.get("WHR_STORE_DIR", ".whr_store")
+# Part of the store path: bump when cleaning or the store layout changes, so
+# copies written by older code are not served.
+STORE_SCHEMA = 2
+
+COLUMNS = [
+    "Country Name",
+    "Ladder Score",
+    "Logged Gdp Per Capita",
+    "Social Support",
+    "Healthy Life Expectancy",
+    "Freedom To Make Life Choices",
+    "Generosity",
+    "Perceptions Of Corruption",
+    "Dystopia + Residual"
+]
+
+REQUIRED = ["Healthy Life Expectancy", "Dystopia + Residual"]
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """A parsed CSV (``raw``), its cleaned projection (``df``) and a version tag.
+
+    ``version`` changes whenever the source file changes and is the key every
+    downstream cache uses. ``parent`` is the version a filtered subset was
+    taken from, and None for a dataset loaded from its source.
+    """
+
+    raw: pd.DataFrame
+    df: pd.DataFrame
+    version: str
+    parent: str | None = None
+
+
+_cache = VersionedCache(maxsize=4)
+
+
+def fingerprint(path):
+    """Return a short tag identifying the current contents of ``path``."""
+    stat = os.stat(path)
+    token = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(token.encode()).hexdigest()[:16]
+
+
+def validate(raw):
+    """Run the :mod:`whr.validation` checks with this table's schema."""
+    return validation.validate(raw, COLUMNS, REQUIRED)
+
+
+def clean(raw):
+    """The validated projection of ``raw``, quarantined rows left out."""
+    return validate(raw).clean
+
+
+def raw_columns(dataset, columns):
+    """Title-cased ``columns`` of ``dataset.raw`` aligned to ``dataset.df``'s rows.
+
+    Columns the raw table does not have come back as all-NaN.
+    """
+    # Only the rows validation kept: quarantined ones may repeat a country.
+    kept = dataset.raw.iloc[quality_report(dataset).kept]
+    raw = kept.set_axis(kept.columns.str.title(), axis=1).set_index("Country Name")
+    return raw.reindex(index=dataset.df.index, columns=columns)
+
+
+def parse_csv(path, version=None, read=pd.read_csv):
+    raw = read(path)
+    return Dataset(raw=raw, df=clean(raw), version=version or fingerprint(path))
+
+
+def parse(path, version=None, read=pd.read_csv):
+    """Open the columnar copy of ``path`` if one exists, else parse the CSV.
+
+    A freshly parsed CSV is written to ``STORE_DIR/v<STORE_SCHEMA>/<version>``
+    so later processes memory-map it instead of parsing text again. ``read``
+    turns ``path`` into the raw frame; it defaults to :func:`pandas.read_csv`.
+    """
+    version = version or fingerprint(path)
+    store = os.path.join(STORE_DIR, f"v{STORE_SCHEMA}", version)
+    raw_dir = os.path.join(store, "raw")
+    clean_dir = os.path.join(store, "clean")
+    if columnar.exists(clean_dir) and columnar.exists(raw_dir):
+        return Dataset(raw=columnar.open_frame(raw_dir), df=columnar.open_frame(clean_dir), version=version)
+
+    dataset = parse_csv(path, version, read)
+    try:
+        columnar.write_frame(dataset.raw, raw_dir)
+        columnar.write_frame(dataset.df, clean_dir)
+    except OSError:
+        # A read-only deployment still works; it just parses on cold start.
+        pass
+    return dataset
+
+
+def load_whr(path=DATA_PATH):
+    """Return the cached :class:`Dataset` for ``path``, parsing only on change.
+
+    The returned frames are shared between sessions and must not be mutated.
+    """
+    version = fingerprint(path)
+    return _cache.get_or_compute(version, lambda: parse(path, version))
+
+
+_reports = VersionedCache(maxsize=4)
+
+
+def quality_report(dataset):
+    """Cached :func:`validate` of ``dataset.raw``: its issues and quarantine."""
+    return _reports.get_or_compute(dataset.version, lambda: validate(dataset.raw))
+
+
+def cache_stats():
+    return _cache.stats()
@@ -0,0 +1,222 @@
+"""Chart builders and a size-bounded cache of finished Plotly figures.
+
+Figures are keyed on the dataset version plus the chart parameters, so a
+rerun over unchanged data skips ``px.*`` construction and validation and only
+pays for Streamlit serialising the cached figure. Builders pass Plotly only
+the columns a chart uses and figures are shrunk by :mod:`whr.payload` before
+they are cached.
+"""
+
+import os
+from itertools import cycle
+
+import numpy as np
+
+from whr import clustering, outliers, payload
+from whr import trendlines as trend
+from whr.cache import VersionedCache
+from whr.lazy import lazy_import
+
+px = lazy_import("plotly.express")
+go = lazy_import("plotly.graph_objects")
+pio = lazy_import("plotly.io")
+
+CACHE_BYTES = int(os.environ.get("WHR_FIGURE_CACHE_MB", "64")) * 2**20
+
+# Scatter plots switch to WebGL above the first limit and to a binned density
+# heatmap above the second, so payload and render time stay bounded.
+SCATTER_WEBGL_LIMIT = int(os.environ.get("WHR_SCATTER_WEBGL_LIMIT", "5000"))
+SCATTER_DENSITY_LIMIT = int(os.environ.get("WHR_SCATTER_DENSITY_LIMIT", "100000"))
+DENSITY_BINS = 120
+
+# Above this many rows box plots send summary statistics instead of every point.
+BOX_POINTS_LIMIT = int(os.environ.get("WHR_BOX_POINTS_LIMIT", "5000"))
+
+
+def figure_bytes(fig):
+    return len(pio.to_json(fig, validate=False))
+
+
+def bar(dataset, frame, **params):
+    return px.bar(payload.project(frame, params), x=frame.index, **params)
+
+
+def pie(dataset, frame, **params):
+    return px.pie(payload.project(frame, params), names=frame.index, **params)
+
+
+def scatter(dataset, frame, x, y=trend.TARGET, trendline=False, mode="auto", clusters=None, **params):
+    """Scatter of ``y`` against ``x``; ``mode`` is ``"svg"``, ``"webgl"``,
+    ``"density"`` or ``"auto"`` (chosen from the row count). ``clusters=k``
+    colours the markers by k-means cluster; a density plot has no markers to
+    colour, so it marks each cluster's mean instead."""
+    full = frame is dataset.df
+    color = params.get("color_discrete_sequence", [None])[0]
+    if mode == "auto":
+        if len(frame) <= SCATTER_WEBGL_LIMIT:
+            mode = "svg"
+        elif len(frame) <= SCATTER_DENSITY_LIMIT:
+            mode = "webgl"
+        else:
+            mode = "density"
+    if mode == "density":
+        fig = density_scatter(frame, x, y, title=params.get("title"))
+        if clusters:
+            add_cluster_means(fig, dataset, frame, clusters, x, y)
+    else:
+        if clusters:
+            frame, params = by_cluster(dataset, frame, clusters, params)
+        plotted = payload.project(frame, params, x, y)
+        fig = px.scatter(plotted, x=x, y=y, hover_name=frame.index, render_mode=mode, **params)
+    if trendline:
+        if full:
+            fits = trend.trendlines(dataset, target=y)
+            if x not in fits.index:
+                fits = trend.trendlines(dataset, [x], y)
+        else:
+            fits = trend.fit_ols(frame, [x], y)
+        trend.add_trendline(fig, fits.loc[x], target=y, color=color)
+    return fig
+
+
+def density_scatter(frame, x, y, bins=DENSITY_BINS, title=None):
+    """Heatmap of row counts on a ``bins`` x ``bins`` grid instead of markers."""
+    xs = frame[x].to_numpy(dtype=float)
+    ys = frame[y].to_numpy(dtype=float)
+    finite = np.isfinite(xs) & np.isfinite(ys)
+    counts, x_edges, y_edges = np.histogram2d(xs[finite], ys[finite], bins=bins)
+    z = np.where(counts > 0, counts, np.nan).T
+
+    fig = go.Figure()
+    fig.add_heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2, y=(y_edges[:-1] + y_edges[1:]) / 2, z=z,
+        colorscale="Viridis", colorbar_title="Rows",
+        hovertemplate=f"{x}=%{{x:.3g}}<br>{y}=%{{y:.3g}}<br>Rows=%{{z}}<extra></extra>",
+    )
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y)
+    return fig
+
+
+def add_cluster_means(fig, dataset, frame, k, x, y):
+    """One labelled marker per k-means cluster at its mean ``(x, y)``."""
+    labels = clustering.cluster_labels(dataset, k).reindex(frame.index, fill_value=clustering.UNASSIGNED)
+    groups = frame[[x, y]].groupby(labels.to_numpy())
+    means, sizes = groups.mean(), groups.size()
+    names = [name for name in cluster_order(labels) if name != clustering.UNASSIGNED]
+    for name, color in zip(names, cycle(px.colors.qualitative.Safe)):
+        fig.add_scatter(
+            x=[means.at[name, x]], y=[means.at[name, y]], mode="markers+text", text=[name],
+            textposition="top center", name=name, customdata=[sizes[name]],
+            marker={"color": color, "size": 14, "symbol": "diamond", "line": {"color": "white", "width": 1}},
+            hovertemplate=f"<b>{name}</b> mean<br>{x}=%{{x:.3g}}<br>{y}=%{{y:.3g}}<br>Rows=%{{customdata}}<extra></extra>",
+        )
+    return fig
+
+
+def box(dataset, frame, x, mode="auto", clusters=None, **params):
+    """Box plot of ``x``; ``mode`` is ``"points"``, ``"summary"`` or ``"auto"``.
+
+    With ``clusters`` set to a k, there is one box per k-means cluster.
+    """
+    if mode == "auto":
+        mode = "points" if len(frame) <= BOX_POINTS_LIMIT else "summary"
+    if mode == "points":
+        if clusters:
+            frame, params = by_cluster(dataset, frame, clusters, params)
+        plotted = payload.project(frame, params, x).reset_index()
+        return px.box(plotted, x=x, points="all", hover_name=frame.index.name, **params)
+    return summary_box(dataset, frame, x, clusters=clusters, **params)
+
+
+def summary_box(dataset, frame, x, title=None, color_discrete_sequence=None, clusters=None):
+    """Box plot drawn from precomputed quartiles plus the actual outliers."""
+    fig = go.Figure()
+    if clusters:
+        labels = clustering.cluster_labels(dataset, clusters).reindex(frame.index, fill_value=clustering.UNASSIGNED)
+        for name, color in zip(cluster_order(labels), cycle(px.colors.qualitative.Safe)):
+            rows = (labels == name).to_numpy()
+            if frame is dataset.df:
+                found = outliers.cluster_outliers(dataset, clusters, name, rows)
+            else:
+                found = outliers.detect(frame.loc[rows, [x]])
+            _add_summary(fig, frame.loc[rows, [x]], x, found, name, color)
+        fig.update_layout(title=title, xaxis_title=x)
+        return fig
+
+    found = outliers.outliers(dataset) if frame is dataset.df else outliers.detect(frame[[x]])
+    color = color_discrete_sequence[0] if color_discrete_sequence else None
+    _add_summary(fig, frame, x, found, x, color)
+    fig.update_layout(title=title, xaxis_title=x, yaxis_showticklabels=False)
+    return fig
+
+
+def _add_summary(fig, frame, x, found, name, color):
+    stats = found.box.stats[x]
+    # Only points beyond the drawn whiskers (the Tukey fences) are marked.
+    flagged = frame.loc[found.iqr[x].to_numpy(), x]
+    z = found.robust_z.loc[flagged.index, x]
+    fig.add_box(
+        y=[name], q1=[stats["q1"]], median=[stats["median"]], q3=[stats["q3"]],
+        lowerfence=[stats["lowerfence"]], upperfence=[stats["upperfence"]],
+        orientation="h", boxpoints=False, name=name, marker_color=color, showlegend=False,
+    )
+    fig.add_scatter(
+        x=flagged.to_numpy(), y=[name] * len(flagged), mode="markers", hovertext=flagged.index,
+        customdata=z.to_numpy(), marker_color=color, name="Outliers", showlegend=False,
+        hovertemplate=f"<b>%{{hovertext}}</b><br><br>{x}=%{{x}}<br>robust z=%{{customdata:.2f}}<extra></extra>",
+    )
+
+
+def cluster_order(labels):
+    """Cluster names in numeric order, with unassigned countries last."""
+    return sorted(labels.unique(), key=lambda name: (name == clustering.UNASSIGNED, len(name), name))
+
+
+def by_cluster(dataset, frame, k, params):
+    """``frame`` with a ``Cluster`` column and Plotly arguments colouring by it."""
+    labels = clustering.cluster_labels(dataset, k).reindex(frame.index, fill_value=clustering.UNASSIGNED)
+    params = dict(
+        params, color="Cluster", category_orders={"Cluster": cluster_order(labels)},
+        color_discrete_sequence=px.colors.qualitative.Safe,
+    )
+    return frame.assign(Cluster=labels.to_numpy()), params
+
+
+def heatmap(dataset, frame, **params):
+    """Annotated heatmap of a square matrix such as a correlation matrix."""
+    return px.imshow(frame, text_auto=".2f", zmin=-1, zmax=1, color_continuous_scale="RdBu",
+                     aspect="auto", **params)
+
+
+BUILDERS = {"bar": bar, "pie": pie, "scatter": scatter, "box": box, "heatmap": heatmap}
+
+_cache = VersionedCache(max_bytes=CACHE_BYTES, sizeof=figure_bytes)
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def chart(dataset, kind, rows, frame, **params):
+    """Return the cached ``kind`` chart of ``frame``, building it on a miss.
+
+    ``rows`` names which slice of the dataset ``frame`` is (``"all"``,
+    ``"top10"``...) and is part of the cache key together with ``params``.
+    Cached figures are shared between sessions and must not be mutated.
+    """
+    key = (dataset.version, kind, rows, _freeze(params))
+    name = f"{kind} {rows}: {params.get('title', '')}"
+    return _cache.get_or_compute(key, lambda: payload.minimize(BUILDERS[kind](dataset, frame, **params), name))
+
+
+def cached_chart(dataset, kind, rows, frame, **params):
+    """The chart :func:`chart` would return if it is already built, else None."""
+    return _cache.get((dataset.version, kind, rows, _freeze(params)))
+
+
+def cache_stats():
+    return _cache.stats()
@@ -0,0 +1,163 @@
+"""Interactive country filters answered from precomputed indexes.
+
+A :class:`FilterIndex` is built once per dataset version. It holds every
+numeric column sorted, with the row order that sorts it, and a boolean mask
+per named country group. A range predicate becomes two ``searchsorted``
+calls on the sorted column, which also count its matches. When the most
+selective range keeps few rows, only those rows are expanded and the other
+ranges and the group masks are tested on them alone, so the cost follows
+the size of the answer rather than of the table. When every range is wide,
+the ranges become masks by one comparison pass over their contiguous
+columns and are intersected with the group masks.
+
+:func:`apply` turns a :class:`Filter` into a :class:`~whr.data.Dataset` of
+the selected rows. Its version is derived from the parent version and the
+selected rows, not the filter, so slider positions that keep the same
+countries share every downstream cache, including the bootstrap and the rank
+simulation.
+"""
+
+import hashlib
+import math
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from whr.cache import VersionedCache
+from whr.data import Dataset
+
+GROUPS_PATH = os.environ.get("WHR_GROUPS_PATH")
+
+# Indicators given a sidebar slider until the user picks others.
+DEFAULT_SLIDERS = ["Logged Gdp Per Capita", "Perceptions Of Corruption"]
+
+# Smallest selection the report sections can describe meaningfully.
+MIN_ROWS = 3
+
+# Above this share of the table, expanding the narrowest range into rows and
+# gathering the other columns at them is slower than a comparison pass.
+EXPAND_FRACTION = 1 / 16
+
+GROUPS = {
+    "Nordic countries": ["Denmark", "Finland", "Iceland", "Norway", "Sweden"],
+    "G7": ["Canada", "France", "Germany", "Italy", "Japan", "United Kingdom", "United States"],
+    "European Union": [
+        "Austria", "Belgium", "Bulgaria", "Croatia", "Cyprus", "Czechia", "Denmark", "Estonia", "Finland",
+        "France", "Germany", "Greece", "Hungary", "Ireland", "Italy", "Latvia", "Lithuania", "Luxembourg",
+        "Malta", "Netherlands", "Poland", "Portugal", "Romania", "Slovakia", "Slovenia", "Spain", "Sweden",
+    ],
+    "BRICS": ["Brazil", "Russia", "India", "China", "South Africa"],
+}
+
+
+def load_groups(path=GROUPS_PATH):
+    """:data:`GROUPS` plus the groups of a two-column (country, group) CSV."""
+    groups = {name: list(members) for name, members in GROUPS.items()}
+    if path:
+        table = pd.read_csv(path)
+        countries, names = table.columns[:2]
+        for name, members in table.groupby(names, sort=False)[countries]:
+            groups.setdefault(name, []).extend(members)
+    return groups
+
+
+@dataclass(frozen=True)
+class Filter:
+    """Closed ``(column, low, high)`` ranges that must all hold, and group
+    names of which a country must belong to at least one."""
+
+    ranges: tuple = ()
+    groups: tuple = ()
+
+    def __bool__(self):
+        return bool(self.ranges or self.groups)
+
+
+class FilterIndex:
+    """Sorted columns and group masks of ``df`` for fast row selection."""
+
+    def __init__(self, df, groups=None):
+        self.index = df.index
+        self.columns = list(df.select_dtypes("number").columns)
+        self._column = {column: j for j, column in enumerate(self.columns)}
+        # Column-major, so each column is one contiguous array to scan or gather from.
+        self.values = np.asfortranarray(df[self.columns].to_numpy(dtype=float))
+        # argsort puts NaNs last, so the first ``valid`` entries are searchable.
+        self.order = np.argsort(self.values, axis=0, kind="stable")
+        self.sorted = np.take_along_axis(self.values, self.order, axis=0)
+        self.valid = (~np.isnan(self.values)).sum(axis=0)
+        self.groups = {
+            name: mask for name, members in (groups if groups is not None else load_groups()).items()
+            if (mask := df.index.isin(members)).any()
+        }
+
+    def bounds(self, column):
+        """Smallest and largest non-missing value of ``column``."""
+        j = self._column[column]
+        return self.sorted[0, j], self.sorted[self.valid[j] - 1, j]
+
+    def _span(self, column, low, high):
+        j = self._column[column]
+        values = self.sorted[: self.valid[j], j]
+        return j, np.searchsorted(values, low, "left"), np.searchsorted(values, high, "right")
+
+    def select(self, spec):
+        """Positions of the rows matching ``spec``, in table order."""
+        if spec.ranges:
+            spans = [self._span(*predicate) for predicate in spec.ranges]
+            j, start, stop = min(spans, key=lambda span: span[2] - span[1])
+            if stop - start <= EXPAND_FRACTION * len(self.index):
+                rows = np.sort(self.order[start:stop, j])
+                for (column, low, high), span in zip(spec.ranges, spans):
+                    if span[0] != j:
+                        values = self.values[rows, span[0]]
+                        rows = rows[(values >= low) & (values <= high)]
+                if spec.groups:
+                    rows = rows[self.group_mask(spec.groups)[rows]]
+                return rows
+        mask = self.group_mask(spec.groups).copy() if spec.groups else np.ones(len(self.index), dtype=bool)
+        for column, low, high in spec.ranges:
+            values = self.values[:, self._column[column]]
+            mask &= values >= low
+            mask &= values <= high
+        return np.flatnonzero(mask)
+
+    def group_mask(self, names):
+        """Rows in any of the groups ``names``."""
+        masks = [self.groups[name] for name in names if name in self.groups]
+        if not masks:
+            return np.zeros(len(self.index), dtype=bool)
+        return np.logical_or.reduce(masks) if len(masks) > 1 else masks[0]
+
+
+_indexes = VersionedCache(maxsize=8)
+_filtered = VersionedCache(maxsize=32)
+
+
+def filter_index(dataset):
+    return _indexes.get_or_compute(dataset.version, lambda: FilterIndex(dataset.df))
+
+
+def _apply(dataset, spec):
+    rows = filter_index(dataset).select(spec)
+    df = dataset.df.iloc[rows]
+    names = dataset.raw[dataset.raw.columns[dataset.raw.columns.str.title() == "Country Name"][0]]
+    raw = dataset.raw[names.isin(df.index).to_numpy()]
+    digest = hashlib.sha1(rows.astype(np.int64).tobytes()).hexdigest()[:12]
+    return Dataset(raw=raw, df=df, version=f"{dataset.version}.{digest}", parent=dataset.version)
+
+
+def apply(dataset, spec):
+    """``dataset`` restricted to the rows ``spec`` selects (itself if ``spec`` is empty)."""
+    if not spec:
+        return dataset
+    return _filtered.get_or_compute((dataset.version, spec), lambda: _apply(dataset, spec))
+
+
+def slider_bounds(index, column, decimals=2):
+    """``bounds`` widened outwards to ``decimals``, so slider steps cover every value."""
+    low, high = index.bounds(column)
+    scale = 10 ** decimals
+    return math.floor(low * scale) / scale, math.ceil(high * scale) / scale
@@ -0,0 +1,52 @@
+"""Deferred module imports.
+
+``lazy_import("plotly.express")`` returns a stand-in that performs the real
+import the first time one of its attributes is used, so a section only pays
+for the libraries it actually renders with.
+"""
+
+import importlib
+import threading
+import time
+import types
+
+# Module name -> seconds spent importing it, for startup profiling.
+import_times = {}
+
+_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with _lock:
+                module = self.__dict__["_module"]
+                if module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self.__name__)
+                    import_times[self.__name__] = time.perf_counter() - start
+                    self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name):
+    return LazyModule(name)
+
+
+def is_loaded(module):
+    return not isinstance(module, LazyModule) or module.__dict__["_module"] is not None
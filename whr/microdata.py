@@ -0,0 +1,172 @@
+"""Build the WHR country table from respondent-level survey microdata.
+
+A respondent file (CSV, Parquet, or a :mod:`whr.columnar` directory) is
+streamed in bounded chunks. Each chunk is reduced to per-country partial sums
+(weights, weighted sums and sums of squares) that merge by plain addition, so
+chunks can be reduced in any order and in worker processes. Peak memory is one
+chunk plus one row per country, whatever the file size.
+
+The result has the ``WHR2023.csv`` schema: ladder score, its standard error,
+the 95% whiskers and per-country means of the indicators present in the file.
+Columns the survey cannot produce (``Dystopia + Residual`` and the "Explained
+by" decomposition) are taken from the published table at ``WHR_DATA_PATH``.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from whr import columnar, data
+from whr.cache import VersionedCache
+from whr.panel import normalize_columns
+
+MICRODATA_PATH = os.environ.get("WHR_MICRODATA_PATH")
+CHUNKSIZE = int(os.environ.get("WHR_MICRODATA_CHUNKSIZE", 500_000))
+WORKERS = int(os.environ.get("WHR_MICRODATA_WORKERS", 1))
+
+COUNTRY = "Country Name"
+LADDER = "Ladder Score"
+WEIGHT = "Weight"
+
+# Output column in the WHR2023.csv schema for each normalised input column.
+INDICATOR_COLUMNS = {
+    "Ladder Score": "Ladder score",
+    "Logged Gdp Per Capita": "Logged GDP per capita",
+    "Social Support": "Social support",
+    "Healthy Life Expectancy": "Healthy life expectancy",
+    "Freedom To Make Life Choices": "Freedom to make life choices",
+    "Generosity": "Generosity",
+    "Perceptions Of Corruption": "Perceptions of corruption",
+}
+STATS = ("w", "sw", "sww", "swx2")
+
+Z_95 = 1.959963984540054
+
+
+def iter_chunks(path, chunksize=CHUNKSIZE):
+    if os.path.isdir(path):
+        frame = columnar.open_frame(path)
+        for start in range(0, len(frame), chunksize):
+            yield frame.iloc[start:start + chunksize]
+    elif path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def partial_aggregate(chunk):
+    """Per-country sufficient statistics of one chunk.
+
+    Column ``<indicator>|w`` is the sum of weights of non-missing answers,
+    ``|sw`` the weighted sum, ``|sww`` the sum of squared weights and
+    ``|swx2`` the weighted sum of squares. Partials merge by addition.
+    """
+    chunk = chunk.set_axis(normalize_columns(chunk.columns), axis=1)
+    indicators = [column for column in INDICATOR_COLUMNS if column in chunk.columns]
+    if WEIGHT in chunk.columns:
+        weights = chunk[WEIGHT].to_numpy(dtype=float)
+    else:
+        weights = np.ones(len(chunk))
+
+    values = chunk[indicators].to_numpy(dtype=float)
+    present = ~np.isnan(values)
+    w = np.where(present, weights[:, None], 0.0)
+    x = np.where(present, values, 0.0)
+    sums = pd.DataFrame(
+        np.concatenate([w, w * x, w * w, w * x * x], axis=1),
+        columns=[f"{column}|{stat}" for stat in STATS for column in indicators],
+    )
+    return sums.groupby(chunk[COUNTRY].to_numpy(), sort=False).sum()
+
+
+def merge(partials):
+    merged = pd.concat(list(partials))
+    if merged.empty:
+        raise ValueError("no respondent rows were read")
+    return merged.groupby(level=0).sum()
+
+
+def finalize(partial):
+    """Turn merged partial sums into the ``WHR2023.csv`` column layout."""
+    out = pd.DataFrame(index=partial.index.rename("Country name"))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for column, output in INDICATOR_COLUMNS.items():
+            if f"{column}|w" not in partial.columns:
+                continue
+            w = partial[f"{column}|w"].to_numpy()
+            mean = partial[f"{column}|sw"].to_numpy() / w
+            out[output] = mean
+            if column == LADDER:
+                # Weighted variance over Kish's effective sample size.
+                variance = np.clip(partial[f"{column}|swx2"].to_numpy() / w - mean ** 2, 0.0, None)
+                n_eff = w ** 2 / partial[f"{column}|sww"].to_numpy()
+                stderr = np.sqrt(variance / (n_eff - 1))
+                out["Standard error of ladder score"] = stderr
+                out["upperwhisker"] = mean + Z_95 * stderr
+                out["lowerwhisker"] = mean - Z_95 * stderr
+    return out.sort_values("Ladder score", ascending=False).reset_index()
+
+
+def aggregate_respondents(path, chunksize=CHUNKSIZE, workers=WORKERS):
+    """Stream ``path`` and return the per-country table.
+
+    With ``workers`` > 1 chunks are reduced in a process pool. At most
+    ``2 * workers`` chunks are in flight, and finished partials are folded
+    as they arrive, so memory stays flat with the pool as well.
+    """
+    chunks = iter_chunks(path, chunksize)
+    if workers <= 1:
+        return finalize(merge(partial_aggregate(chunk) for chunk in chunks))
+
+    merged, pending = [], []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in chunks:
+            pending.append(pool.submit(partial_aggregate, chunk))
+            if len(pending) >= 2 * workers:
+                merged = [merge([*merged, pending.pop(0).result()])]
+        merged.extend(future.result() for future in pending)
+    return finalize(merge(merged))
+
+
+def survey_table(path, base_path=data.DATA_PATH, **kwargs):
+    """Aggregated survey columns, completed from the published table."""
+    table = aggregate_respondents(path, **kwargs).set_index("Country name")
+    base = pd.read_csv(base_path).set_index("Country name")
+    base = base.reindex(table.index)
+    base[table.columns] = table
+    return base.reset_index()
+
+
+_cache = VersionedCache(maxsize=2)
+
+
+def load_survey(path=MICRODATA_PATH, base_path=data.DATA_PATH):
+    """Like :func:`whr.data.load_whr`, but built from respondent microdata.
+
+    The aggregated table goes through the same columnar store, so the
+    respondent file is only streamed again when it or the base table changes.
+    """
+    version = f"survey-{data.fingerprint(path)}-{data.fingerprint(base_path)}"
+    return _cache.get_or_compute(
+        version, lambda: data.parse(path, version, read=lambda p: survey_table(p, base_path)))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Aggregate respondent-level WHR data into a country CSV.")
+    parser.add_argument("source")
+    parser.add_argument("output")
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    aggregate_respondents(args.source, args.chunksize, args.workers).to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Outlier flags for every indicator at once.
+
+Three complementary rules, each one array expression over the whole
+``(rows, indicators)`` matrix:
+
+* IQR fences: Tukey's 1.5 IQR rule, shared with the box plots via
+  :mod:`whr.boxstats`;
+* robust z-scores: ``0.6745 * (x - median) / MAD``, flagged beyond 3.5
+  (Iglewicz and Hoaglin), which unlike the fences is not fooled by skew;
+* regression residuals: studentised residuals of the ladder score against
+  each indicator's trendline from :mod:`whr.trendlines`, flagged beyond 3.
+
+Values beyond the fences or the robust z limit are the outliers the box
+plots mark and the report text lists as high or low; countries far from a
+trendline are listed separately, since their indicator value itself may be
+ordinary.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from whr import boxstats
+from whr import trendlines as trend
+from whr.cache import VersionedCache
+
+MAD_SCALE = 0.6745
+ROBUST_Z_LIMIT = 3.5
+RESIDUAL_LIMIT = 3.0
+
+
+@dataclass(frozen=True)
+class Outliers:
+    box: boxstats.BoxSummary
+    robust_z: pd.DataFrame
+    residuals: pd.DataFrame
+
+    @property
+    def iqr(self):
+        return self.box.outliers
+
+    @property
+    def mad(self):
+        return self.robust_z.abs() > ROBUST_Z_LIMIT
+
+    @property
+    def residual(self):
+        return self.residuals.abs() > RESIDUAL_LIMIT
+
+    def flagged(self, column):
+        """Rows whose ``column`` value is beyond the IQR fences or the robust z limit."""
+        return self.iqr[column] | self.mad[column]
+
+    def outlying(self, df, column, k=None, largest=True):
+        """Flagged values of ``column`` in ``df`` above (or below) the median,
+        most extreme first, at most ``k`` of them."""
+        z = self.robust_z[column].to_numpy()
+        with np.errstate(invalid="ignore"):
+            side = z > 0 if largest else z < 0
+        rows = np.flatnonzero(self.flagged(column).to_numpy() & side)
+        rows = rows[np.argsort(-np.abs(z[rows]), kind="stable")]
+        return df[column].iloc[rows[:k]]
+
+    def off_trend(self, column, k=None):
+        """Studentised residuals beyond the limit on ``column``'s trendline,
+        largest first, at most ``k`` of them (empty without a trendline)."""
+        if column not in self.residuals.columns:
+            return pd.Series(dtype=float)
+        residuals = self.residuals[column]
+        return residuals[self.residual[column]].sort_values(key=abs, ascending=False)[:k]
+
+
+def robust_z(X):
+    median = np.nanmedian(X, axis=0)
+    mad = np.nanmedian(np.abs(X - median), axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return MAD_SCALE * (X - median) / mad
+
+
+def studentized_residuals(df, features, target):
+    fit = trend.fit_ols(df, features, target)
+    x = df[features].to_numpy(dtype=float)
+    y = df[[target]].to_numpy(dtype=float)
+    residuals = y - (fit["intercept"].to_numpy() + fit["slope"].to_numpy() * x)
+    n = fit["n"].to_numpy()
+    scale = np.sqrt(np.nansum(residuals ** 2, axis=0) / (n - 2))
+    # Leverage of each point in its own one-regressor fit.
+    centred = x - np.nanmean(x, axis=0)
+    leverage = 1 / n + centred ** 2 / np.nansum(centred ** 2, axis=0)
+    return residuals / (scale * np.sqrt(1 - leverage))
+
+
+def detect(df, box=None, features=trend.FEATURES, target=trend.TARGET):
+    X = df.to_numpy(dtype=float)
+    z = robust_z(X)
+    features = [feature for feature in features if feature in df.columns and target in df.columns]
+    residuals = studentized_residuals(df, features, target) if features else np.empty((len(df), 0))
+    return Outliers(
+        box=box if box is not None else boxstats.summarize(df),
+        robust_z=pd.DataFrame(z, index=df.index, columns=df.columns),
+        residuals=pd.DataFrame(residuals, index=df.index, columns=features),
+    )
+
+
+_cache = VersionedCache(maxsize=32)
+
+
+def outliers(dataset):
+    return _cache.get_or_compute(dataset.version, lambda: detect(dataset.df, boxstats.box_summary(dataset)))
+
+
+def cluster_outliers(dataset, k, name, rows):
+    """:func:`detect` on the rows of cluster ``name`` of ``k`` (a boolean mask)."""
+    return _cache.get_or_compute((dataset.version, k, name), lambda: detect(dataset.df.loc[rows]))
@@ -0,0 +1,191 @@
+"""Multi-year ingestion into a compact (country, year) panel store.
+
+A directory of yearly WHR CSVs is streamed in chunks. Headers go through the
+same ``str.title()`` + :data:`whr.data.COLUMNS` normalisation as the single
+snapshot, plus aliases for older releases. The 2015-2019 reports published
+only each factor's contribution to the score under the factor's own name
+("Freedom", "Family", "Social support"), so files with those headers fill the
+"Explained By" columns and leave the indicators NaN. Values are kept as one
+float32 matrix sorted by (country, year); a second permutation sorted by
+(year, country) makes per-year cross-sections a slice as well.
+"""
+
+import glob
+import hashlib
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from whr.cache import VersionedCache
+from whr.data import COLUMNS, fingerprint
+
+INDICATORS = COLUMNS[1:]
+
+EXPLAINED = [
+    "Explained By: Log Gdp Per Capita",
+    "Explained By: Social Support",
+    "Explained By: Healthy Life Expectancy",
+    "Explained By: Freedom To Make Life Choices",
+    "Explained By: Generosity",
+    "Explained By: Perceptions Of Corruption",
+]
+
+PANEL_COLUMNS = INDICATORS + EXPLAINED
+
+PANEL_DIR = os.environ.get("WHR_PANEL_DIR")
+
+# Matched after lower-casing and dropping punctuation, so "Happiness.Score"
+# (2017) and "Happiness Score" (2015) are one alias.
+HEADER_ALIASES = {
+    "Country": "Country Name",
+    "Country Or Region": "Country Name",
+    "Life Ladder": "Ladder Score",
+    "Happiness Score": "Ladder Score",
+    "Score": "Ladder Score",
+    "Log Gdp Per Capita": "Logged Gdp Per Capita",
+    "Healthy Life Expectancy At Birth": "Healthy Life Expectancy",
+    "Dystopia Residual": "Dystopia + Residual",
+}
+
+# Headers of the releases that published contributions instead of values,
+# recognised by their score column ("Happiness Score" or "Score").
+CONTRIBUTION_ALIASES = {
+    "Economy (Gdp Per Capita)": EXPLAINED[0],
+    "Gdp Per Capita": EXPLAINED[0],
+    "Family": EXPLAINED[1],
+    "Social Support": EXPLAINED[1],
+    "Health (Life Expectancy)": EXPLAINED[2],
+    "Healthy Life Expectancy": EXPLAINED[2],
+    "Freedom": EXPLAINED[3],
+    "Freedom To Make Life Choices": EXPLAINED[3],
+    "Generosity": EXPLAINED[4],
+    "Trust (Government Corruption)": EXPLAINED[5],
+    "Perceptions Of Corruption": EXPLAINED[5],
+}
+
+_YEAR_IN_NAME = re.compile(r"(?<!\d)((?:19|20)\d{2})(?!\d)")
+
+
+def _key(name):
+    return " ".join(re.findall(r"[a-z0-9]+", name.lower()))
+
+
+_ALIASES = {_key(name): column for name, column in HEADER_ALIASES.items()}
+_CONTRIBUTIONS = {_key(name): column for name, column in CONTRIBUTION_ALIASES.items()}
+
+
+def normalize_columns(columns):
+    titled = pd.Index(columns).str.strip().str.title()
+    keys = [_key(name) for name in titled]
+    contributions = {"happiness score", "score"} & set(keys)
+    aliases = _ALIASES | _CONTRIBUTIONS if contributions else _ALIASES
+    return [aliases.get(key, name) for key, name in zip(keys, titled)]
+
+
+def year_from_filename(path):
+    match = _YEAR_IN_NAME.search(os.path.basename(path))
+    return int(match.group(1)) if match else None
+
+
+class PanelStore:
+    """Country-year indicator panel with O(log n) country and year slices."""
+
+    def __init__(self, countries, codes, years, values, columns=PANEL_COLUMNS):
+        self.countries = pd.Index(countries, name="Country Name")
+        self.columns = list(columns)
+
+        order = np.lexsort((years, codes))
+        self.codes = codes[order]
+        self.years = years[order]
+        self.values = values[order]
+
+        self._by_year = np.lexsort((self.codes, self.years))
+        self._years_sorted = self.years[self._by_year]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def country(self, name):
+        """Time series for one country, indexed by year."""
+        code = self.countries.get_loc(name)
+        lo, hi = np.searchsorted(self.codes, [code, code + 1])
+        return pd.DataFrame(self.values[lo:hi], index=pd.Index(self.years[lo:hi], name="Year"), columns=self.columns)
+
+    def year(self, year):
+        """Cross-section of every country for one year, like ``df_whr``."""
+        lo, hi = np.searchsorted(self._years_sorted, [year, year + 1])
+        rows = self._by_year[lo:hi]
+        index = pd.Index(self.countries[self.codes[rows]], name="Country Name")
+        return pd.DataFrame(self.values[rows], index=index, columns=self.columns)
+
+    def available_years(self):
+        return np.unique(self._years_sorted)
+
+    def to_frame(self):
+        index = pd.MultiIndex.from_arrays(
+            [pd.Categorical.from_codes(self.codes, categories=self.countries), self.years],
+            names=["Country Name", "Year"],
+        )
+        return pd.DataFrame(self.values, index=index, columns=self.columns)
+
+
+def _read_chunks(path, chunksize):
+    default_year = year_from_filename(path)
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        chunk.columns = normalize_columns(chunk.columns)
+        if "Year" not in chunk.columns:
+            if default_year is None:
+                raise ValueError(f"{path}: no Year column and no year in the file name")
+            chunk["Year"] = default_year
+        chunk = chunk.dropna(subset=["Country Name", "Year"])
+        yield chunk
+
+
+def ingest_directory(directory, pattern="*.csv", chunksize=50_000):
+    """Stream every yearly file under ``directory`` into a :class:`PanelStore`.
+
+    Missing indicators become NaN; when a (country, year) appears twice the
+    row read last wins.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, pattern)))
+    if not paths:
+        raise FileNotFoundError(f"no files matching {pattern!r} in {directory}")
+
+    country_codes = {}
+    codes, years, values = [], [], []
+    for path in paths:
+        for chunk in _read_chunks(path, chunksize):
+            names = chunk["Country Name"].astype(str).str.strip()
+            codes.append(np.fromiter(
+                (country_codes.setdefault(name, len(country_codes)) for name in names),
+                dtype=np.int32, count=len(names),
+            ))
+            years.append(chunk["Year"].to_numpy(dtype=np.int16))
+            block = chunk.reindex(columns=PANEL_COLUMNS).apply(pd.to_numeric, errors="coerce")
+            values.append(block.to_numpy(dtype=np.float32))
+
+    codes = np.concatenate(codes)
+    years = np.concatenate(years)
+    values = np.concatenate(values)
+
+    # Keep the last occurrence of each (country, year).
+    key = codes.astype(np.int64) * 10_000 + years
+    _, last_from_end = np.unique(key[::-1], return_index=True)
+    keep = np.sort(len(key) - 1 - last_from_end)
+    return PanelStore(list(country_codes), codes[keep], years[keep], values[keep])
+
+
+def directory_fingerprint(directory, pattern="*.csv"):
+    paths = sorted(glob.glob(os.path.join(directory, pattern)))
+    token = "|".join(fingerprint(path) for path in paths)
+    return hashlib.sha1(token.encode()).hexdigest()[:16]
+
+
+_cache = VersionedCache(maxsize=2)
+
+
+def load_panel(directory, pattern="*.csv"):
+    version = directory_fingerprint(directory, pattern)
+    return _cache.get_or_compute(version, lambda: ingest_directory(directory, pattern))
@@ -0,0 +1,124 @@
+"""Shrink Plotly figures before they are sent to the browser.
+
+Every chart spec travels over the WebSocket to each viewer and is parsed by
+their browser, so builders hand Plotly only the columns a chart uses
+(:func:`project`) and :func:`minimize` then rewrites each trace's numeric
+arrays: values are rounded to ``WHR_CHART_DECIMALS`` (the precision the
+report shows, default 3) and stored in the narrowest typed array Plotly's
+binary encoding accepts that still holds them: whole numbers in a small
+integer type, other values as float64. (float32 would be smaller, but a
+rounded value such as 7.804 reads back as 7.803999901 in hover labels and
+text without an explicit format.) The theme template keeps only its
+defaults for the trace types the figure contains.
+
+With ``WHR_PROFILE`` on, bytes before and after are recorded per chart and
+:func:`report` lists them; otherwise no figure is serialized here.
+``WHR_MINIMIZE_PAYLOAD=0`` leaves figures untouched, for comparison.
+"""
+
+import os
+import threading
+
+import numpy as np
+
+from whr.lazy import lazy_import
+
+pio = lazy_import("plotly.io")
+
+ENABLED = os.environ.get("WHR_MINIMIZE_PAYLOAD", "1").lower() not in {"0", "false", "no", "off"}
+DECIMALS = int(os.environ.get("WHR_CHART_DECIMALS", "3"))
+# Measuring a chart serializes it twice, so only when profiling asks for it.
+RECORD_SIZES = os.environ.get("WHR_PROFILE", "").lower() in {"1", "true", "yes", "on"}
+
+# Plotly Express arguments that name a column of ``data_frame``.
+COLUMN_ARGS = ("x", "y", "color", "values", "names", "size", "symbol", "text", "hover_name", "hover_data")
+
+# Integer typed arrays Plotly decodes, narrowest first (there is no int64).
+INT_TYPES = [np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32]
+
+_sizes = {}
+_sizes_lock = threading.Lock()
+
+
+def project(frame, params, *columns):
+    """``frame`` cut down to the columns ``params`` (and ``columns``) refer to."""
+    names = list(columns)
+    for arg in COLUMN_ARGS:
+        value = params.get(arg)
+        names.extend(value if isinstance(value, (list, tuple)) else [value])
+    keep = [name for name in dict.fromkeys(names) if isinstance(name, str) and name in frame.columns]
+    return frame[keep]
+
+
+def compact(values, decimals=DECIMALS):
+    """``values`` rounded to ``decimals``, as integers if they are whole.
+
+    Returns None for arrays that are not numeric.
+    """
+    array = np.asarray(values)
+    if array.dtype.kind == "b" or array.dtype.kind not in "iuf" or array.size == 0:
+        return None
+    if array.dtype.kind == "f":
+        array = np.round(array, decimals)
+        if not np.isfinite(array).all() or not np.array_equal(array, np.trunc(array)):
+            return array
+    lo, hi = array.min(), array.max()
+    for dtype in INT_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return array.astype(dtype)
+    return array
+
+
+def _numeric_arrays(props, prefix=""):
+    """Dotted paths and values of the array-valued properties of a trace."""
+    for name, value in props.items():
+        path = f"{prefix}{name}"
+        if isinstance(value, dict):
+            yield from _numeric_arrays(value, f"{path}.")
+        elif isinstance(value, np.ndarray) or (
+            isinstance(value, (list, tuple)) and len(value) > 1
+            and all(isinstance(item, (int, float)) and not isinstance(item, bool) for item in value)
+        ):
+            yield path, value
+
+
+def prune_template(fig):
+    """Drop template defaults for trace types ``fig`` does not contain."""
+    data = fig.layout.template.data
+    used = {trace.type for trace in fig.data}
+    fig.layout.template.data = {kind: data[kind] for kind in used if data[kind]}
+
+
+def minimize(fig, name=None, decimals=DECIMALS):
+    """Round and retype ``fig``'s trace arrays in place and return it.
+
+    With ``name`` given and ``RECORD_SIZES`` on, the spec size before and
+    after is recorded under it.
+    """
+    if not ENABLED:
+        return fig
+    record = RECORD_SIZES and name is not None
+    before = len(pio.to_json(fig, validate=False)) if record else None
+    for trace in fig.data:
+        for path, value in list(_numeric_arrays(trace.to_plotly_json())):
+            packed = compact(value, decimals)
+            if packed is not None:
+                trace[path] = packed
+    prune_template(fig)
+    if record:
+        after = len(pio.to_json(fig, validate=False))
+        with _sizes_lock:
+            _sizes[name] = (before, after)
+    return fig
+
+
+def report():
+    """One row per minimized chart: spec bytes before and after, and the saving."""
+    with _sizes_lock:
+        sizes = dict(_sizes)
+    return [
+        {"chart": name, "bytes_before": before, "bytes_after": after,
+         "saved": f"{1 - after / before:.0%}" if before else "-"}
+        for name, (before, after) in sizes.items()
+    ]
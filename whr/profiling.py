@@ -0,0 +1,182 @@
+"""Opt-in hot-path instrumentation for the dashboard.
+
+Set ``WHR_PROFILE=1`` to time each logical section and every
+``st.plotly_chart`` / ``st.dataframe`` call, with the bytes sent to the
+browser and the peak Python memory allocated above the block's starting
+point. tracemalloc counts the whole process, so that peak includes other
+sessions' allocations, and only one session at a time measures it (the
+others record None). The run's records are shown in a
+collapsible diagnostics panel, next to the chart spec sizes before and
+after :mod:`whr.payload` shrank them, and appended as JSON lines to
+``WHR_PROFILE_LOG`` for aggregation across sessions. With the flag off,
+:func:`start_run` returns a profiler whose methods call Streamlit directly.
+"""
+
+import inspect
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+import streamlit as st
+
+from whr import payload
+
+ENABLED = os.environ.get("WHR_PROFILE", "").lower() in {"1", "true", "yes", "on"}
+LOG_PATH = os.environ.get("WHR_PROFILE_LOG", "whr_profile.jsonl")
+
+# Streamlit releases whose private ScriptRunContext.enqueue(self, msg) the
+# byte counter wraps; on others bytes_sent is recorded as None.
+BYTE_COUNTER_VERSIONS = ((1, 38), (2, 0))
+
+_sent = threading.local()
+_log_lock = threading.Lock()
+# Held by the session whose blocks reset tracemalloc's process-wide peak.
+_memory_lock = threading.Lock()
+
+
+def _streamlit_version():
+    try:
+        return tuple(int(part) for part in st.__version__.split(".")[:2])
+    except ValueError:
+        return None
+
+
+def _install_byte_counter():
+    """Count the serialized size of every element this thread sends.
+
+    Returns False, leaving Streamlit untouched, when the private hook is not
+    the one this was written against.
+    """
+    low, high = BYTE_COUNTER_VERSIONS
+    version = _streamlit_version()
+    if version is None or not low <= version < high:
+        return False
+    try:
+        from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+
+        enqueue = ScriptRunContext.enqueue
+        if list(inspect.signature(enqueue).parameters) != ["self", "msg"]:
+            return False
+    except (ImportError, AttributeError, TypeError, ValueError):
+        return False
+
+    def counting_enqueue(self, msg):
+        _sent.bytes = getattr(_sent, "bytes", 0) + msg.ByteSize()
+        return enqueue(self, msg)
+
+    ScriptRunContext.enqueue = counting_enqueue
+    return True
+
+
+COUNTING_BYTES = False
+if ENABLED:
+    tracemalloc.start()
+    COUNTING_BYTES = _install_byte_counter()
+
+
+class NullProfiler:
+    def section(self, name):
+        return nullcontext()
+
+    def plotly_chart(self, fig, target=st, **kwargs):
+        return target.plotly_chart(fig, **kwargs)
+
+    def dataframe(self, data, **kwargs):
+        return st.dataframe(data, **kwargs)
+
+    def finish(self):
+        pass
+
+
+class Profiler:
+    """Collects one record per timed block for the current script run."""
+
+    def __init__(self, session):
+        self.session = session
+        self.started = time.time()
+        self.records = []
+        self._stack = []
+        self._measuring = False
+
+    @contextmanager
+    def section(self, name, kind="section"):
+        # tracemalloc has a single process-wide peak counter. A top-level
+        # block takes _memory_lock if it is free, and only then do it and its
+        # nested blocks reset the peak on entry and hand their own peak up to
+        # the enclosing block on exit.
+        if not self._stack:
+            self._measuring = _memory_lock.acquire(blocking=False)
+        measuring = self._measuring
+        if self._stack and measuring:
+            parent = self._stack[-1]
+            parent["peak"] = max(parent["peak"], tracemalloc.get_traced_memory()[1])
+        block = {"name": name, "peak": 0}
+        self._stack.append(block)
+        path = "/".join(frame["name"] for frame in self._stack)
+        bytes_before = getattr(_sent, "bytes", 0)
+        if measuring:
+            memory_before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            peak = None
+            if measuring:
+                peak = max(block["peak"], tracemalloc.get_traced_memory()[1])
+            self._stack.pop()
+            if self._stack and measuring:
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+            if not self._stack and measuring:
+                self._measuring = False
+                _memory_lock.release()
+            self.records.append({
+                "kind": kind,
+                "name": path,
+                "seconds": round(seconds, 6),
+                "bytes_sent": getattr(_sent, "bytes", 0) - bytes_before if COUNTING_BYTES else None,
+                "process_peak_memory": max(0, peak - memory_before) if measuring else None,
+            })
+
+    def plotly_chart(self, fig, target=st, **kwargs):
+        """``target.plotly_chart(fig)``; ``target`` may be a placeholder."""
+        title = fig.layout.title.text if fig.layout.title and fig.layout.title.text else "chart"
+        with self.section(title, kind="plotly_chart"):
+            return target.plotly_chart(fig, **kwargs)
+
+    def dataframe(self, data, **kwargs):
+        with self.section(f"dataframe {getattr(data, 'shape', '')}", kind="dataframe"):
+            return st.dataframe(data, **kwargs)
+
+    def finish(self):
+        """Show this run's records and append them to the JSON-lines log."""
+        if not self.records:
+            return
+        with st.expander("Diagnostics", expanded=False):
+            st.dataframe(self.records)
+            sizes = payload.report()
+            if sizes:
+                st.caption("Chart specs built by this process, in bytes before and after minimizing")
+                st.dataframe(sizes)
+        line = {"session": self.session, "started": self.started, "records": self.records}
+        try:
+            with _log_lock, open(LOG_PATH, "a") as fh:
+                fh.write(json.dumps(line) + "\n")
+        except OSError:
+            pass
+
+
+_NULL = NullProfiler()
+
+
+def start_run():
+    if not ENABLED:
+        return _NULL
+    from streamlit.runtime.scriptrunner_utils.script_run_context import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return Profiler(ctx.session_id if ctx else None)
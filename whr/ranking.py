@@ -0,0 +1,52 @@
+"""Per-metric orderings computed once per dataset version."""
+
+import numpy as np
+import pandas as pd
+
+from whr.cache import VersionedCache
+
+
+class RankingIndex:
+    """Descending and ascending orderings plus ranks for every numeric column.
+
+    Built with one ``argsort`` over the whole indicator matrix; afterwards a
+    top/bottom-k query is a slice of the precomputed order, O(k).
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.metrics = list(df.columns)
+        self._column = {metric: j for j, metric in enumerate(self.metrics)}
+        values = df.to_numpy(dtype=float)
+        missing = np.isnan(values)
+        self._descending = np.argsort(np.where(missing, np.inf, -values), axis=0, kind="stable")
+        self._ascending = np.argsort(np.where(missing, np.inf, values), axis=0, kind="stable")
+        self._valid = (~missing).sum(axis=0)
+
+        ranks = np.empty(values.shape, dtype=float)
+        positions = np.arange(1, len(df) + 1, dtype=float)
+        np.put_along_axis(ranks, self._descending, positions[:, None], axis=0)
+        ranks[missing] = np.nan
+        self.ranks = pd.DataFrame(ranks, index=df.index, columns=self.metrics)
+
+    def _positions(self, metric, k, largest):
+        j = self._column[metric]
+        order = self._descending if largest else self._ascending
+        return order[: min(k, self._valid[j]), j]
+
+    def top(self, metric, k=10):
+        return self.df.iloc[self._positions(metric, k, largest=True)]
+
+    def bottom(self, metric, k=10):
+        return self.df.iloc[self._positions(metric, k, largest=False)]
+
+    def rank_of(self, country):
+        """1-based rank of ``country`` on every metric (1 = highest value)."""
+        return self.ranks.loc[country]
+
+
+_cache = VersionedCache(maxsize=8)
+
+
+def ranking_index(dataset):
+    return _cache.get_or_compute(dataset.version, lambda: RankingIndex(dataset.df))
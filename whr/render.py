@@ -0,0 +1,58 @@
+"""Build a section's charts concurrently and stream each one as it is ready.
+
+:meth:`ChartScheduler.chart` reserves an ``st.empty`` placeholder at the
+chart's position on the page and submits the figure build to a shared thread
+pool right away, so builds overlap with the text the script writes in
+between and with each other. Only the script thread talks to Streamlit:
+finished figures are written into their placeholders whenever the script
+registers another chart and, at the end, by :meth:`ChartScheduler.finish`
+in completion order. Builds are submitted in page order, so with fewer
+workers than charts the ones above the fold start first.
+
+Figures already in the cache (every warm rerun) are written inline. Chart
+building is mostly Python, so the pool helps on multi-core hosts where
+numpy, JSON encoding and Streamlit's own serialisation overlap; the default
+is one worker per core up to four, and ``WHR_RENDER_WORKERS=1`` builds
+every chart inline, in order.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import streamlit as st
+
+from whr import figures
+
+WORKERS = int(os.environ.get("WHR_RENDER_WORKERS", min(4, os.cpu_count() or 1)))
+
+_executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="whr-render") if WORKERS > 1 else None
+
+
+class ChartScheduler:
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.pending = {}
+
+    def chart(self, *args, **kwargs):
+        """Reserve a slot for ``figures.chart(*args, **kwargs)`` and start building it."""
+        placeholder = st.empty()
+        fig = figures.cached_chart(*args, **kwargs)
+        if _executor is None or fig is not None:
+            # Nothing to overlap: a cached figure (every warm rerun) or no pool.
+            if fig is None:
+                fig = figures.chart(*args, **kwargs)
+            self.profiler.plotly_chart(fig, target=placeholder)
+            return
+        self.pending[_executor.submit(figures.chart, *args, **kwargs)] = placeholder
+        self._fill([future for future in self.pending if future.done()])
+
+    def finish(self):
+        """Write the remaining charts to the page as their builds complete."""
+        while self.pending:
+            done, _ = wait(self.pending, return_when=FIRST_COMPLETED)
+            self._fill(done)
+
+    def _fill(self, done):
+        for future in done:
+            placeholder = self.pending.pop(future)
+            self.profiler.plotly_chart(future.result(), target=placeholder)
@@ -0,0 +1,217 @@
+"""Read-only JSON API over the cleaned rankings, leaders and statistics.
+
+Serves the same numbers as the dashboard to other programs::
+
+    python -m whr.service --port 8502
+
+``GET`` endpoints:
+
+* ``/metrics`` – the metric names the other endpoints accept
+* ``/top?metric=Ladder Score&k=10`` and ``/bottom?...`` – the ``k`` countries
+  with the highest (lowest) values, with their rank
+* ``/countries/<name>`` – one country's values and ranks (name matched
+  case-insensitively)
+* ``/describe`` – the descriptive statistics table
+
+The dataset is loaded the way the dashboard loads it and served from the
+per-version :class:`~whr.ranking.RankingIndex`; it is re-read only when the
+source file changes. Every successful response carries the dataset version
+as its ``ETag``, so a client repeating a request with ``If-None-Match`` gets
+``304 Not Modified`` until the data changes; errors are never answered with
+304. Response bodies are encoded once per version and URL, so resolving the
+route before revalidating costs a cache lookup.
+"""
+
+import json
+import math
+import os
+import traceback
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from whr import data, microdata, ranking, sketch
+from whr.cache import VersionedCache
+
+HOST = os.environ.get("WHR_SERVICE_HOST", "127.0.0.1")
+PORT = int(os.environ.get("WHR_SERVICE_PORT", "8502"))
+DEFAULT_K = 10
+
+_bodies = VersionedCache(max_bytes=32 * 2**20, sizeof=len)
+
+
+class RequestError(Exception):
+    """A request the service answers with ``status`` and a JSON error body."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def load_dataset(path=data.DATA_PATH):
+    """The dataset the dashboard would show for ``path``."""
+    if microdata.MICRODATA_PATH:
+        return microdata.load_survey(microdata.MICRODATA_PATH, path)
+    return data.load_whr(path)
+
+
+def _value(value):
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+def _row(series):
+    return {name: _value(float(value)) for name, value in series.items()}
+
+
+def metrics(dataset, query):
+    return {"metrics": ranking.ranking_index(dataset).metrics}
+
+
+def _metric(index, query):
+    name = query.get("metric", ["Ladder Score"])[-1].title()
+    if name not in index.metrics:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"unknown metric {name!r}; see /metrics")
+    return name
+
+
+def _k(query):
+    try:
+        k = int(query.get("k", [DEFAULT_K])[-1])
+    except ValueError:
+        raise RequestError(HTTPStatus.BAD_REQUEST, "k must be an integer") from None
+    if k < 0:
+        raise RequestError(HTTPStatus.BAD_REQUEST, "k must not be negative")
+    return k
+
+
+def leaders(dataset, query, largest=True):
+    index = ranking.ranking_index(dataset)
+    metric = _metric(index, query)
+    rows = (index.top if largest else index.bottom)(metric, _k(query))
+    return {
+        "metric": metric,
+        "countries": [
+            {"country": country, "rank": int(index.ranks.at[country, metric]), "value": float(value)}
+            for country, value in rows[metric].items()
+        ],
+    }
+
+
+def country(dataset, name):
+    index = ranking.ranking_index(dataset)
+    if name not in index.df.index:
+        matches = [country for country in index.df.index if country.lower() == name.lower()]
+        if not matches:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"unknown country {name!r}")
+        name = matches[0]
+    return {"country": name, "values": _row(index.df.loc[name]), "ranks": _row(index.rank_of(name))}
+
+
+def describe(dataset, query):
+    stats = sketch.summary(dataset)
+    return {"statistics": {column: _row(stats[column]) for column in stats.columns}}
+
+
+ROUTES = {
+    "/metrics": metrics,
+    "/top": leaders,
+    "/bottom": lambda dataset, query: leaders(dataset, query, largest=False),
+    "/describe": describe,
+}
+
+
+def _answer(dataset, target):
+    url = urlsplit(target)
+    path = url.path.rstrip("/") or "/"
+    if path.startswith("/countries/"):
+        payload = country(dataset, unquote(path[len("/countries/"):]))
+    elif path in ROUTES:
+        payload = ROUTES[path](dataset, parse_qs(url.query))
+    else:
+        raise RequestError(HTTPStatus.NOT_FOUND, f"no endpoint {path!r}")
+    payload["version"] = dataset.version
+    return json.dumps(payload, allow_nan=False).encode()
+
+
+def response(dataset, target):
+    """Status and encoded JSON body for a ``GET`` of ``target`` (path and query)."""
+    try:
+        return HTTPStatus.OK, _bodies.get_or_compute((dataset.version, target), lambda: _answer(dataset, target))
+    except RequestError as exc:
+        return exc.status, json.dumps({"error": str(exc)}).encode()
+
+
+def _matches(header, etag):
+    return header is not None and any(tag.strip() in (etag, f"W/{etag}", "*") for tag in header.split(","))
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "whr-service"
+    # Headers and body go out in one buffered write (flushed after each
+    # request) without Nagle's delay on keep-alive connections.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        try:
+            dataset = load_dataset(self.server.data_path)
+            etag = f'"{dataset.version}"'
+            status, body = response(dataset, self.path)
+        except Exception:
+            self.log_error("unhandled error for %s\n%s", self.path, traceback.format_exc())
+            status, body = HTTPStatus.INTERNAL_SERVER_ERROR, json.dumps({"error": "internal server error"}).encode()
+        if status == HTTPStatus.OK and _matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status == HTTPStatus.OK:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def log_error(self, format, *args):
+        # Errors go to stderr even when request logging is off.
+        super().log_message(format, *args)
+
+
+def make_server(host=HOST, port=PORT, data_path=data.DATA_PATH, verbose=False):
+    """A :class:`ThreadingHTTPServer` for the service, with the dataset loaded."""
+    load_dataset(data_path)
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.data_path = data_path
+    server.verbose = verbose
+    return server
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve WHR rankings and statistics as JSON.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--data", default=data.DATA_PATH)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+    server = make_server(args.host, args.port, args.data, args.verbose)
+    print(f"Serving {args.data} on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Countries with the most similar indicator profiles.
+
+Indicators are standardised to zero mean and unit variance so that no single
+unit (years of life expectancy, say) dominates the distance, and a spatial
+index over the standardised vectors is built once per dataset version.
+``scipy.spatial.cKDTree`` is used when scipy is installed; otherwise a small
+KD-tree in numpy, with a vectorized brute-force search as the reference.
+"""
+
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from whr.cache import VersionedCache
+
+INDICATORS = [
+    "Logged Gdp Per Capita",
+    "Social Support",
+    "Healthy Life Expectancy",
+    "Freedom To Make Life Choices",
+    "Generosity",
+    "Perceptions Of Corruption",
+]
+
+BRUTE_LIMIT = 20_000
+
+
+class BruteForce:
+    """Exact k-nearest neighbours by computing every distance."""
+
+    def __init__(self, points):
+        self.points = np.asarray(points, dtype=float)
+
+    def query(self, x, k):
+        d2 = ((self.points - x) ** 2).sum(axis=1)
+        k = min(k, len(d2))
+        nearest = np.argpartition(d2, k - 1)[:k]
+        nearest = nearest[np.argsort(d2[nearest], kind="stable")]
+        return np.sqrt(d2[nearest]), nearest
+
+
+class KDTree:
+    """KD-tree splitting the widest dimension at its median.
+
+    Points are stored in tree order, so a leaf is a contiguous slice whose
+    distances are one array expression. Queries visit nodes best-first by the
+    distance to their bounding box and stop once no box can beat the current
+    k-th neighbour.
+    """
+
+    def __init__(self, points, leafsize=64):
+        points = np.asarray(points, dtype=float)
+        self.leafsize = leafsize
+        self.order = np.arange(len(points))
+        lo, hi, self.children, self.slices = [], [], [], []
+        self._build(points, 0, len(points), lo, hi)
+        self.lo, self.hi = np.array(lo), np.array(hi)
+        self.points = points[self.order]
+
+    def _build(self, points, start, end, lo, hi):
+        node = len(self.slices)
+        idx = self.order[start:end]
+        pts = points[idx]
+        lo.append(pts.min(axis=0))
+        hi.append(pts.max(axis=0))
+        self.slices.append((start, end))
+        self.children.append(None)
+        if end - start > self.leafsize:
+            dim = int(np.argmax(hi[node] - lo[node]))
+            mid = (start + end) // 2
+            self.order[start:end] = idx[np.argpartition(pts[:, dim], mid - start)]
+            left = self._build(points, start, mid, lo, hi)
+            right = self._build(points, mid, end, lo, hi)
+            self.children[node] = [left, right]
+        return node
+
+    def query(self, x, k):
+        x = np.asarray(x, dtype=float)
+        k = min(k, len(self.points))
+        best_d2 = np.empty(0)
+        best = np.empty(0, dtype=np.int64)
+        worst = np.inf
+        frontier = [(0.0, 0)]
+        while frontier:
+            bound, node = heapq.heappop(frontier)
+            if bound >= worst:
+                break
+            children = self.children[node]
+            if children is None:
+                start, end = self.slices[node]
+                d2 = np.concatenate([best_d2, ((self.points[start:end] - x) ** 2).sum(axis=1)])
+                positions = np.concatenate([best, np.arange(start, end)])
+                keep = np.argpartition(d2, k - 1)[:k] if len(d2) > k else slice(None)
+                best_d2, best = d2[keep], positions[keep]
+                if len(best) == k:
+                    worst = best_d2.max()
+            else:
+                gap = np.maximum(self.lo[children] - x, 0.0) + np.maximum(x - self.hi[children], 0.0)
+                for child, distance in zip(children, (gap * gap).sum(axis=1).tolist()):
+                    heapq.heappush(frontier, (distance, child))
+        ranked = np.argsort(best_d2, kind="stable")
+        return np.sqrt(best_d2[ranked]), self.order[best[ranked]]
+
+
+class _SciPyTree:
+    def __init__(self, points):
+        from scipy.spatial import cKDTree
+
+        self.tree = cKDTree(points)
+
+    def query(self, x, k):
+        distances, nearest = self.tree.query(x, k=min(k, self.tree.n))
+        return np.atleast_1d(distances), np.atleast_1d(nearest)
+
+
+def build_index(points, method="auto"):
+    """``method`` is ``"scipy"``, ``"kdtree"``, ``"brute"`` or ``"auto"``.
+
+    ``"auto"`` prefers scipy, then brute force up to ``BRUTE_LIMIT`` rows
+    (where it beats a tree walked in Python), then the numpy KD-tree.
+    """
+    if method == "auto":
+        try:
+            return _SciPyTree(points)
+        except ImportError:
+            method = "brute" if len(points) <= BRUTE_LIMIT else "kdtree"
+    return {"scipy": _SciPyTree, "kdtree": KDTree, "brute": BruteForce}[method](points)
+
+
+class SimilarityIndex:
+    """k-nearest countries by standardised indicator profile.
+
+    Countries missing any indicator are left out of the index.
+    """
+
+    def __init__(self, df, columns=INDICATORS, method="auto"):
+        values = df[columns].dropna()
+        self.values = values
+        self.mean = values.mean().to_numpy()
+        self.scale = values.std().to_numpy()
+        self.points = (values.to_numpy(dtype=float) - self.mean) / self.scale
+        self.position = pd.Series(np.arange(len(values)), index=values.index)
+        self.index = build_index(self.points, method)
+
+    def __contains__(self, country):
+        return country in self.position.index
+
+    def neighbours(self, country, k=5):
+        """The ``k`` most similar countries to ``country``, nearest first."""
+        distances, nearest = self.index.query(self.points[self.position[country]], k + 1)
+        keep = nearest != self.position[country]
+        table = self.values.iloc[nearest[keep][:k]].copy()
+        table.insert(0, "Distance", distances[keep][:k])
+        return table
+
+
+_cache = VersionedCache(maxsize=8)
+
+
+def similarity_index(dataset):
+    return _cache.get_or_compute(dataset.version, lambda: SimilarityIndex(dataset.df))
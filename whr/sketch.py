@@ -0,0 +1,207 @@
+"""Single-pass descriptive statistics with mergeable partial results.
+
+:class:`Moments` keeps count, mean, sum of squared deviations, min and max
+per column and merges batches with Chan's parallel form of Welford's update.
+:class:`QuantileSketch` is a KLL sketch: sorted compactors whose capacity
+shrinks geometrically with depth, each compaction keeping every other item
+at twice the weight. Its rank error is about ``error`` with high probability
+and it uses ``O(1 / error)`` memory however many values it has seen.
+
+Both merge by concatenation, so chunks can be summarised independently (in
+worker processes, say) and combined. :class:`StreamingDescribe` bundles them
+into the layout of :meth:`pandas.DataFrame.describe`.
+"""
+
+import math
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from whr.cache import VersionedCache
+
+EXACT_LIMIT = int(os.environ.get("WHR_DESCRIBE_EXACT_LIMIT", 100_000))
+ERROR = 0.01
+PERCENTILES = (0.25, 0.5, 0.75)
+
+
+class Moments:
+    """Per-column count, mean, M2, min and max of everything seen so far."""
+
+    def __init__(self, width):
+        self.count = np.zeros(width)
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)
+        self.min = np.full(width, np.inf)
+        self.max = np.full(width, -np.inf)
+
+    def update(self, X):
+        batch = Moments(X.shape[1])
+        batch.count = (~np.isnan(X)).sum(axis=0).astype(float)
+        if not batch.count.any():
+            return
+        with warnings.catch_warnings():
+            # All-NaN columns in this batch; their count of zero masks them out.
+            warnings.simplefilter("ignore", RuntimeWarning)
+            batch.mean = np.where(batch.count > 0, np.nanmean(X, axis=0), 0.0)
+            batch.m2 = np.nansum((X - batch.mean) ** 2, axis=0)
+            batch.min = np.where(batch.count > 0, np.nanmin(X, axis=0), np.inf)
+            batch.max = np.where(batch.count > 0, np.nanmax(X, axis=0), -np.inf)
+        self.merge(batch)
+
+    def merge(self, other):
+        count = self.count + other.count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = other.mean - self.mean
+            share = np.where(count > 0, other.count / count, 0.0)
+            self.mean = self.mean + delta * share
+            self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * share
+        self.count = count
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+
+    def std(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan)
+
+
+class QuantileSketch:
+    """KLL quantile sketch over one stream of floats (NaNs are skipped)."""
+
+    DECAY = 2 / 3
+
+    def __init__(self, error=ERROR, seed=None):
+        self.k = max(8, math.ceil(2.0 / error))
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, math.ceil(self.k * self.DECAY ** depth))
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind; the rest are halved.
+                keep, items = items[len(items) - len(items) % 2:], items[:len(items) - len(items) % 2]
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def quantile(self, qs):
+        if not self.n:
+            return np.full(len(qs), np.nan)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, np.asarray(qs) * cumulative[-1], side="left")
+        return items[order][np.minimum(positions, len(items) - 1)]
+
+
+class StreamingDescribe:
+    """Mergeable accumulator that reports in :meth:`DataFrame.describe` layout."""
+
+    def __init__(self, columns, error=ERROR, seed=None):
+        self.columns = list(columns)
+        self.moments = Moments(len(self.columns))
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        seeds = seed.spawn(len(self.columns))
+        self.sketches = [QuantileSketch(error, seed) for seed in seeds]
+
+    def update(self, frame):
+        X = frame[self.columns].to_numpy(dtype=float)
+        self.moments.update(X)
+        for j, sketch in enumerate(self.sketches):
+            sketch.update(X[:, j])
+        return self
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        for sketch, theirs in zip(self.sketches, other.sketches):
+            sketch.merge(theirs)
+        return self
+
+    def result(self):
+        m = self.moments
+        seen = m.count > 0
+        quantiles = np.array([sketch.quantile(PERCENTILES) for sketch in self.sketches]).T
+        rows = [m.count, np.where(seen, m.mean, np.nan), m.std(), np.where(seen, m.min, np.nan),
+                *quantiles, np.where(seen, m.max, np.nan)]
+        index = ["count", "mean", "std", "min", *(f"{q:.0%}" for q in PERCENTILES), "max"]
+        return pd.DataFrame(rows, index=index, columns=self.columns)
+
+
+def describe(df, exact=None, error=ERROR, chunksize=100_000):
+    """``df.describe()`` for numeric columns, approximated above ``EXACT_LIMIT`` rows."""
+    if exact is None:
+        exact = len(df) <= EXACT_LIMIT
+    if exact:
+        return df.describe()
+    acc = StreamingDescribe(df.select_dtypes("number").columns, error)
+    for start in range(0, len(df), chunksize):
+        acc.update(df.iloc[start:start + chunksize])
+    return acc.result()
+
+
+def _describe_chunk(chunk, columns, error, seed):
+    return StreamingDescribe(columns, error, seed).update(chunk)
+
+
+def describe_file(path, columns, error=ERROR, chunksize=500_000, workers=1):
+    """Summarise ``columns`` of a file too large to load, one chunk at a time.
+
+    Chunks are read with :func:`whr.microdata.iter_chunks`; with ``workers``
+    > 1 each is summarised in a process pool and the partials are merged.
+    """
+    from whr.microdata import iter_chunks
+
+    root = np.random.SeedSequence()
+    total = StreamingDescribe(columns, error)
+    if workers <= 1:
+        for chunk in iter_chunks(path, chunksize):
+            total.update(chunk)
+        return total.result()
+
+    pending = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in iter_chunks(path, chunksize):
+            pending.append(pool.submit(_describe_chunk, chunk[columns], columns, error, root.spawn(1)[0]))
+            if len(pending) >= 2 * workers:
+                total.merge(pending.pop(0).result())
+        for future in pending:
+            total.merge(future.result())
+    return total.result()
+
+
+_cache = VersionedCache(maxsize=8)
+
+
+def summary(dataset, exact=None):
+    """Cached :func:`describe` of the cleaned table."""
+    return _cache.get_or_compute((dataset.version, exact), lambda: describe(dataset.df, exact))
@@ -0,0 +1,176 @@
+"""Batched ordinary least squares for the "Ladder Score vs X" trendlines.
+
+Every simple regression ``y ~ a + b * x_j`` is fitted in one batched
+``numpy.linalg.solve`` over the stacked 2x2 normal equations, which keeps
+statsmodels (Plotly's ``trendline="ols"`` backend) out of the dashboard. It
+stays in ``requirements.txt`` for the analysis notebook.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from whr.cache import VersionedCache
+
+TARGET = "Ladder Score"
+# Trendline colour when the figure has no marker colour to follow.
+LINE_COLOR = "#EF553B"
+
+FEATURES = [
+    "Social Support",
+    "Healthy Life Expectancy",
+    "Freedom To Make Life Choices",
+    "Generosity",
+    "Perceptions Of Corruption",
+]
+
+
+def _betacf(a, b, x, iterations=300, eps=1e-15):
+    """Continued fraction for the regularized incomplete beta (Lentz)."""
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c = np.ones_like(x)
+    d = 1.0 - qab * x / qap
+    d = np.where(np.abs(d) < tiny, tiny, d)
+    d = 1.0 / d
+    h = d.copy()
+    for m in range(1, iterations + 1):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = np.where(np.abs(d) < tiny, tiny, d)
+        c = 1.0 + aa / c
+        c = np.where(np.abs(c) < tiny, tiny, c)
+        d = 1.0 / d
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = np.where(np.abs(d) < tiny, tiny, d)
+        c = 1.0 + aa / c
+        c = np.where(np.abs(c) < tiny, tiny, c)
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if np.all(np.abs(delta - 1.0) < eps):
+            break
+    return h
+
+
+def _betainc(a, b, x):
+    a, b, x = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, x)))
+    lbeta = np.array([math.lgamma(p + q) - math.lgamma(p) - math.lgamma(q) for p, q in zip(a.ravel(), b.ravel())])
+    lbeta = lbeta.reshape(a.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        front = np.exp(lbeta + a * np.log(x) + b * np.log1p(-x))
+        direct = front * _betacf(a, b, x) / a
+        mirrored = 1.0 - front * _betacf(b, a, 1.0 - x) / b
+    result = np.where(x < (a + 1.0) / (a + b + 2.0), direct, mirrored)
+    result = np.where(x <= 0.0, 0.0, result)
+    return np.where(x >= 1.0, 1.0, result)
+
+
+def t_pvalue(t, dof):
+    """Two-sided p-value of Student's t statistic."""
+    t = np.asarray(t, dtype=float)
+    dof = np.asarray(dof, dtype=float)
+    return _betainc(dof / 2.0, 0.5, dof / (dof + t * t))
+
+
+def fit_ols(df, features, target=TARGET):
+    """Fit ``target ~ 1 + feature`` for every feature at once.
+
+    Rows missing either value are dropped per regression. Returns one row per
+    feature with the coefficients, their p-values, R² and the x-range that the
+    fitted line spans. A feature with fewer than two distinct values (constant,
+    or almost all missing, as in a narrow filter) has no line: its
+    coefficients and statistics are NaN.
+    """
+    y = df[target].to_numpy(dtype=float)
+    X = df[features].to_numpy(dtype=float)
+    mask = ~(np.isnan(X) | np.isnan(y)[:, None])
+    Xm = np.where(mask, X, 0.0)
+    Ym = np.where(mask, y[:, None], 0.0)
+
+    n = mask.sum(axis=0).astype(float)
+    sx, sy = Xm.sum(axis=0), Ym.sum(axis=0)
+    sxx, sxy = (Xm * Xm).sum(axis=0), (Xm * Ym).sum(axis=0)
+
+    normal = np.stack([np.stack([n, sx], axis=-1), np.stack([sx, sxx], axis=-1)], axis=-2)
+    rhs = np.stack([sy, sxy], axis=-1)[..., None]
+    # One singular system would fail the whole batch: solve the others and
+    # leave the singular ones NaN. n * Sxx - Sx² is n² times the x variance.
+    det = n * sxx - sx * sx
+    singular = (n < 2) | (det <= 1e-12 * np.maximum(n * sxx, 1e-300))
+    normal[singular] = np.eye(2)
+    intercept, slope = np.linalg.solve(normal, rhs)[..., 0].T
+    intercept[singular] = slope[singular] = np.nan
+
+    residuals = np.where(mask, Ym - intercept - slope * Xm, 0.0)
+    sse = (residuals ** 2).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y_mean = sy / n
+        sst = (np.where(mask, Ym - y_mean, 0.0) ** 2).sum(axis=0)
+        x_mean = sx / n
+        sxx_centered = sxx - n * x_mean ** 2
+
+        # A line through two points has no residual degrees of freedom.
+        dof = np.where(n > 2, n - 2.0, np.nan)
+        sigma2 = sse / dof
+        slope_se = np.sqrt(sigma2 / sxx_centered)
+        intercept_se = np.sqrt(sigma2 * (1.0 / n + x_mean ** 2 / sxx_centered))
+        r_squared = 1.0 - sse / sst
+        slope_t, intercept_t = slope / slope_se, intercept / intercept_se
+
+    return pd.DataFrame(
+        {
+            "slope": slope,
+            "intercept": intercept,
+            "r_squared": r_squared,
+            "slope_stderr": slope_se,
+            "intercept_stderr": intercept_se,
+            "slope_pvalue": t_pvalue(slope_t, dof),
+            "intercept_pvalue": t_pvalue(intercept_t, dof),
+            "n": n.astype(int),
+            "x_min": np.where(mask, X, np.inf).min(axis=0),
+            "x_max": np.where(mask, X, -np.inf).max(axis=0),
+        },
+        index=pd.Index(features, name="Feature"),
+    )
+
+
+def line_points(fit):
+    """End points of the fitted line over the observed x-range."""
+    x = np.array([fit["x_min"], fit["x_max"]])
+    return x, fit["intercept"] + fit["slope"] * x
+
+
+def add_trendline(fig, fit, target=TARGET, color=None):
+    """Draw a precomputed fit onto a Plotly scatter like ``trendline="ols"``.
+
+    A fit without a line (NaN slope) leaves ``fig`` as it is.
+    """
+    if np.isnan(fit["slope"]):
+        return fig
+    x, y = line_points(fit)
+    hover = (
+        "<b>OLS trendline</b><br>"
+        f"{target} = {fit['slope']:.6g} * {fit.name} + {fit['intercept']:.6g}<br>"
+        f"R<sup>2</sup>={fit['r_squared']:.6f}<br><br>"
+        f"{fit.name}=%{{x}}<br>{target}=%{{y}} <b>(trend)</b><extra></extra>"
+    )
+    if color is None:
+        # Markers set the colour; a density heatmap has none, so use the default.
+        marker = getattr(fig.data[0], "marker", None) if fig.data else None
+        color = marker.color if marker is not None and marker.color is not None else LINE_COLOR
+    fig.add_scatter(x=x, y=y, mode="lines", name="OLS trendline", showlegend=False,
+                    line={"color": color}, hovertemplate=hover)
+    return fig
+
+
+_cache = VersionedCache(maxsize=8)
+
+
+def trendlines(dataset, features=FEATURES, target=TARGET):
+    key = (dataset.version, tuple(features), target)
+    return _cache.get_or_compute(key, lambda: fit_ols(dataset.df, list(features), target))
@@ -0,0 +1,112 @@
+"""Monte Carlo distribution of ladder-score ranks.
+
+Each draw perturbs every country's ladder score by its published standard
+error (independent normal errors, as the report's whiskers assume) and ranks
+the result. Draws are generated and ranked in fixed-size chunks, and each
+chunk only adds to a ``countries x ranks`` count matrix, so memory does not
+grow with the number of draws. Chunks are seeded from one
+:class:`numpy.random.SeedSequence` and can run in a process pool.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from whr.cache import VersionedCache
+from whr.data import raw_columns
+
+DRAWS = int(os.environ.get("WHR_SIMULATION_DRAWS", "100000"))
+WORKERS = int(os.environ.get("WHR_SIMULATION_WORKERS", "1"))
+CHUNK = 5000
+SEED = 2023
+
+SCORE = "Ladder Score"
+STDERR = "Standard Error Of Ladder Score"
+
+
+@dataclass(frozen=True)
+class RankDistribution:
+    """``counts[i, r]`` is how many draws put country ``i`` at rank ``r + 1``."""
+
+    countries: pd.Index
+    counts: np.ndarray
+    draws: int
+
+    def probability(self, rank):
+        """Share of draws in which each country is exactly at ``rank``."""
+        return pd.Series(self.counts[:, rank - 1] / self.draws, index=self.countries)
+
+    def probability_within(self, rank):
+        """Share of draws in which each country is at ``rank`` or better."""
+        return pd.Series(self.counts[:, :rank].sum(axis=1) / self.draws, index=self.countries)
+
+    def interval(self, level=0.95):
+        """Equal-tailed rank interval per country, as ``(low, high)`` Series."""
+        cumulative = np.cumsum(self.counts, axis=1)
+        tail = (1 - level) / 2 * self.draws
+        low = (cumulative <= tail).sum(axis=1) + 1
+        high = (cumulative < self.draws - tail).sum(axis=1) + 1
+        return pd.Series(low, index=self.countries), pd.Series(high, index=self.countries)
+
+    def table(self, level=0.95):
+        low, high = self.interval(level)
+        cumulative = np.cumsum(self.counts, axis=1)
+        median = (cumulative < self.draws / 2).sum(axis=1) + 1
+        return pd.DataFrame({
+            "Median Rank": median,
+            f"Rank {level:.0%} Low": low,
+            f"Rank {level:.0%} High": high,
+            "P(#1)": self.probability(1),
+            "P(Top 10)": self.probability_within(10),
+        }, index=self.countries)
+
+
+def _rank_counts(mean, stderr, draws, seed):
+    rng = np.random.default_rng(seed)
+    n = len(mean)
+    scores = mean + stderr * rng.standard_normal((draws, n))
+    # order[d, r] is the country at rank r + 1 in draw d.
+    order = np.argsort(-scores, axis=1)
+    cells = order * n + np.arange(n)
+    return np.bincount(cells.ravel(), minlength=n * n).reshape(n, n)
+
+
+def simulate(mean, stderr, draws=DRAWS, chunk=CHUNK, seed=SEED, workers=WORKERS):
+    """Count the ranks of ``mean`` perturbed by ``stderr`` over ``draws`` draws."""
+    mean = np.asarray(mean, dtype=float)
+    stderr = np.nan_to_num(np.asarray(stderr, dtype=float))
+    sizes = [chunk] * (draws // chunk) + ([draws % chunk] if draws % chunk else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    counts = np.zeros((len(mean), len(mean)), dtype=np.int64)
+    if workers <= 1:
+        for size, s in zip(sizes, seeds):
+            counts += _rank_counts(mean, stderr, size, s)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(_rank_counts, [mean] * len(sizes), [stderr] * len(sizes), sizes, seeds):
+                counts += part
+    return counts
+
+
+def standard_errors(dataset):
+    """The raw standard-error column aligned to the cleaned table's rows.
+
+    Countries without one (or datasets without the column) get zero, which
+    keeps their score fixed across draws.
+    """
+    return raw_columns(dataset, [STDERR])[STDERR].fillna(0.0)
+
+
+_cache = VersionedCache(maxsize=8)
+
+
+def rank_distribution(dataset, draws=DRAWS):
+    def compute():
+        scores = dataset.df[SCORE]
+        counts = simulate(scores.to_numpy(), standard_errors(dataset).to_numpy(), draws)
+        return RankDistribution(countries=scores.index, counts=counts, draws=draws)
+
+    return _cache.get_or_compute((dataset.version, draws), compute)
@@ -0,0 +1,140 @@
+"""Schema and data-quality checks on the raw table, with a quarantine report.
+
+:func:`validate` checks a whole title-cased raw table in one vectorized
+sweep: expected columns and numeric dtypes, missing values, value ranges per
+indicator, duplicate countries and whisker/score consistency. Each check is
+one array expression over a whole column giving a failure mask. Rows with
+any ``error`` are quarantined instead of being dropped silently;
+``warning`` issues are reported but the rows stay.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+COUNTRY = "Country Name"
+SCORE = "Ladder Score"
+
+# Plausible bounds per indicator; values outside are data errors.
+RANGES = {
+    "Ladder Score": (0, 10),
+    "Logged Gdp Per Capita": (0, 15),
+    "Social Support": (0, 1),
+    "Healthy Life Expectancy": (0, 100),
+    "Freedom To Make Life Choices": (0, 1),
+    "Generosity": (-1, 1),
+    "Perceptions Of Corruption": (0, 1),
+    "Dystopia + Residual": (-10, 10),
+    "Standard Error Of Ladder Score": (0, 10),
+}
+
+# Whiskers are the ladder score plus or minus this many standard errors.
+WHISKER_Z = 1.96
+WHISKER_TOLERANCE = 0.01
+
+
+class SchemaError(ValueError):
+    """The table lacks columns the cleaned dataset needs."""
+
+
+@dataclass(frozen=True)
+class Validation:
+    """The cleaned table and one row per failed (row, check) pair.
+
+    ``kept`` holds the positions in the raw table of ``clean``'s rows.
+    """
+
+    clean: pd.DataFrame
+    issues: pd.DataFrame
+    rows: int
+    kept: np.ndarray
+
+    def summary(self):
+        """Failed rows per check, column and severity."""
+        return (self.issues.groupby(["Check", "Column", "Severity"], sort=False).size()
+                .rename("Rows").reset_index())
+
+    def quarantine(self):
+        """Quarantined rows (any ``error``) with the reasons they were set aside."""
+        errors = self.issues[self.issues["Severity"] == "error"]
+        reasons = errors["Check"] + ": " + errors["Column"]
+        return (reasons.groupby([errors["Row"], errors[COUNTRY]], sort=True).agg("; ".join)
+                .rename("Reasons").reset_index())
+
+
+def _numeric(frame, columns, checks):
+    """``frame[columns]`` as floats, flagging values that are not numbers."""
+    out = {}
+    for column in columns:
+        values = frame[column]
+        if not pd.api.types.is_numeric_dtype(values):
+            coerced = pd.to_numeric(values, errors="coerce")
+            checks.append(("not numeric", column, "error", (coerced.isna() & values.notna()).to_numpy(),
+                           np.full(len(values), np.nan)))
+            values = coerced
+        out[column] = values.to_numpy(dtype=float)
+    return out
+
+
+def validate(raw, columns, required):
+    """Check ``raw`` and return the cleaned table plus its issues.
+
+    ``columns`` are the title-cased columns of the cleaned table, the first
+    being the country name that becomes its index. Rows missing a
+    ``required`` value are quarantined, other missing values only reported.
+    Raises :class:`SchemaError` if any of ``columns`` is absent.
+    """
+    frame = raw.set_axis(raw.columns.str.title(), axis=1)
+    missing = [column for column in columns if column not in frame.columns]
+    if missing:
+        raise SchemaError(f"missing columns: {', '.join(missing)}")
+
+    n = len(frame)
+    checks = []
+    extra = [column for column in RANGES if column in frame.columns and column not in columns]
+    whiskers = [column for column in ("Upperwhisker", "Lowerwhisker") if column in frame.columns]
+    values = _numeric(frame, [*columns[1:], *extra, *whiskers], checks)
+
+    countries = frame[COUNTRY]
+    checks.append(("missing", COUNTRY, "error", countries.isna().to_numpy(), np.full(n, np.nan)))
+    checks.append(("duplicate", COUNTRY, "error",
+                   (countries.duplicated(keep="first") & countries.notna()).to_numpy(), np.full(n, np.nan)))
+    for column in columns[1:]:
+        checks.append(("missing", column, "error" if column in required else "warning",
+                       frame[column].isna().to_numpy(), values[column]))
+    for column, (low, high) in RANGES.items():
+        if column in values:
+            checks.append(("out of range", column, "error", (values[column] < low) | (values[column] > high),
+                           values[column]))
+
+    if len(whiskers) == 2:
+        score, upper, lower = values[SCORE], values["Upperwhisker"], values["Lowerwhisker"]
+        checks.append(("score outside whiskers", SCORE, "error", (lower > score) | (score > upper), score))
+        if "Standard Error Of Ladder Score" in values:
+            width = WHISKER_Z * values["Standard Error Of Ladder Score"]
+            off = np.maximum(np.abs(upper - score - width), np.abs(score - lower - width))
+            checks.append(("whiskers not score ± 1.96 SE", "Upperwhisker", "warning", off > WHISKER_TOLERANCE,
+                           upper))
+
+    # Failures are sparse: gather each check's failing rows and values, then
+    # order the issues by row, rather than materialising a rows x checks matrix.
+    failing = [np.flatnonzero(fail) for _, _, _, fail, _ in checks]
+    which = np.repeat(np.arange(len(checks)), [len(rows) for rows in failing])
+    rows = np.concatenate(failing)
+    order = np.argsort(rows, kind="stable")
+    rows, which = rows[order], which[order]
+    names, cols, severity = (np.array(field) for field in list(zip(*checks))[:3])
+    issues = pd.DataFrame({
+        "Row": rows,
+        COUNTRY: countries.iloc[rows].to_numpy(),
+        "Check": names[which],
+        "Column": cols[which],
+        "Severity": severity[which],
+        "Value": np.concatenate([vals[found] for (*_, vals), found in zip(checks, failing)])[order],
+    })
+
+    keep = np.flatnonzero(~np.logical_or.reduce([fail for _, _, level, fail, _ in checks if level == "error"]))
+    clean = pd.DataFrame({column: values[column][keep] for column in columns[1:]},
+                         index=pd.Index(countries.iloc[keep], name=COUNTRY))
+    return Validation(clean=clean, issues=issues, rows=n, kept=keep)